@@ -0,0 +1,46 @@
+import sys
+import time
+from typing import List
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Result import Response, ResultType, ResultAsset, Endpoint, filter_result_by_active
+
+SIZES = [1000, 2000, 4000, 8000, 16000, 32000]
+# THE LIST BASED JOIN IS QUADRATIC, OVER THIS SIZE IT TAKES TOO LONG
+LIST_JOIN_MAX_SIZE = 8000
+
+
+def list_join(result_asset: List[ResultAsset], contend_ids: List[str]) -> List[Endpoint]:
+    # JOIN AS IT WAS DONE BEFORE CatalogIndex: A SCAN OF THE LIST OF content_id FOR EVERY ASSET
+    return [asset.endpoints[0] for result in result_asset if contend_ids.__contains__(result.content_id)
+            for asset in (result.assets or []) if asset.is_video_format_HD_and_origin_level3()]
+
+
+def measure(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes: List[int]):
+    print("%10s %14s %14s %14s %16s" % ("records", "list join ms", "index build ms", "index join ms",
+                                         "index ns/record"))
+    for size in sizes:
+        response_asset = Response.from_dict(generate_assets_payload(size), ResultType.ASSET)
+        response_right = Response.from_dict(generate_rights_payload(size), ResultType.RIGHT)
+        active_content_id = [result.content_id for result in filter_result_by_active(response_right.results)]
+
+        list_time = measure(list_join, response_asset.results, active_content_id) \
+            if size <= LIST_JOIN_MAX_SIZE else float("nan")
+        start = time.perf_counter()
+        index = CatalogIndex(response_asset, response_right)
+        build_time = time.perf_counter() - start
+        join_time = measure(index.filter_result_by_active_data_and_video_format_and_endpoint_origin_level,
+                            active_content_id)
+        print("%10d %14.2f %14.2f %14.2f %16.1f" % (size, list_time * 1000, build_time * 1000, join_time * 1000,
+                                                    (build_time + join_time) * 1e9 / size))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
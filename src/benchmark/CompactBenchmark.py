@@ -0,0 +1,46 @@
+import gc
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Compact import compact_response_from_dict, CompactDecoder
+from src.main.Result import Response, ResultType
+
+SIZES = [10000, 50000, 100000]
+
+
+def measure(parse, payload, result_type: ResultType):
+    """
+    Return (seconds, retained bytes, peak bytes) of the parse, only the memory allocated by the parse is traced
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = parse(payload, result_type)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del response
+    return elapsed, retained, peak
+
+
+def main(sizes: List[int]):
+    print("%8s %10s %8s %12s %12s %12s %8s" % ("feed", "records", "mode", "parse ms", "retained MB", "peak MB",
+                                               "saving"))
+    for size in sizes:
+        for name, payload, result_type in [("vq", generate_rights_payload(size), ResultType.RIGHT),
+                                           ("tq", generate_assets_payload(size), ResultType.ASSET)]:
+            plain = measure(Response.from_dict, payload, result_type)
+            compact = measure(lambda data, kind: compact_response_from_dict(data, kind, CompactDecoder()), payload,
+                              result_type)
+            for mode, (elapsed, retained, peak) in [("plain", plain), ("compact", compact)]:
+                print("%8s %10d %8s %12.1f %12.2f %12.2f %7.0f%%" % (
+                    name, size, mode, elapsed * 1000, retained / 2 ** 20, peak / 2 ** 20,
+                    100 * (1 - retained / plain[1])))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
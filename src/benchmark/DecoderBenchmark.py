@@ -0,0 +1,44 @@
+import gc
+import sys
+import time
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Decoder import decode_response
+from src.main.Result import Response, ResultType
+
+SIZE = 100000
+REPEAT = 3
+
+
+def best_of(function) -> float:
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+            gc.collect()
+    finally:
+        gc.enable()
+    return best
+
+
+def main(size: int):
+    payloads = {ResultType.RIGHT: generate_rights_payload(size), ResultType.ASSET: generate_assets_payload(size)}
+    # THE SAME FEED WITH 1% OF THE RECORDS WITHOUT contentId, SKIPPED BY THE LENIENT DECODE
+    broken = {result_type: {"results": [{"contentId": None} if index % 100 == 0 else record
+                                        for index, record in enumerate(payload["results"])]}
+              for result_type, payload in payloads.items()}
+    print("%d records per feed, best of %d" % (size, REPEAT))
+    print("%-8s %14s %14s %16s %8s" % ("feed", "from_dict ms", "compiled ms", "lenient 1% ms", "speedup"))
+    for result_type, payload in payloads.items():
+        plain = best_of(lambda: Response.from_dict(payload, result_type))
+        compiled = best_of(lambda: decode_response(payload, result_type))
+        lenient = best_of(lambda: decode_response(broken[result_type], result_type, []))
+        print("%-8s %14.1f %14.1f %16.1f %7.2fx" % (result_type.value, plain * 1000, compiled * 1000, lenient * 1000,
+                                                   plain / compiled))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
@@ -0,0 +1,57 @@
+import json
+import sys
+import time
+import tracemalloc
+from typing import Iterator
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.ExternalJoin import external_join_endpoints
+from src.main.Result import ResultType, filter_result_by_active, \
+    filter_result_by_active_data_and_video_format_and_endpoint_origin_level
+from src.main.Stream import iter_results
+
+SIZE = 100000
+MEMORY_LIMITS = [2 ** 20, 2 ** 24]
+CHUNK_SIZE = 64 * 1024
+
+
+def chunks(text: bytes) -> Iterator[bytes]:
+    # THE FEED AS IT ARRIVES FROM THE CONNECTION
+    for start in range(0, text.__len__(), CHUNK_SIZE):
+        yield text[start:start + CHUNK_SIZE]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(size: int):
+    text_asset = json.dumps(generate_assets_payload(size)).encode()
+    text_right = json.dumps(generate_rights_payload(size)).encode()
+    print("%d records per feed, %.1f MB of JSON" % (size, (text_asset.__len__() + text_right.__len__()) / 2 ** 20))
+    print("%-24s %10s %12s %10s" % ("join", "seconds", "peak MB", "endpoints"))
+
+    def in_memory():
+        rights = list(iter_results(chunks(text_right), ResultType.RIGHT))
+        assets = list(iter_results(chunks(text_asset), ResultType.ASSET))
+        active = [result.content_id for result in filter_result_by_active(rights)]
+        return filter_result_by_active_data_and_video_format_and_endpoint_origin_level(assets, active)
+
+    endpoints, elapsed, peak = measure(in_memory)
+    print("%-24s %10.2f %12.1f %10d" % ("in memory", elapsed, peak / 2 ** 20, endpoints.__len__()))
+    for memory_limit in MEMORY_LIMITS:
+        endpoints, elapsed, peak = measure(lambda: external_join_endpoints(
+            iter_results(chunks(text_asset), ResultType.ASSET), iter_results(chunks(text_right), ResultType.RIGHT),
+            memory_limit=memory_limit))
+        print("%-24s %10.2f %12.1f %10d" % ("external (%d MB cap)" % (memory_limit // 2 ** 20), elapsed,
+                                            peak / 2 ** 20, endpoints.__len__()))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
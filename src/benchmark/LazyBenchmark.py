@@ -0,0 +1,31 @@
+import sys
+import time
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.Lazy import lazy_response_from_dict
+from src.main.Result import Response, ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active, \
+    print_title_name_medium
+
+SIZE = 100000
+
+
+def main(size: int):
+    payload = generate_rights_payload(size)
+    print("%d rights of the vq feed" % size)
+    print("%-24s %10s %10s %10s" % ("models", "decode ms", "filter ms", "total ms"))
+    for name, decode in [("plain", lambda: Response.from_dict(payload, ResultType.RIGHT)),
+                         ("lazy", lambda: lazy_response_from_dict(payload, ResultType.RIGHT)),
+                         ("lazy (validate)", lambda: lazy_response_from_dict(payload, ResultType.RIGHT, True))]:
+        start = time.perf_counter()
+        response = decode()
+        decoded = time.perf_counter()
+        # THE PIPELINE OF main.py: DEVICE FILTER, THEN ACTIVE FILTER AND TITLES OF THE KEPT RIGHTS ONLY
+        by_device = filter_result_by_can_be_played_on_ROKU(response.results)
+        [result.localizable_information for result in filter_result_by_active(by_device)]
+        end = time.perf_counter()
+        print("%-24s %10.1f %10.1f %10.1f" % (name, (decoded - start) * 1000, (end - decoded) * 1000,
+                                              (end - start) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
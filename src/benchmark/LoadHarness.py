@@ -0,0 +1,114 @@
+import json
+import logging
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.benchmark.StubServer import StubServer, faults_from_args
+from src.main.Client import FeedClient
+from src.main.Decoder import decode_response
+from src.main.Metrics import Metrics
+from src.main.Result import ResultType
+
+RUNS = 50
+CONCURRENCY = 4
+SIZE = 2000
+# RETRY POLICIES OF FeedClient COMPARED BY THE HARNESS
+POLICIES: Dict[str, Dict[str, Any]] = {
+    "1 attempt": {"number_of_iterations": 1},
+    "3 attempts": {"number_of_iterations": 3},
+    "3 attempts, no backoff": {"number_of_iterations": 3, "backoff_base": 0.0},
+    "5 attempts": {"number_of_iterations": 5},
+}
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """
+    Nearest-rank percentile, rank between 0 and 100
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(rank / 100 * ordered.__len__()) - 1)]
+
+
+def run_once(stub: StubServer, policy: Dict[str, Any], timeout: float) -> 'Dict[str, Any]':
+    """
+    One run of the real client against the stub: fetch of both the feeds with the retries of the policy, then parse
+
+    :returns Dict[str, Any]: success, seconds, retries and bytes received of the run
+    """
+    metrics = Metrics()
+    start = time.perf_counter()
+    success = True
+    with FeedClient(number_of_iterations=policy.get("number_of_iterations", 3), timeout=timeout,
+                    backoff_base=policy.get("backoff_base", 0.1), backoff_cap=policy.get("backoff_cap", 2.0),
+                    metrics=metrics) as client:
+        try:
+            responses = client.fetch_all({"Asset Data": stub.url_asset, "Localization Data": stub.url_right})
+            decode_response(responses["Asset Data"].json(), ResultType.ASSET)
+            decode_response(responses["Localization Data"].json(), ResultType.RIGHT)
+        except Exception:
+            success = False
+    return {"success": success, "seconds": time.perf_counter() - start, "retries": metrics.counters["retries"],
+            "bytes_received": metrics.counters["bytes_received"]}
+
+
+def run_policy(stub: StubServer, policy: Dict[str, Any], runs: int = RUNS, concurrency: int = CONCURRENCY,
+               timeout: float = 10.0) -> 'Dict[str, Any]':
+    """
+    Run the policy runs times with concurrency runs at the same time
+
+    :returns Dict[str, Any]: success rate, p50/p99 of the wall time of a run, retries and bytes transferred (sent by
+        the stub, including the failed and truncated answers)
+    """
+    bytes_sent = stub.stats.get("bytes_sent", 0)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: run_once(stub, policy, timeout), range(runs)))
+    seconds = [result["seconds"] for result in results]
+    return {"runs": runs,
+            "success_rate": sum(result["success"] for result in results) / runs,
+            "p50_seconds": percentile(seconds, 50),
+            "p99_seconds": percentile(seconds, 99),
+            "retries": sum(result["retries"] for result in results),
+            "bytes_received": sum(result["bytes_received"] for result in results),
+            "bytes_transferred": stub.stats.get("bytes_sent", 0) - bytes_sent}
+
+
+def main(argv: List[str]):
+    """
+    Run every retry policy against a stub server with the faults given, e.g.:
+
+        py -m src.benchmark.LoadHarness RUNS=100 FAILURE_RATE=0.3 LATENCY=lognormal:0.02:0.8 TRUNCATE_RATE=0.05
+
+    Options: RUNS, CONCURRENCY, SIZE, SEED, TIMEOUT, POLICIES (comma-separated names), OUTPUT (JSON report) and the
+    faults of StubServer (FAILURE_RATE, STATUS_CODES, LATENCY, SLOW_RATE, BODY_RATE, TRUNCATE_RATE)
+    """
+    # THE WARNINGS OF THE FAILED ATTEMPTS ARE EXPECTED, ONLY THE REPORT IS PRINTED
+    logging.disable(logging.WARNING)
+    args_map = dict(arg.split("=", 1) for arg in argv if arg.__contains__("="))
+    runs = int(args_map.get("RUNS", RUNS))
+    concurrency = int(args_map.get("CONCURRENCY", CONCURRENCY))
+    timeout = float(args_map.get("TIMEOUT", 10.0))
+    names = args_map["POLICIES"].split(",") if "POLICIES" in args_map else list(POLICIES)
+    faults = faults_from_args(args_map)
+    report: Dict[str, Any] = {}
+    print("%d runs per policy, %d at a time" % (runs, concurrency))
+    print("%-24s %9s %9s %9s %8s %10s" % ("policy", "success", "p50 s", "p99 s", "retries", "MB"))
+    for name in names:
+        # A NEW STUB FOR EVERY POLICY: THE SAME SEED DRAWS THE SAME SEQUENCE OF FAULTS
+        with StubServer(int(args_map.get("SIZE", SIZE)), int(args_map.get("SEED", 0)), faults) as stub:
+            report[name] = run_policy(stub, POLICIES[name], runs, concurrency, timeout)
+        result = report[name]
+        print("%-24s %8.1f%% %9.3f %9.3f %8d %10.1f" % (name, result["success_rate"] * 100, result["p50_seconds"],
+                                                        result["p99_seconds"], result["retries"],
+                                                        result["bytes_transferred"] / 2 ** 20))
+    if "OUTPUT" in args_map:
+        with open(args_map["OUTPUT"], "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,43 @@
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from src.main.Output import open_sink, write_endpoints
+from src.main.Result import Endpoint, print_endpoints
+
+SIZE = 1000000
+
+
+def main(size: int):
+    endpoints = [Endpoint("level3", "/manifests/%d/hd.m3u8" % index) for index in range(size)]
+    directory = tempfile.TemporaryDirectory()
+    print("%d manifest paths written to a file" % size)
+    print("%-10s %10s %8s" % ("output", "ms", "speedup"))
+
+    # THE LOGGING OF main.py, WITH A FILE HANDLER SO THAT BOTH THE PATHS GO TO THE SAME KIND OF TARGET
+    handler = logging.FileHandler(os.path.join(directory.name, "log.txt"))
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s: %(message)s', '%d-%m-%y %H:%M'))
+    root = logging.getLogger()
+    root.handlers, level = [handler], root.level
+    root.setLevel(logging.INFO)
+    start = time.perf_counter()
+    print_endpoints(endpoints)
+    logged = time.perf_counter() - start
+    handler.close()
+    root.handlers = []
+    root.setLevel(level)
+    print("%-10s %10.1f %7.1fx" % ("log", logged * 1000, 1.0))
+
+    for output_format in ("text", "jsonl", "csv"):
+        start = time.perf_counter()
+        with open_sink(output_format, os.path.join(directory.name, "out." + output_format)) as sink:
+            write_endpoints(sink, endpoints)
+        elapsed = time.perf_counter() - start
+        print("%-10s %10.1f %7.1fx" % (output_format, elapsed * 1000, logged / elapsed))
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.ParallelParse import parallel_response_from_dict
+from src.main.Result import Response, ResultType
+
+SIZES = [1000, 10000, 100000]
+WORKERS = [1, 2, 4, 8]
+
+
+def main(sizes: List[int]):
+    print("CPUs available: %s" % os.cpu_count())
+    print("%10s %8s %12s %8s" % ("records", "workers", "parse ms", "speedup"))
+    for size in sizes:
+        payload = generate_rights_payload(size)
+        start = time.perf_counter()
+        Response.from_dict(payload, ResultType.RIGHT)
+        serial = time.perf_counter() - start
+        print("%10d %8s %12.1f %7.2fx" % (size, "serial", serial * 1000, 1.0))
+        for workers in WORKERS:
+            # THE POOL IS STARTED BEFORE THE MEASURE, LIKE IN A LONG-RUNNING INGEST PROCESS
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                executor.submit(int).result()
+                start = time.perf_counter()
+                parallel_response_from_dict(payload, ResultType.RIGHT, workers, executor=executor)
+                elapsed = time.perf_counter() - start
+            print("%10d %8d %12.1f %7.2fx" % (size, workers, elapsed * 1000, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
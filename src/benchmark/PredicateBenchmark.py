@@ -0,0 +1,37 @@
+import sys
+import time
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.Predicate import device, active, territory, channel, select_rights
+from src.main.Result import Response, ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active
+
+SIZE = 100000
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(size: int):
+    rights = Response.from_dict(generate_rights_payload(size), ResultType.RIGHT).results
+    print("%d rights of the vq feed" % size)
+    print("%-48s %12s %12s %8s" % ("query", "chained ms", "fused ms", "speedup"))
+
+    # THE CHAIN OF main.py: A LIST FOR EVERY FILTER AND datetime.now FOR EVERY RECORD
+    chained = measure(lambda: filter_result_by_active(filter_result_by_can_be_played_on_ROKU(rights)))
+    fused = measure(lambda: select_rights(rights, device("provider", "ROKU") & active()))
+    print("%-48s %12.1f %12.1f %7.1fx" % ("ROKU & active", chained * 1000, fused * 1000, chained / fused))
+
+    chained = measure(lambda: [result for result in filter_result_by_active(
+        filter_result_by_can_be_played_on_ROKU(rights)) if result.rights.terms[0].territory == "GB"
+                               and result.rights.channel == "sky.atlantic.com"])
+    fused = measure(lambda: select_rights(rights, device("provider", "ROKU") & active() & territory("GB")
+                                          & channel("sky.atlantic.com")))
+    print("%-48s %12.1f %12.1f %7.1fx" % ("ROKU & active & GB & sky.atlantic.com", chained * 1000, fused * 1000,
+                                          chained / fused))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
@@ -0,0 +1,55 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Result import Response, ResultType
+from src.main.Snapshot import Snapshot, write_snapshot
+
+SIZE = 100000
+LOOKUPS = 1000
+
+
+def main(size: int):
+    text_asset = json.dumps(generate_assets_payload(size))
+    text_right = json.dumps(generate_rights_payload(size))
+    response_asset = Response.from_dict(json.loads(text_asset), ResultType.ASSET)
+    response_right = Response.from_dict(json.loads(text_right), ResultType.RIGHT)
+    content_ids = random.Random(0).sample([result.content_id for result in response_right.results], LOOKUPS)
+    path = os.path.join(tempfile.mkdtemp(prefix="snapshot-"), "catalog.snapshot")
+
+    start = time.perf_counter()
+    write_snapshot(path, response_asset, response_right)
+    elapsed = time.perf_counter() - start
+    print("%d records per feed, %.1f MB of JSON, %.1f MB of snapshot written in %.2fs" % (
+        size, (text_asset.__len__() + text_right.__len__()) / 2 ** 20, os.path.getsize(path) / 2 ** 20, elapsed))
+    print("%-28s %12s %18s" % ("load", "seconds", "%d lookups (s)" % LOOKUPS))
+
+    start = time.perf_counter()
+    response_asset = Response.from_dict(json.loads(text_asset), ResultType.ASSET)
+    response_right = Response.from_dict(json.loads(text_right), ResultType.RIGHT)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    rights = {result.content_id: result for result in response_right.results}
+    assets = {result.content_id: result for result in response_asset.results}
+    for content_id in content_ids:
+        _ = rights[content_id], assets.get(content_id)
+    print("%-28s %12.4f %18.4f" % ("json.loads + from_dict", loaded, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    snapshot = Snapshot(path)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    for content_id in content_ids:
+        _ = snapshot.get_rights(content_id), snapshot.get_assets(content_id)
+    print("%-28s %12.4f %18.4f" % ("Snapshot (mmap)", loaded, time.perf_counter() - start))
+    snapshot.close()
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Result import Response, ResultType
+from src.main.Snapshot import write_snapshot
+
+SIZE = 100000
+REPEAT = 5
+# SECONDS OF WALL TIME OF A NEW INTERPRETER, THE IMPORT OF requests ALONE TAKES ABOUT 0.15s
+BUDGETS = {"--help": 0.15, "snapshot query": 0.4}
+
+
+def best_of(command: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str]):
+    """
+    Startup time of the command line: a new interpreter for every run, best of REPEAT. It exits with 1 if a command
+    is over its budget
+
+        py -m src.benchmark.StartupBenchmark SIZE=100000 REPEAT=5
+    """
+    args_map = dict(arg.split("=", 1) for arg in argv if arg.__contains__("="))
+    size = int(args_map.get("SIZE", SIZE))
+    repeat = int(args_map.get("REPEAT", REPEAT))
+    directory = tempfile.mkdtemp(prefix="startup-")
+    path = os.path.join(directory, "catalog.snapshot")
+    response_right = Response.from_dict(generate_rights_payload(size), ResultType.RIGHT)
+    write_snapshot(path, Response.from_dict(generate_assets_payload(size), ResultType.ASSET), response_right)
+    content_id = ",".join(result.content_id for result in response_right.results[:10])
+
+    commands: Dict[str, List[str]] = {
+        "python": [sys.executable, "-c", "pass"],
+        "import requests": [sys.executable, "-c", "import requests"],
+        "--help": [sys.executable, "-m", "src.main.main", "--help"],
+        "snapshot query": [sys.executable, "-m", "src.main.main", "FROM_SNAPSHOT=" + path, "CONTENT_ID=" + content_id,
+                           "OUTPUT=text", "OUTPUT_FILE=" + os.path.join(directory, "endpoints.txt")]}
+    print("%d records per feed, best of %d" % (size, repeat))
+    print("%-18s %10s %10s" % ("command", "seconds", "budget"))
+    over = []
+    for name, command in commands.items():
+        seconds = best_of(command, repeat)
+        budget = BUDGETS.get(name)
+        print("%-18s %10.3f %10s" % (name, seconds, "-" if budget is None else "%.3f" % budget))
+        if budget is not None and seconds > budget:
+            over.append(name)
+    os.remove(path)
+    if os.path.exists(os.path.join(directory, "endpoints.txt")):
+        os.remove(os.path.join(directory, "endpoints.txt"))
+    os.rmdir(directory)
+    if over:
+        print("over budget: %s" % ", ".join(over))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
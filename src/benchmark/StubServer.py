@@ -0,0 +1,239 @@
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Tuple
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+
+# PATHS OF THE FEEDS, THE SAME OF THE LIVE ENDPOINTS
+ASSET_PATH = "/tq"
+RIGHT_PATH = "/vq"
+# BYTES WRITTEN AT A TIME BY A SLOW BODY
+SLOW_CHUNK_SIZE = 16 * 1024
+
+Latency = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> 'Latency':
+    """
+    Latency distribution in seconds from its description:
+        "0.05" fixed, "uniform:0.01:0.2", "exp:0.05" (exponential with mean 0.05), "lognormal:0.05:0.8" (median 0.05,
+        sigma 0.8, a long tail)
+
+    :raises ValueError: if the description is not valid
+    """
+    kind, *values = spec.split(":")
+    try:
+        if not values:
+            seconds = float(kind)
+            return lambda generator: seconds
+        parameters = [float(value) for value in values]
+    except ValueError:
+        raise ValueError("Latency %s is not valid" % spec)
+    match kind, parameters.__len__():
+        case "uniform", 2:
+            return lambda generator: generator.uniform(parameters[0], parameters[1])
+        case "exp", 1:
+            return lambda generator: generator.expovariate(1 / parameters[0]) if parameters[0] > 0 else 0.0
+        case "lognormal", 2:
+            return lambda generator: generator.lognormvariate(math.log(parameters[0]), parameters[1])
+    raise ValueError("Latency %s is not valid" % spec)
+
+
+class Faults:
+    """
+    Faults injected by the stub server, every request draws its fault independently from a seeded generator
+    """
+
+    def __init__(self, failure_rate: float = 0.0, status_codes: List[int] = None, latency: Latency = None,
+                 slow_rate: float = 0.0, body_rate: float = 1e6, truncate_rate: float = 0.0):
+        """
+        :param failure_rate: share of requests answered with an error status code
+        :param status_codes: error status codes, chosen at random [DEFAULT=500, 502, 503, 504]
+        :param latency: distribution of the delay before the answer (optional, default no delay), see parse_latency
+        :param slow_rate: share of the answers whose body is sent at body_rate bytes per second
+        :param body_rate: bytes per second of a slow body
+        :param truncate_rate: share of the answers closed after half of the body
+        """
+        for name, rate in (("failure_rate", failure_rate), ("slow_rate", slow_rate), ("truncate_rate", truncate_rate)):
+            if not 0 <= rate <= 1:
+                raise ValueError("%s has to be between 0 and 1" % name)
+        self.failure_rate = failure_rate
+        self.status_codes = status_codes or [500, 502, 503, 504]
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.body_rate = body_rate
+        self.truncate_rate = truncate_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # KEEP-ALIVE AS THE LIVE ENDPOINTS, THE POOLED SESSION OF FeedClient REUSES THE CONNECTIONS
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stub: StubServer = self.server.stub
+        body = stub.bodies.get(self.path.split("?", 1)[0])
+        if body is None:
+            self._send(404, b'{"message": "Not Found"}')
+            return
+        status, latency, slow, truncate = stub.draw()
+        if latency > 0:
+            time.sleep(latency)
+        if status != 200:
+            self._send(status, b'{"message": "Injected failure"}')
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(body.__len__()))
+        if truncate:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if truncate:
+            # THE CLIENT EXPECTS Content-Length BYTES AND SEES THE CONNECTION CLOSED BEFORE
+            body = body[:body.__len__() // 2]
+            self.close_connection = True
+        if slow:
+            for start in range(0, body.__len__(), SLOW_CHUNK_SIZE):
+                self.wfile.write(body[start:start + SLOW_CHUNK_SIZE])
+                self.wfile.flush()
+                time.sleep(min(SLOW_CHUNK_SIZE, body.__len__() - start) / stub.faults.body_rate)
+        else:
+            self.wfile.write(body)
+        stub.count("bytes_sent", body.__len__())
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(body.__len__()))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stub.count("bytes_sent", body.__len__())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    Local stand-in of the tq/vq endpoints: it serves generated payloads and injects the configured faults, so that the
+    retries, the latency and the throughput of the client can be measured without the live endpoints
+
+        with StubServer(size=10000, faults=Faults(failure_rate=0.2)) as stub:
+            client.fetch_all({"Asset Data": stub.url_asset, "Localization Data": stub.url_right})
+    """
+
+    def __init__(self, size: int = 1000, seed: int = 0, faults: Faults = None, host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        :param size: records of every feed
+        :param seed: seed of the payloads and of the faults
+        :param faults: faults to inject (optional, default none)
+        :param host: address to listen on
+        :param port: port to listen on (optional, default a free port)
+        """
+        self.faults = Faults() if faults is None else faults
+        self.bodies: Dict[str, bytes] = {ASSET_PATH: json.dumps(generate_assets_payload(size, seed)).encode(),
+                                         RIGHT_PATH: json.dumps(generate_rights_payload(size, seed)).encode()}
+        self.stats: Dict[str, int] = {}
+        self._generator = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return "http://%s:%d" % self._server.server_address[:2]
+
+    @property
+    def url_asset(self) -> str:
+        return self.url + ASSET_PATH
+
+    @property
+    def url_right(self) -> str:
+        return self.url + RIGHT_PATH
+
+    def draw(self) -> 'Tuple[int, float, bool, bool]':
+        """
+        :returns Tuple[int, float, bool, bool]: (status code, latency in seconds, slow body, truncated body) of a
+            request
+        """
+        faults = self.faults
+        with self._lock:
+            generator = self._generator
+            status = generator.choice(faults.status_codes) if generator.random() < faults.failure_rate else 200
+            latency = 0.0 if faults.latency is None else max(0.0, faults.latency(generator))
+            slow = generator.random() < faults.slow_rate
+            truncate = generator.random() < faults.truncate_rate
+            self.stats["requests"] = self.stats.get("requests", 0) + 1
+            for name, injected in (("failures", status != 200), ("slow_bodies", status == 200 and slow),
+                                   ("truncated", status == 200 and truncate)):
+                if injected:
+                    self.stats[name] = self.stats.get(name, 0) + 1
+        return status, latency, slow, truncate
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        # IN THE CALLING THREAD, UNTIL stop IS CALLED FROM ANOTHER ONE OR THE PROCESS IS INTERRUPTED
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def faults_from_args(args_map: Dict[str, str]) -> 'Faults':
+    """
+    Faults from FAILURE_RATE, STATUS_CODES, LATENCY, SLOW_RATE, BODY_RATE and TRUNCATE_RATE
+    """
+    return Faults(float(args_map.get("FAILURE_RATE", 0)),
+                  [int(code) for code in args_map["STATUS_CODES"].split(",")] if "STATUS_CODES" in args_map else None,
+                  parse_latency(args_map["LATENCY"]) if "LATENCY" in args_map else None,
+                  float(args_map.get("SLOW_RATE", 0)), float(args_map.get("BODY_RATE", 1e6)),
+                  float(args_map.get("TRUNCATE_RATE", 0)))
+
+
+def main(argv: List[str]):
+    """
+    Serve the stub until it is interrupted:
+
+        py -m src.benchmark.StubServer PORT=8000 SIZE=10000 FAILURE_RATE=0.2 LATENCY=exp:0.05 TRUNCATE_RATE=0.05
+    """
+    logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', datefmt='%d-%m-%y %H:%M',
+                        level=logging.INFO)
+    args_map = dict(arg.split("=", 1) for arg in argv if arg.__contains__("="))
+    stub = StubServer(int(args_map.get("SIZE", 1000)), int(args_map.get("SEED", 0)), faults_from_args(args_map),
+                      args_map.get("HOST", "127.0.0.1"), int(args_map.get("PORT", 8000)))
+    logging.info("stub: serving %s and %s", stub.url_asset, stub.url_right)
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    logging.info("stub: %s", stub.stats)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
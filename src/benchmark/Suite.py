@@ -0,0 +1,143 @@
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Decoder import decode_response
+from src.main.Result import ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active, \
+    filter_result_by_active_data_and_video_format_and_endpoint_origin_level
+
+# 1000000 IS OPT-IN (SIZES=1000000): ITS PAYLOADS AND PARSED CATALOG NEED MORE THAN 5 GB
+SIZES = [1000, 10000, 100000]
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# A STAGE IS SLOWER ONLY IF IT IS SLOWER OF THE THRESHOLD AND OF MIN_SECONDS, SHORTER TIMES ARE NOISE
+THRESHOLD = 0.25
+MIN_SECONDS = 0.005
+MIN_PEAK_BYTES = 64 * 2 ** 10
+METRICS = ("seconds", "peak_bytes")
+
+
+def stages(payload_asset: Any, payload_right: Any) -> 'List[Tuple[str, Callable[[Dict[str, Any]], Any]]]':
+    """
+    Hot paths of main.py in order, every stage reads the outputs of the previous ones from the context
+    """
+    return [
+        # THE DECODERS OF THE PIPELINE, Response.from_dict IS COMPARED WITH THEM BY DecoderBenchmark
+        ("parse_rights", lambda context: decode_response(payload_right, ResultType.RIGHT)),
+        ("parse_assets", lambda context: decode_response(payload_asset, ResultType.ASSET)),
+        ("filter_roku", lambda context: filter_result_by_can_be_played_on_ROKU(context["parse_rights"].results)),
+        ("filter_active", lambda context: filter_result_by_active(context["parse_rights"].results)),
+        ("join_hd_level3", lambda context: filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+            context["parse_assets"].results, [result.content_id for result in context["filter_active"]])),
+        ("catalog_index", lambda context: CatalogIndex(context["parse_assets"], context["parse_rights"])
+         .filter_result_by_active_data_and_video_format_and_endpoint_origin_level()),
+    ]
+
+
+def run(size: int, repeat: int = 3, seed: int = 0, max_devices: int = 5, distinct_terms: int = None,
+        max_assets: int = 4) -> 'Dict[str, Dict[str, float]]':
+    """
+    Measure every stage on a synthetic catalog of size records
+
+    :returns Dict[str, Dict[str, float]]: for every stage the best time of the repeats and the peak of memory
+        allocated by the stage (tracemalloc, measured in a further run)
+    """
+    payload_asset = generate_assets_payload(size, seed, max_assets)
+    payload_right = generate_rights_payload(size, seed, max_devices, distinct_terms)
+    context: Dict[str, Any] = {}
+    measures = {}
+    for name, stage in stages(payload_asset, payload_right):
+        seconds = float("inf")
+        # LIKE timeit THE GARBAGE COLLECTOR IS DISABLED, ITS PAUSES DEPEND ON THE WHOLE HEAP AND NOT ON THE STAGE
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                context[name] = stage(context)
+                seconds = min(seconds, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        context[name] = None
+        tracemalloc.start()
+        context[name] = stage(context)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        measures[name] = {"seconds": seconds, "peak_bytes": peak}
+        logging.info("benchmark: %d records, %s in %.1f ms, peak %.1f MB", size, name, seconds * 1000, peak / 2 ** 20)
+    return measures
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = THRESHOLD) -> 'List[str]':
+    """
+    Compare two reports of the suite, only the sizes and stages present in both are compared
+
+    :param current: report of this run
+    :param baseline: stored report
+    :param threshold: allowed relative growth, 0.25 means 25% slower or bigger
+    :returns List[str]: description of the regressions, empty if there are none
+    """
+    regressions = []
+    for size, measures in current["results"].items():
+        for name, values in measures.items():
+            expected = baseline.get("results", {}).get(size, {}).get(name)
+            if expected is None:
+                continue
+            for metric, minimum in zip(METRICS, (MIN_SECONDS, MIN_PEAK_BYTES)):
+                value, reference = values[metric], expected[metric]
+                if value > reference * (1 + threshold) and value - reference > minimum:
+                    regressions.append("%s records, %s %s: %.6g -> %.6g (+%.0f%%)" % (
+                        size, name, metric, reference, value, (value / reference - 1) * 100 if reference else 100))
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', datefmt='%d-%m-%y %H:%M',
+                        level=logging.INFO)
+    args_map = dict(arg.split("=", 1) for arg in argv if arg.__contains__("="))
+    sizes = [int(size) for size in args_map["SIZES"].split(",")] if "SIZES" in args_map else SIZES
+    baseline_path = args_map.get("BASELINE", BASELINE)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "parameters": {"seed": int(args_map.get("SEED", 0)), "max_devices": int(args_map.get("MAX_DEVICES", 5)),
+                       "distinct_terms": int(args_map["DISTINCT_TERMS"]) if "DISTINCT_TERMS" in args_map else None,
+                       "max_assets": int(args_map.get("MAX_ASSETS", 4))},
+        "results": {},
+    }
+    for size in sizes:
+        report["results"][str(size)] = run(size, int(args_map.get("REPEAT", 3)), **report["parameters"])
+
+    if args_map.get("OUTPUT") is not None:
+        with open(args_map.get("OUTPUT"), "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args_map.get("UPDATE_BASELINE", "false").lower() == "true":
+        with open(baseline_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        logging.info("benchmark: baseline %s updated", baseline_path)
+        return 0
+    if not os.path.exists(baseline_path):
+        logging.warning("benchmark: baseline %s not found, nothing to compare", baseline_path)
+        return 0
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("parameters") != report["parameters"]:
+        logging.warning("benchmark: the baseline has been generated with %s, this run with %s",
+                        baseline.get("parameters"), report["parameters"])
+    regressions = compare(report, baseline, float(args_map.get("THRESHOLD", THRESHOLD)))
+    for regression in regressions:
+        logging.error("benchmark: regression -> %s", regression)
+    if not regressions:
+        logging.info("benchmark: no regression over the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
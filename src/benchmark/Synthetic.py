@@ -0,0 +1,115 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+DEVICES: List[Dict[str, str]] = [
+    {"devicePlatform": "APPLETV", "deviceType": "IPSETTOPBOX", "provider": "SKY"},
+    {"devicePlatform": "SAMSUNG", "deviceType": "TV", "provider": "SKY"},
+    {"devicePlatform": "LG", "deviceType": "TV", "provider": "SKY"},
+    {"devicePlatform": "ANDROID", "deviceType": "MOBILE", "provider": "SKY"},
+    {"devicePlatform": "IOS", "deviceType": "MOBILE", "provider": "SKY"},
+    {"devicePlatform": "XBOX", "deviceType": "CONSOLE", "provider": "NOWTV"},
+    {"devicePlatform": "ROKU", "deviceType": "IPSETTOPBOX", "provider": "ROKU"},
+]
+TERRITORIES: List[str] = ["GB", "IE", "IT", "DE", "AT"]
+CHANNELS: List[str] = ["itv3.itv.com", "hdr.cinema.sky.com", "sky.atlantic.com", "now.tv.com"]
+VIDEO_FORMATS: List[str] = ["SD", "HD", "UHD"]
+ORIGINS: List[str] = ["level3", "akamai", "limelight"]
+# WORDS OF THE EPISODE NAMES AND NAMES OF THE ACTORS, CHOSEN FROM THE INDEX OF THE RECORD TO NOT CHANGE THE SEQUENCE OF
+# THE RANDOM GENERATOR
+WORDS: List[str] = ["Murder", "Vicarage", "Mirror", "Crack'd", "Nemesis", "Pocket", "Rye", "Sleeping", "Body",
+                    "Library", "Moving", "Finger", "Caribbean", "Mystery", "Bertram's", "Hotel", "Night", "Return",
+                    "Café", "Pale", "Horse", "Ordeal", "Innocence", "Endless", "Secret", "Adversary", "Zürich"]
+ACTORS: List[str] = ["Julia McKenzie", "Geraldine McEwan", "Joan Hickson", "Margaret Rutherford", "Angela Lansbury",
+                     "Helen Hayes", "Stephen Fry", "Timothy West", "Ralf Little", "Özge Özpirinççi", "Zoë Wanamaker",
+                     "Benedict Cumberbatch", "Martin Freeman", "Olivia Colman", "David Tennant", "Jodie Whittaker"]
+
+
+def _format(date: datetime) -> str:
+    return date.strftime("%Y-%m-%dT%H:%M:%S.") + "%03dZ" % (date.microsecond // 1000)
+
+
+def _window(generator: random.Random, now: datetime) -> 'Tuple[datetime, datetime]':
+    start = now + timedelta(days=generator.randint(-400, 60))
+    return start, start + timedelta(days=generator.randint(1, 500))
+
+
+def generate_rights_payload(size: int, seed: int = 0, max_devices: int = 5, distinct_terms: int = None,
+                            now: datetime = None) -> 'Dict[str, Any]':
+    """
+    Generate a "vq" payload with size records, the same seed (and now) always generates the same payload
+
+    :param size: number of records
+    :param seed: seed of the random generator
+    :param max_devices: max number of devices of a term, between 1 and the number of DEVICES
+    :param distinct_terms: number of distinct start/end windows shared by the terms (optional, default every term has
+        its own window)
+    :param now: date around which the terms are generated (optional, default current hour)
+    :returns Dict[str, Any]: payload as returned by json.loads
+    """
+    if not 1 <= max_devices <= DEVICES.__len__():
+        raise ValueError("max_devices has to be between 1 and %d" % DEVICES.__len__())
+    generator = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) if now is None else now
+    windows = None if distinct_terms is None else [_window(generator, now) for _ in range(distinct_terms)]
+    results = []
+    for index in range(size):
+        start, end = _window(generator, now) if windows is None else generator.choice(windows)
+        results.append({
+            "contentId": "sky-test-id-%d" % index,
+            "accessChannel": "channel-%d" % generator.randrange(20),
+            "localizableInformation": [{
+                "locale": "en-GB",
+                "language": "eng",
+                "titleNameMedium": "Title %d" % index,
+                "episodeName": "%s %s" % (WORDS[index % WORDS.__len__()], WORDS[index * 7 % WORDS.__len__()]),
+                "episodeNumber": index % 10 + 1,
+                "seasonNumber": index // 10 % 8 + 1,
+                "credits": {"actor": [{"fullName": ACTORS[(index + offset) * 5 % ACTORS.__len__()]}
+                                      for offset in range(index % 3 + 1)]},
+            }],
+            "rights": {
+                "channel": generator.choice(CHANNELS),
+                "terms": [{
+                    "startDateTime": _format(start),
+                    "endDateTime": _format(end),
+                    "territory": generator.choice(TERRITORIES),
+                    "devices": [dict(device) for device in
+                                generator.sample(DEVICES, generator.randint(1, max_devices))],
+                }],
+            },
+        })
+    return {"results": results}
+
+
+def generate_assets_payload(size: int, seed: int = 0, max_assets: int = 4) -> 'Dict[str, Any]':
+    """
+    Generate a "tq" payload with size records, the same seed always generates the same payload
+
+    :param size: number of records
+    :param seed: seed of the random generator
+    :param max_assets: max number of assets of a record
+    :returns Dict[str, Any]: payload as returned by json.loads
+    """
+    if max_assets < 1:
+        raise ValueError("max_assets has to be at least 1")
+    generator = random.Random(seed)
+    results = []
+    for index in range(size):
+        assets = []
+        for _ in range(generator.randint(1, max_assets)):
+            video_format = generator.choice(VIDEO_FORMATS)
+            origin = generator.choice(ORIGINS)
+            assets.append({
+                "endpoints": [{
+                    "origin": origin,
+                    "path": "/skyplayer/%s/sky-test-id-%d/%s/Manifest" % (origin, index, video_format.lower()),
+                }],
+                "videoFormat": video_format,
+            })
+        results.append({
+            "contentId": "sky-test-id-%d" % index,
+            "accessChannel": "channel-%d" % generator.randrange(20),
+            "assets": assets,
+        })
+    return {"results": results}
@@ -0,0 +1,42 @@
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.Result import Term
+from src.main.Timestamp import parse_timestamp
+
+SIZE = 100000
+
+
+def throughput(function, values: List[str]) -> float:
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+    return values.__len__() / (time.perf_counter() - start)
+
+
+def main(size: int):
+    payload = generate_rights_payload(size)
+    terms = [result["rights"]["terms"][0] for result in payload["results"]]
+    timestamps = [term[key] for term in terms for key in ("startDateTime", "endDateTime")]
+    print("%d timestamps of the vq feed, %d distinct" % (timestamps.__len__(), set(timestamps).__len__()))
+
+    fromisoformat = throughput(datetime.fromisoformat, timestamps)
+    parse_timestamp.cache_clear()
+    no_cache = throughput(parse_timestamp.__wrapped__, timestamps)
+    cached = throughput(parse_timestamp, timestamps)
+    print("%-32s %14s %8s" % ("parser", "timestamps/s", "speedup"))
+    for name, value in [("datetime.fromisoformat (C)", fromisoformat), ("parse_timestamp (no cache)", no_cache),
+                        ("parse_timestamp (LRU cache)", cached)]:
+        print("%-32s %14.0f %7.1fx" % (name, value, value / fromisoformat))
+
+    start = time.perf_counter()
+    for term in terms:
+        Term.from_dict(term)
+    print("Term.from_dict: %.0f terms/s" % (terms.__len__() / (time.perf_counter() - start)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
@@ -0,0 +1,72 @@
+import sys
+import time
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Decoder import decode_response
+from src.main.Result import ResultType
+from src.main.TitleIndex import ACTOR, TITLE, TitleIndex
+
+SIZE = 100000
+REPEAT = 200
+# QUERIES OF A SEARCH BOX, TYPED ONE LETTER AT A TIME AND COMPLETE
+QUERIES = [(TITLE, "ne"), (TITLE, "nemesis"), (TITLE, "nemesis caf"), (TITLE, "title 4242"), (TITLE, "title 42"),
+           (ACTOR, "julia mc"), (ACTOR, "ozge")]
+# MILLISECONDS OF A QUERY OF THE INDEX NOT CACHED YET (BEST OF COLD RUNS), THE TARGET OF SEARCH-AS-YOU-TYPE
+BUDGET_MS = 1.0
+COLD_REPEAT = 5
+
+
+def main(size: int):
+    response = decode_response(generate_rights_payload(size), ResultType.RIGHT)
+    results = response.results
+    catalog_index = CatalogIndex(None, response)
+    start = time.perf_counter()
+    catalog_index.title_index
+    print("%d rights, index built in %.2fs" % (size, time.perf_counter() - start))
+    print("%-8s %-14s %9s %12s %12s %12s %12s %12s" % ("field", "query", "matches", "index ms", "first ms",
+                                                       "cached ms", "active ms", "scan ms"))
+    over = []
+    for field, query in QUERIES:
+        index = float("inf")
+        for _ in range(COLD_REPEAT):
+            clear_caches(catalog_index.title_index)
+            start = time.perf_counter()
+            catalog_index.title_index.search_positions(query, field)
+            index = min(index, time.perf_counter() - start)
+        if index * 1000 > BUDGET_MS:
+            over.append(query)
+        clear_caches(catalog_index.title_index)
+        start = time.perf_counter()
+        matches = catalog_index.search(query, field).__len__()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            catalog_index.search(query, field, limit=20)
+        cached = (time.perf_counter() - start) / REPEAT
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            catalog_index.search(query, field, active=True, device=("provider", "ROKU"), limit=20)
+        active = (time.perf_counter() - start) / REPEAT
+        # THE SAME QUERY WITHOUT INDEX: A SUBSTRING SCAN OF THE TITLES
+        start = time.perf_counter()
+        words = query.split()
+        [result for result in results
+         if all(word in (result.localizable_information[0].title_name_medium or "").lower() for word in words)]
+        scan = time.perf_counter() - start
+        print("%-8s %-14s %9d %12.3f %12.3f %12.3f %12.3f %12.1f" % (field, query, matches, index * 1000, first * 1000,
+                                                                     cached * 1000, active * 1000, scan * 1000))
+    if over:
+        print("over the budget of %.1f ms: %s" % (BUDGET_MS, ", ".join(over)))
+        sys.exit(1)
+
+
+def clear_caches(title_index: TitleIndex):
+    title_index._token_positions.cache_clear()
+    title_index._probe.cache_clear()
+    title_index._mask.cache_clear()
+    title_index._query_positions.cache_clear()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv.__len__() > 1 else SIZE)
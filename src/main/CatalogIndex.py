@@ -0,0 +1,120 @@
+from datetime import datetime
+from functools import cached_property
+from itertools import islice
+from typing import Dict, FrozenSet, List, Tuple, Iterable
+
+from src.main.DeviceIndex import DeviceIndex
+from src.main.Result import Response, ResultAsset, ResultRights, Endpoint
+from src.main.TermIndex import TermIndex
+from src.main.TitleIndex import TitleIndex, TITLE
+
+
+class CatalogIndex:
+    """
+    Hash index of the two feeds, built once from the asset and the right Response. ResultAsset and ResultRights are
+    keyed by content_id and the endpoints by (video_format, endpoint.origin), so that the join between the feeds costs
+    O(1) for every content_id instead of a scan of the whole catalog
+    """
+
+    def __init__(self, response_asset: Response | None, response_right: Response | None):
+        self.assets: List[ResultAsset] = [] if response_asset is None else (response_asset.results or [])
+        self.rights: List[ResultRights] = [] if response_right is None else (response_right.results or [])
+
+        self.assets_by_content_id: Dict[str, List[ResultAsset]] = {}
+        # (video_format, origin) -> list of (content_id, endpoint) in the order of the feed
+        self.endpoints_by_format_and_origin: Dict[Tuple[str | None, str | None], List[Tuple[str, Endpoint]]] = {}
+        for result in self.assets:
+            self.assets_by_content_id.setdefault(result.content_id, []).append(result)
+            for asset in (result.assets or []):
+                if asset.endpoints is None or asset.endpoints.__len__() == 0:
+                    continue
+                key = (asset.video_format, asset.endpoints[0].origin)
+                self.endpoints_by_format_and_origin.setdefault(key, []).append((result.content_id,
+                                                                                asset.endpoints[0]))
+
+        self.rights_by_content_id: Dict[str, List[ResultRights]] = {}
+        for result in self.rights:
+            self.rights_by_content_id.setdefault(result.content_id, []).append(result)
+        self.term_index = TermIndex(self.rights)
+        self.device_index = DeviceIndex(self.rights)
+        self._device_positions: Dict[Tuple[str, str], FrozenSet[int]] = {}
+
+    @cached_property
+    def title_index(self) -> 'TitleIndex':
+        # BUILT AT THE FIRST SEARCH, THE FILTERS OF main.py DO NOT PAY IT
+        return TitleIndex(self.rights)
+
+    def get_assets(self, content_id: str) -> 'List[ResultAsset]':
+        return self.assets_by_content_id.get(content_id, [])
+
+    def get_rights(self, content_id: str) -> 'List[ResultRights]':
+        return self.rights_by_content_id.get(content_id, [])
+
+    def endpoints(self, video_format: str, origin: str, content_ids: Iterable[str] = None) -> 'List[Endpoint]':
+        """
+        Return the endpoints with the given video_format and origin, optionally only the ones of the given content_id
+
+        :param video_format: video format of the asset, e.g. "HD"
+        :param origin: origin of the endpoint, e.g. "level3"
+        :param content_ids: content_id to keep (optional, default all)
+        :returns List[Endpoint]: list of Endpoint in the order of the feed
+        """
+        candidates = self.endpoints_by_format_and_origin.get((video_format, origin), [])
+        if content_ids is None:
+            return [endpoint for _, endpoint in candidates]
+        content_ids = content_ids if isinstance(content_ids, (set, frozenset)) else set(content_ids)
+        return [endpoint for content_id, endpoint in candidates if content_id in content_ids]
+
+    def filter_result_by_active(self, result_rights: Iterable[ResultRights] = None,
+                                at: datetime = None) -> 'List[ResultRights]':
+        return self.term_index.filter_result_by_active(result_rights, at)
+
+    def filter_result_by_can_be_played_on_ROKU(self) -> 'List[ResultRights]':
+        return self.device_index.playable_on("provider", "ROKU")
+
+    def filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+            self, contend_ids: Iterable[str] = None, video_format: str = "HD", origin: str = "level3",
+            at: datetime = None) -> 'List[Endpoint]':
+        """
+        Same result of Result.filter_result_by_active_data_and_video_format_and_endpoint_origin_level, computed on the
+        index. If contend_ids is not given the content_id with active rights are used
+
+        :param contend_ids: content_id to keep (optional, default the ones with active rights)
+        :param video_format: video format of the asset [DEFAULT=HD]
+        :param origin: origin of the endpoint [DEFAULT=level3]
+        :param at: reference time used to check if the rights are active (optional, default now)
+        :returns List[Endpoint]: list of Endpoint
+        """
+        if contend_ids is None:
+            contend_ids = {result.content_id for result in self.filter_result_by_active(at=at)}
+        return self.endpoints(video_format, origin, contend_ids)
+
+    def search(self, query: str, field: str = TITLE, locale: str = None, active: bool = False,
+               device: Tuple[str, str] = None, at: datetime = None, limit: int = None) -> 'List[ResultRights]':
+        """
+        Search the titles (or the actors) with the TitleIndex, combined with the active rights and the device filters,
+        e.g. search("marple nem", active=True, device=("provider", "ROKU"))
+
+        :param query: text typed by the user, the last token is matched as a prefix
+        :param field: TITLE or ACTOR
+        :param locale: locale of the titles (optional, default all)
+        :param active: keep only the ResultRights with an active term at the reference time
+        :param device: (device_attribute, expected_value) the ResultRights have to be playable on (optional)
+        :param at: reference time used to check if the rights are active (optional, default now)
+        :param limit: max number of ResultRights (optional, default all)
+        :returns List[ResultRights]: list of ResultRights in the order of the feed
+        :raises ValueError: if the field is not indexed
+        :raises AttributeError: if the device attribute is not an attribute of Device
+        """
+        positions = iter(self.title_index.search_positions(query, field, locale))
+        # THE FILTERS ARE APPLIED WHILE THE MATCHES ARE READ, THEY STOP AT limit
+        if active:
+            active_positions = self.term_index.active_positions(at)
+            positions = (position for position in positions if position in active_positions)
+        if device is not None:
+            device_positions = self._device_positions.get(device)
+            if device_positions is None:
+                device_positions = frozenset(self.device_index.positions(self.device_index.bitmap(*device)))
+                self._device_positions[device] = device_positions
+            positions = (position for position in positions if position in device_positions)
+        return [self.rights[position] for position in islice(positions, limit)]
@@ -0,0 +1,184 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, Iterator, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+
+from src.main.HttpCache import ResponseCache
+from src.main.Metrics import Metrics
+
+
+class FetchError(Exception):
+    """
+    Raised when a feed could not be retrieved after all the attempts
+    """
+
+    def __init__(self, name: str, attempts: int, reason: str):
+        super().__init__("Unable to retrieve %s after %d attempts: %s" % (name, attempts, reason))
+        self.name = name
+        self.attempts = attempts
+        self.reason = reason
+
+
+class FeedClient:
+    """
+    HTTP client used to retrieve the feeds, it keeps a pooled keep-alive session, fetches the feeds concurrently and
+    retries only the feed that failed with a jittered exponential backoff
+    """
+
+    def __init__(self, auth: AuthBase = None, number_of_iterations: int = 3, timeout: float | Tuple[float, float] = 10.0,
+                 backoff_base: float = 0.1, backoff_cap: float = 2.0, pool_size: int = 10,
+                 session: requests.Session = None, cache: ResponseCache = None, offline: bool = False,
+                 metrics: Metrics = None):
+        """
+        :param auth: authentication used for every request (optional)
+        :param number_of_iterations: max number of attempts for every feed
+        :param timeout: deadline of every single request in seconds, or (connect, read) tuple
+        :param backoff_base: base delay in seconds of the exponential backoff
+        :param backoff_cap: max delay in seconds between two attempts
+        :param pool_size: max number of kept-alive connections per host
+        :param session: session to use instead of creating a new one (optional)
+        :param cache: on-disk cache used for conditional requests (optional)
+        :param offline: if True and the server keeps failing, the last response in cache is returned (optional)
+        :param metrics: where the retries and the bytes received are counted (optional)
+        """
+        self.number_of_iterations = max(1, number_of_iterations)
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.session = session if session is not None else requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        if auth is not None:
+            self.session.auth = auth
+
+    def __enter__(self) -> 'FeedClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def backoff(self, attempt: int) -> 'float':
+        """
+        Return the delay to wait before the next attempt, using "full jitter" on an exponential backoff
+
+        :param attempt: number of the attempt that just failed, starting from 1
+        :returns float: seconds to wait
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1))))
+
+    def fetch(self, url: str, name: str = None, stream: bool = False) -> 'requests.Response':
+        """
+        Retrieve a single feed, retrying it until it answers with status 200 or the attempts are finished
+
+        :param url: url of the feed
+        :param name: description of the feed used in logs (optional)
+        :param stream: if True the body is not downloaded, it has to be read with iter_content (optional, ignored with
+            a cache: the body is downloaded whole to be saved)
+        :returns requests.Response: response with status 200, the header X-Cache is set if it comes from the cache
+        :raises FetchError: if every attempt failed (and there is no snapshot in cache in offline mode)
+        """
+        name = url if name is None else name
+        entry = None
+        headers = {}
+        if self.cache is not None:
+            fresh = self.cache.get_fresh(url)
+            if fresh is not None:
+                logging.info("cache: %s served from cache", name)
+                return fresh.to_response("HIT")
+            entry = self.cache.get(url)
+            headers = self.cache.validators(entry)
+            # THE BODY HAS TO BE SAVED IN CACHE, SO IT IS ALWAYS DOWNLOADED
+            stream = False
+
+        reason = None
+        for attempt in range(1, self.number_of_iterations + 1):
+            logging.info("%d° attempt to call api: %s", attempt, name)
+            try:
+                response = self.session.get(url, timeout=self.timeout, stream=stream, headers=headers)
+                if response.status_code == 200:
+                    if not stream:
+                        self.metrics.increment("bytes_received", response.content.__len__())
+                    if self.cache is not None:
+                        self.cache.put(url, response)
+                    return response
+                if response.status_code == 304 and entry is not None:
+                    logging.info("cache: %s not modified", name)
+                    response.close()
+                    return self.cache.touch(entry).to_response("REVALIDATED")
+                reason = "status code %d" % response.status_code
+                response.close()
+            except requests.RequestException as e:
+                reason = str(e)
+            logging.warning("%d° attempt to call api: %s failed -> %s", attempt, name, reason)
+            if attempt < self.number_of_iterations:
+                self.metrics.increment("retries")
+                time.sleep(self.backoff(attempt))
+        if self.offline and entry is not None:
+            logging.warning("offline: %s served from the snapshot of %s", name,
+                            time.strftime("%d-%m-%y %H:%M", time.localtime(entry.stored_at)))
+            return entry.to_response("STALE")
+        raise FetchError(name, self.number_of_iterations, reason)
+
+    def fetch_all(self, feeds: Dict[str, str], stream: bool = False) -> 'Dict[str, requests.Response]':
+        """
+        Retrieve all the feeds at the same time, every feed is retried independently of the others
+
+        :param feeds: map of feed description -> url
+        :param stream: if True the bodies are not downloaded, they have to be read with iter_content (optional)
+        :returns Dict[str, requests.Response]: map of feed description -> response with status 200
+        :raises FetchError: if at least one feed could not be retrieved
+        """
+        if feeds.__len__() == 0:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(feeds.__len__(), self.pool_size)) as executor:
+            futures = {name: executor.submit(self.fetch, url, name, stream) for name, url in feeds.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def fetch_many(self, urls: Iterable[str], max_concurrency: int = None,
+                   stream: bool = False) -> 'Iterator[Tuple[int, str, requests.Response]]':
+        """
+        Retrieve many sources (pages, territory or channel shards) with at most max_concurrency requests in flight,
+        every source is retried independently of the others. urls can be a generator, it is consumed while the
+        responses arrive, so the sources do not have to be known in advance
+
+        :param urls: list or generator of urls
+        :param max_concurrency: max number of requests at the same time (optional, default pool_size)
+        :param stream: if True the bodies are not downloaded, they have to be read with iter_content (optional)
+        :returns Iterator[Tuple[int, str, requests.Response]]: (position of the url, url, response with status 200) in
+            order of completion
+        :raises FetchError: as soon as a source could not be retrieved, the sources not started yet are cancelled
+        """
+        max_concurrency = self.pool_size if max_concurrency is None else max(1, max_concurrency)
+        sources = enumerate(urls)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            running: Dict[Future, Tuple[int, str]] = {}
+            try:
+                while True:
+                    # THE WINDOW IS REFILLED UP TO max_concurrency BEFORE WAITING FOR THE NEXT RESPONSE
+                    for position, url in sources:
+                        running[executor.submit(self.fetch, url, url, stream)] = (position, url)
+                        if running.__len__() >= max_concurrency:
+                            break
+                    if running.__len__() == 0:
+                        return
+                    done: Set[Future] = wait(running, return_when=FIRST_COMPLETED).done
+                    for future in done:
+                        position, url = running.pop(future)
+                        yield position, url, future.result()
+            finally:
+                for future in running:
+                    future.cancel()
@@ -0,0 +1,204 @@
+import sys
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, Tuple
+
+from src.main.Result import ResultType, Endpoint, Asset, Device, Term, LocalizableInformation, Right, ResultAsset, \
+    ResultRights, Response
+
+
+def _values(model: Any, names: Tuple[str, ...]) -> Tuple[Any, ...]:
+    # LISTS OF THE PLAIN MODELS ARE COMPARED AS THE TUPLES OF THE COMPACT ONES
+    return tuple(tuple(value) if isinstance(value, list) else value for value in
+                 (getattr(model, name) for name in names))
+
+
+class _CompactModel:
+    """
+    Base of the compact models: slotted and immutable copies of the models of Result, equal to the plain model with the
+    same values so that they can be used in place of them
+    """
+    __slots__ = ()
+    _plain: ClassVar[type]
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__ or other.__class__ is self._plain:
+            names = tuple(self._plain.__dataclass_fields__)
+            return _values(self, names) == _values(other, names)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(_values(self, tuple(self._plain.__dataclass_fields__)))
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactEndpoint(_CompactModel):
+    _plain: ClassVar[type] = Endpoint
+    origin: str | None
+    path: str | None
+
+    print_path = Endpoint.print_path
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactAsset(_CompactModel):
+    _plain: ClassVar[type] = Asset
+    endpoints: Tuple[CompactEndpoint, ...] | None
+    video_format: str | None
+
+    is_video_format_HD_and_origin_level3 = Asset.is_video_format_HD_and_origin_level3
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactDevice(_CompactModel):
+    _plain: ClassVar[type] = Device
+    device_platform: str | None
+    device_type: str | None
+    provider: str | None
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactTerm(_CompactModel):
+    _plain: ClassVar[type] = Term
+    start_date_time: datetime
+    end_date_time: datetime
+    territory: str | None
+    devices: Tuple[CompactDevice, ...] | None
+
+    is_active = Term.is_active
+    can_be_played_on_device = Term.can_be_played_on_device
+    can_be_played_on_ROKU = Term.can_be_played_on_ROKU
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactLocalizableInformation(_CompactModel):
+    _plain: ClassVar[type] = LocalizableInformation
+    locale: str | None
+    language: str | None
+    title_name_medium: str | None
+    episode_name: str | None = None
+    episode_number: str | None = None
+    season_number: str | None = None
+    actors: Tuple[str, ...] | None = None
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactRight(_CompactModel):
+    _plain: ClassVar[type] = Right
+    channel: str | None
+    terms: Tuple[CompactTerm, ...] | None
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactResultAsset(_CompactModel):
+    _plain: ClassVar[type] = ResultAsset
+    content_id: str
+    access_channel: str | None
+    assets: Tuple[CompactAsset, ...] | None
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class CompactResultRights(_CompactModel):
+    _plain: ClassVar[type] = ResultRights
+    content_id: str
+    access_channel: str | None
+    localizable_information: Tuple[CompactLocalizableInformation, ...] | None
+    rights: CompactRight | None
+
+    print_title_name_medium = ResultRights.print_title_name_medium
+
+
+class CompactDecoder:
+    """
+    Build the compact models from the feed: every record is validated by the from_dict of Result, the low-cardinality
+    strings (formats, origins, territories, locales, channels) are interned, the equal Device and datetime are shared
+    between all the terms
+    """
+
+    def __init__(self):
+        self._devices: Dict[Tuple[str | None, str | None, str | None], CompactDevice] = {}
+        self._dates: Dict[Tuple[int, ...], datetime] = {}
+
+    @staticmethod
+    def intern(value: str | None) -> 'str | None':
+        return None if value is None else sys.intern(value)
+
+    def date(self, value: datetime) -> 'datetime':
+        # THE HASH OF datetime IS SLOW, THE KEY IS BUILT FROM ITS FIELDS. THE CACHED DATE KEEPS ITS tzinfo ALIVE SO ITS
+        # id CANNOT BE REUSED BY ANOTHER tzinfo
+        key = (value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond,
+               id(value.tzinfo))
+        return self._dates.setdefault(key, value)
+
+    def endpoint(self, endpoint: Endpoint) -> 'CompactEndpoint':
+        return CompactEndpoint(self.intern(endpoint.origin), endpoint.path)
+
+    def asset(self, asset: Asset) -> 'CompactAsset':
+        _endpoints = None if asset.endpoints is None else tuple(self.endpoint(elem) for elem in asset.endpoints)
+        return CompactAsset(_endpoints, self.intern(asset.video_format))
+
+    def device(self, device: Device) -> 'CompactDevice':
+        key = (device.device_platform, device.device_type, device.provider)
+        compact_device = self._devices.get(key)
+        if compact_device is None:
+            compact_device = CompactDevice(self.intern(device.device_platform), self.intern(device.device_type),
+                                           self.intern(device.provider))
+            self._devices[key] = compact_device
+        return compact_device
+
+    def term(self, term: Term) -> 'CompactTerm':
+        _devices = None if term.devices is None else tuple(self.device(elem) for elem in term.devices)
+        return CompactTerm(self.date(term.start_date_time), self.date(term.end_date_time), self.intern(term.territory),
+                           _devices)
+
+    def localizable_information(self, localizable_information: LocalizableInformation) \
+            -> 'CompactLocalizableInformation':
+        # THE SAME ACTORS APPEAR IN MANY TITLES, THEIR NAMES ARE INTERNED
+        _actors = None if localizable_information.actors is None \
+            else tuple(self.intern(actor) for actor in localizable_information.actors)
+        return CompactLocalizableInformation(self.intern(localizable_information.locale),
+                                             self.intern(localizable_information.language),
+                                             localizable_information.title_name_medium,
+                                             localizable_information.episode_name,
+                                             self.intern(localizable_information.episode_number),
+                                             self.intern(localizable_information.season_number), _actors)
+
+    def right(self, right: Right) -> 'CompactRight':
+        _terms = None if right.terms is None else tuple(self.term(elem) for elem in right.terms)
+        return CompactRight(self.intern(right.channel), _terms)
+
+    def result_asset(self, result: ResultAsset) -> 'CompactResultAsset':
+        _assets = None if result.assets is None else tuple(self.asset(elem) for elem in result.assets)
+        return CompactResultAsset(result.content_id, self.intern(result.access_channel), _assets)
+
+    def result_rights(self, result: ResultRights) -> 'CompactResultRights':
+        _localizable_information = None if result.localizable_information is None else \
+            tuple(self.localizable_information(elem) for elem in result.localizable_information)
+        _rights = None if result.rights is None else self.right(result.rights)
+        return CompactResultRights(result.content_id, self.intern(result.access_channel), _localizable_information,
+                                   _rights)
+
+    def from_dict(self, result: Any, result_type: ResultType) -> 'CompactResultAsset | CompactResultRights':
+        """
+        Decode and validate a single element of "results"
+        """
+        match result_type:
+            case ResultType.ASSET:
+                return self.result_asset(ResultAsset.from_dict(result))
+            case ResultType.RIGHT:
+                return self.result_rights(ResultRights.from_dict(result))
+
+
+def compact_response_from_dict(response: Any, result_type: ResultType, decoder: CompactDecoder = None) -> 'Response':
+    """
+    Same of Response.from_dict but the results are compact models, and the Response holds them in a list
+
+    :param response: payload as returned by json.loads
+    :param result_type: ResultType of the elements
+    :param decoder: decoder to share the interned values with other responses (optional)
+    :returns Response: Response of CompactResultAsset or CompactResultRights
+    """
+    decoder = CompactDecoder() if decoder is None else decoder
+    _results = None if response.get("results") is None else [decoder.from_dict(elem, result_type) for elem in
+                                                             response.get("results")]
+    return Response(_results)
@@ -0,0 +1,6 @@
+from requests.auth import HTTPBasicAuth
+
+URL_ASSET = 'https://ko3vcqvszf.execute-api.eu-west-1.amazonaws.com/tq'
+URL_RIGHT = 'https://ko3vcqvszf.execute-api.eu-west-1.amazonaws.com/vq'
+BASIC_AUTH = HTTPBasicAuth('gcd-test',
+                           'V2VsbCBkb25lIG9uIGRlY29kaW5nIHRoaXMsIG1lbnRpb24gdGhpcyBpbiB5b3VyIGludGVydmlldy4=')
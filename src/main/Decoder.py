@@ -0,0 +1,190 @@
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.main.Result import Response, ResultType, ResultAsset, ResultRights, Asset, Endpoint, Device, Term, Right, \
+    LocalizableInformation
+from src.main.Timestamp import parse_timestamp
+
+# KINDS OF A FIELD OF THE FEED
+STRING = "string"
+CONTENT_ID = "content_id"
+TIMESTAMP = "timestamp"
+LIST = "list"
+STRINGS = "strings"
+OBJECT = "object"
+
+
+class Field:
+    """
+    Field of a model in the schema: attribute of the model, key of the feed and how the value is converted
+    """
+
+    def __init__(self, name: str, key: str, kind: str = STRING, model: type = None, max_length: int = None,
+                 item_key: str = None):
+        """
+        :param name: attribute of the model
+        :param key: key of the record in the feed, "parent.key" for a key of a nested object
+        :param kind: STRING (str or None), CONTENT_ID (required str), TIMESTAMP (required date), STRINGS (list of str,
+            read from the key item_key of every element when it is given),
+            LIST or OBJECT of model
+        :param model: model of the elements of a LIST or of an OBJECT
+        :param max_length: max number of elements of a LIST (optional)
+        :param item_key: key of the string in the elements of STRINGS, the elements without it are skipped (optional)
+        """
+        self.name = name
+        self.key = key
+        self.kind = kind
+        self.model = model
+        self.max_length = max_length
+        self.item_key = item_key
+
+
+# SAME RULES OF THE from_dict OF Result
+SCHEMAS: Dict[type, Tuple[Field, ...]] = {
+    Endpoint: (Field("origin", "origin"), Field("path", "path")),
+    Asset: (Field("endpoints", "endpoints", LIST, Endpoint, max_length=1), Field("video_format", "videoFormat")),
+    Device: (Field("device_platform", "devicePlatform"), Field("device_type", "deviceType"),
+             Field("provider", "provider")),
+    Term: (Field("start_date_time", "startDateTime", TIMESTAMP), Field("end_date_time", "endDateTime", TIMESTAMP),
+           Field("territory", "territory"), Field("devices", "devices", LIST, Device)),
+    LocalizableInformation: (Field("locale", "locale"), Field("language", "language"),
+                             Field("title_name_medium", "titleNameMedium"), Field("episode_name", "episodeName"),
+                             Field("episode_number", "episodeNumber"), Field("season_number", "seasonNumber"),
+                             Field("actors", "credits.actor", STRINGS, item_key="fullName")),
+    Right: (Field("channel", "channel"), Field("terms", "terms", LIST, Term, max_length=1)),
+    ResultAsset: (Field("content_id", "contentId", CONTENT_ID), Field("access_channel", "accessChannel"),
+                  Field("assets", "assets", LIST, Asset)),
+    ResultRights: (Field("content_id", "contentId", CONTENT_ID), Field("access_channel", "accessChannel"),
+                   Field("localizable_information", "localizableInformation", LIST, LocalizableInformation),
+                   Field("rights", "rights", OBJECT, Right)),
+}
+
+
+class RecordError(ValueError):
+    """
+    Raised when a record of "results" is not valid, index is its position in the payload
+    """
+
+    def __init__(self, index: int, reason: str, record: Any = None):
+        super().__init__("Record %d is not valid: %s" % (index, reason))
+        self.index = index
+        self.reason = reason
+        self.record = record
+
+
+def _source(model: type) -> str:
+    # BODY OF THE DECODER: EVERY KEY IS READ ONCE, CHECKED AND CONVERTED IN PLACE
+    schema = SCHEMAS[model]
+    if tuple(field.name for field in schema) != tuple(field.name for field in fields(model)):
+        raise ValueError("The schema of %s does not match its fields" % model.__name__)
+    lines = ["def decode_%s(record):" % model.__name__]
+    checks = []
+    for field in schema:
+        parent, _, key = field.key.rpartition(".")
+        if parent:
+            # A MISSING PARENT OBJECT IS A MISSING VALUE
+            lines += ["    %s = record.get(%r)" % (field.name, parent),
+                      "    if %s is not None:" % field.name,
+                      "        %s = %s.get(%r)" % (field.name, field.name, key)]
+        else:
+            lines.append("    %s = record.get(%r)" % (field.name, field.key))
+        match field.kind:
+            case "string":
+                checks += ["    if %s is not None and %s.__class__ is not str:" % (field.name, field.name),
+                           "        %s = str(%s)" % (field.name, field.name)]
+            case "content_id":
+                lines += ["    if %s is None or %s == '':" % (field.name, field.name),
+                          "        raise ValueError('%s is required')" % field.key,
+                          "    if %s.__class__ is not str:" % field.name,
+                          "        %s = str(%s)" % (field.name, field.name)]
+            case "timestamp":
+                lines += ["    if %s is None:" % field.name,
+                          "        raise ValueError('%s is required')" % field.key]
+                checks += ["    %s = parse_timestamp(%s)" % (field.name, field.name)]
+            case "strings":
+                items = field.name if field.item_key is None else \
+                    "(element.get(%r) for element in %s)" % (field.item_key, field.name)
+                checks += ["    if %s is not None:" % field.name,
+                           "        %s = [item if item.__class__ is str else str(item) for item in %s "
+                           "if item is not None]" % (field.name, items)]
+            case "list":
+                if field.max_length is not None:
+                    # THE LENGTH IS CHECKED BEFORE ANY NESTED RECORD IS DECODED, AS from_dict DOES
+                    lines += ["    if %s is not None and %s.__len__() > %d:" % (field.name, field.name,
+                                                                                 field.max_length),
+                              "        raise ValueError('%s has to be an array with at most %d value, found %%d' "
+                              "%% %s.__len__())" % (field.key, field.max_length, field.name)]
+                checks += ["    if %s is not None:" % field.name,
+                           "        %s = [decode_%s(item) for item in %s]" % (field.name, field.model.__name__,
+                                                                            field.name)]
+            case "object":
+                checks += ["    if %s is not None:" % field.name,
+                           "        %s = decode_%s(%s)" % (field.name, field.model.__name__, field.name)]
+            case _:
+                raise ValueError("Unknown kind %s of %s.%s" % (field.kind, model.__name__, field.name))
+    lines += checks
+    lines.append("    return %s(%s)" % (model.__name__, ", ".join(field.name for field in schema)))
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def compile_decoder(model: type) -> 'Callable[[Any], Any]':
+    """
+    Generate and compile once the decoder of a model of Result from its schema: it returns the same model of from_dict
+    and raises ValueError for the same records, but every key is read only once
+
+    :param model: class of Result in SCHEMAS
+    :returns Callable[[Any], Any]: function record -> model
+    """
+    namespace: Dict[str, Any] = {model.__name__: model, "parse_timestamp": parse_timestamp}
+    for field in SCHEMAS[model]:
+        if field.model is not None:
+            namespace["decode_" + field.model.__name__] = compile_decoder(field.model)
+    exec(compile(_source(model), "<decoder %s>" % model.__name__, "exec"), namespace)
+    return namespace["decode_" + model.__name__]
+
+
+def decode_records(records: List[Any], result_type: ResultType, quarantine: List[RecordError] = None,
+                   offset: int = 0) -> 'List[ResultAsset | ResultRights]':
+    """
+    Decode the records of "results" with the compiled decoder of result_type
+
+    :param records: records as returned by json.loads
+    :param result_type: ResultType of the records
+    :param quarantine: where the records that are not valid are collected, the other ones are decoded anyway
+        (optional, without it the first record that is not valid raises RecordError)
+    :param offset: index in the payload of the first record
+    :returns List[ResultAsset | ResultRights]: decoded records
+    :raises RecordError: without quarantine, for the first record that is not valid
+    """
+    decode = compile_decoder(ResultAsset if result_type == ResultType.ASSET else ResultRights)
+    results = []
+    append = results.append
+    for index, record in enumerate(records, offset):
+        try:
+            append(decode(record))
+        except Exception as e:
+            error = RecordError(index, str(e), record)
+            if quarantine is None:
+                raise error from e
+            quarantine.append(error)
+    return results
+
+
+def decode_response(response: Any, result_type: ResultType, quarantine: List[RecordError] = None) -> 'Response':
+    """
+    Same of Response.from_dict with the compiled decoders, with quarantine the records that are not valid are
+    collected with their index and reason instead of stopping the parse:
+
+        quarantine = []
+        response = decode_response(payload, ResultType.RIGHT, quarantine)
+
+    :param response: payload as returned by json.loads
+    :param result_type: ResultType of the elements
+    :param quarantine: where the records that are not valid are collected (optional)
+    :returns Response: Response of ResultAsset or ResultRights
+    :raises RecordError: without quarantine, for the first record that is not valid
+    """
+    records = response.get("results")
+    return Response(None if records is None else decode_records(records, result_type, quarantine))
@@ -0,0 +1,265 @@
+import hashlib
+import heapq
+import json
+import logging
+import os
+import pickle
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from src.main.Result import ResultAsset, ResultRights, Response, Endpoint
+from src.main.Stream import iter_records
+from src.main.Timestamp import to_utc
+
+_EXPIRY = timedelta(microseconds=1)
+
+
+def content_hash(raw_records: List[str]) -> 'bytes':
+    """
+    Hash of the raw text of the records of a content_id, as they are in the body of the feed
+    """
+    return hashlib.blake2b("\x1e".join(raw_records).encode("utf-8"), digest_size=16).digest()
+
+
+def _iter_raw_records(payload: Any) -> 'Iterator[Tuple[Any, str]]':
+    if isinstance(payload, (bytes, bytearray, str)):
+        # THE TEXT OF EVERY RECORD IS THE SLICE OF THE BODY READ BY THE DECODER, IT IS NOT ENCODED AGAIN
+        yield from iter_records([payload], raw=True)
+        return
+    # A PAYLOAD ALREADY DECODED (E.G. MERGED FROM SHARDS) HAS NO BODY, ITS RECORDS ARE ENCODED AGAIN
+    for record in (payload.get("results") or []):
+        yield record, json.dumps(record, separators=(",", ":"))
+
+
+def _group_by_content_id(payload: Any) -> 'Dict[str | None, Tuple[List[Any], List[str]]]':
+    groups: Dict[str | None, Tuple[List[Any], List[str]]] = {}
+    for record, raw in _iter_raw_records(payload):
+        content_id = record.get("contentId") if isinstance(record, dict) else None
+        # A RECORD WITHOUT contentId IS REJECTED BY from_dict AS USUAL
+        group = groups.setdefault(None if content_id is None else str(content_id), ([], []))
+        group[0].append(record)
+        group[1].append(raw)
+    return groups
+
+
+@dataclass
+class DeltaChanges:
+    """
+    What changed from the previous sync: content_id added, changed and removed in at least one feed, and the HD/level3
+    manifests that became active or inactive
+    """
+    added: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    newly_active: List[Endpoint] = field(default_factory=list)
+    went_inactive: List[Endpoint] = field(default_factory=list)
+
+
+@dataclass
+class DeltaResult:
+    response_asset: Response
+    response_right: Response
+    # FULL OUTPUT: HD/level3 MANIFESTS OF THE ACTIVE RIGHTS, IN THE ORDER OF THE ASSET FEED
+    endpoints: List[Endpoint]
+    changes: DeltaChanges
+    # NUMBER OF RECORDS DECODED WITH from_dict IN THIS SYNC
+    parsed: int
+    # content_id WITH AT LEAST ONE ACTIVE RIGHT
+    active: Set[str] = field(default_factory=set)
+    # content_id -> HD/level3 MANIFESTS OF THE ACTIVE RIGHTS, IN THE ORDER OF THE ASSET FEED (endpoints BY content_id)
+    manifests: Dict[str, List[Endpoint]] = field(default_factory=dict)
+
+
+class DeltaState:
+    """
+    State kept between two syncs, it can be saved with pickle
+    """
+
+    def __init__(self):
+        # content_id -> (hash of the raw records, parsed records)
+        self.assets: Dict[str, Tuple[bytes, List[ResultAsset]]] = {}
+        self.rights: Dict[str, Tuple[bytes, List[ResultRights]]] = {}
+        # content_id -> True if at least one right is active
+        self.active: Dict[str, bool] = {}
+        # content_id -> time when its activity can change, and HEAP OF (boundary, content_id): an entry that is not the
+        # current boundary of its content_id is outdated and skipped when it is popped
+        self.next_boundaries: Dict[str, datetime] = {}
+        self.boundaries: List[Tuple[datetime, str]] = []
+        # content_id -> HD/level3 endpoints of the assets
+        self.candidates: Dict[str, List[Endpoint]] = {}
+        self.asset_order: List[str] = []
+
+    def set_boundary(self, content_id: str, boundary: datetime | None):
+        if boundary is None:
+            self.next_boundaries.pop(content_id, None)
+        elif self.next_boundaries.get(content_id) != boundary:
+            self.next_boundaries[content_id] = boundary
+            heapq.heappush(self.boundaries, (boundary, content_id))
+
+    def pop_boundaries(self, at: datetime) -> 'Set[str]':
+        """
+        Return the content_id whose boundary is not after at, their boundaries are removed
+        """
+        content_ids: Set[str] = set()
+        while self.boundaries.__len__() > 0 and self.boundaries[0][0] <= at:
+            boundary, content_id = heapq.heappop(self.boundaries)
+            if self.next_boundaries.get(content_id) == boundary:
+                del self.next_boundaries[content_id]
+                content_ids.add(content_id)
+        return content_ids
+
+    def compact(self):
+        """
+        Drop the outdated entries of the heap, one entry for every content_id is left
+        """
+        if self.boundaries.__len__() > self.next_boundaries.__len__():
+            self.boundaries = [(boundary, content_id) for content_id, boundary in self.next_boundaries.items()]
+            heapq.heapify(self.boundaries)
+
+
+class DeltaSync:
+    """
+    Incremental sync of the two feeds keyed by content_id. The raw records of every content_id are hashed and compared
+    with the previous sync: only added and changed records are decoded with from_dict and re-filtered, the others are
+    reused. The activity of a content_id is evaluated again only when the reference time crosses one of its boundaries
+    """
+
+    def __init__(self, state_path: str = None):
+        """
+        :param state_path: file where the state is saved between runs (optional, default only in memory)
+        """
+        self.state_path = state_path
+        self.state = DeltaState()
+        if state_path is not None and os.path.exists(state_path):
+            try:
+                with open(state_path, "rb") as file:
+                    self.state = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+                logging.warning("delta: state %s cannot be loaded, full sync -> %s", state_path, e)
+                self.state = DeltaState()
+            if not hasattr(self.state, "next_boundaries"):
+                logging.warning("delta: state %s was saved by an older version, full sync", state_path)
+                self.state = DeltaState()
+
+    def save(self):
+        if self.state_path is None:
+            return
+        self.state.compact()
+        temporary = self.state_path + ".tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(self.state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.state_path)
+
+    @staticmethod
+    def _diff(previous: Dict[str, Tuple[bytes, List[Any]]], groups: Dict[str | None, Tuple[List[Any], List[str]]],
+              from_dict, changes: DeltaChanges) -> 'Tuple[Dict[str, Tuple[bytes, List[Any]]], Set[str], int]':
+        current: Dict[str, Tuple[bytes, List[Any]]] = {}
+        touched: Set[str] = set()
+        parsed = 0
+        for content_id, (records, raw_records) in groups.items():
+            if content_id is None:
+                # RAISE THE SAME ERROR OF A FULL PARSE
+                [from_dict(record) for record in records]
+            digest = content_hash(raw_records)
+            old = previous.get(content_id)
+            if old is not None and old[0] == digest:
+                current[content_id] = old
+                continue
+            current[content_id] = (digest, [from_dict(record) for record in records])
+            parsed += records.__len__()
+            touched.add(content_id)
+            (changes.added if old is None else changes.changed).add(content_id)
+        for content_id in previous.keys() - current.keys():
+            touched.add(content_id)
+            changes.removed.add(content_id)
+        return current, touched, parsed
+
+    @staticmethod
+    def _activity(rights: List[ResultRights], at: datetime) -> 'Tuple[bool, datetime | None]':
+        """
+        Return if at least one term is active and the first time after at in which this can change
+        """
+        active = False
+        boundary = None
+        for result in rights:
+            if result.rights is None:
+                continue
+            for term in (result.rights.terms or []):
+                start, end = to_utc(term.start_date_time), to_utc(term.end_date_time)
+                active = active or start <= at <= end
+                for candidate in (start, end + _EXPIRY):
+                    if candidate > at and (boundary is None or candidate < boundary):
+                        boundary = candidate
+        return active, boundary
+
+    def _manifests(self, content_id: str) -> 'List[Endpoint]':
+        return self.state.candidates.get(content_id, []) if self.state.active.get(content_id, False) else []
+
+    def sync(self, payload_asset: Any, payload_right: Any, at: datetime = None) -> 'DeltaResult':
+        """
+        Sync the state with the new payloads of the feeds
+
+        :param payload_asset: "tq" body (bytes or str), or payload as returned by json.loads
+        :param payload_right: "vq" body (bytes or str), or payload as returned by json.loads
+        :param at: reference time used to check if the rights are active (optional, default now)
+        :returns DeltaResult: full output and change set
+        """
+        at = datetime.now(timezone.utc) if at is None else to_utc(at)
+        state = self.state
+        changes = DeltaChanges()
+
+        asset_groups = _group_by_content_id(payload_asset)
+        right_groups = _group_by_content_id(payload_right)
+        assets, touched_assets, parsed_assets = self._diff(state.assets, asset_groups, ResultAsset.from_dict, changes)
+        rights, touched_rights, parsed_rights = self._diff(state.rights, right_groups, ResultRights.from_dict, changes)
+        # THE CHANGE SET IS BY content_id: IT IS ADDED OR REMOVED ONLY IF IT IS NEW OR MISSING IN BOTH FEEDS
+        known = state.assets.keys() | state.rights.keys()
+        changes.changed |= {content_id for content_id in changes.added if content_id in known}
+        changes.changed |= {content_id for content_id in changes.removed if content_id in assets or content_id in rights}
+        changes.added -= changes.changed
+        changes.removed -= changes.changed
+
+        # content_id TO FILTER AGAIN: CHANGED IN ONE OF THE FEEDS OR WITH A TERM THAT STARTED/EXPIRED SINCE LAST SYNC
+        dirty: Set[str] = touched_assets | touched_rights | state.pop_boundaries(at)
+        previous_manifests = {content_id: self._manifests(content_id) for content_id in dirty}
+
+        for content_id in touched_assets:
+            if content_id in assets:
+                state.candidates[content_id] = [asset.endpoints[0] for result in assets[content_id][1]
+                                                for asset in (result.assets or [])
+                                                if asset.is_video_format_HD_and_origin_level3()]
+            else:
+                state.candidates.pop(content_id, None)
+        for content_id in dirty:
+            if content_id not in rights:
+                state.active.pop(content_id, None)
+                state.set_boundary(content_id, None)
+                continue
+            active, boundary = self._activity(rights[content_id][1], at)
+            state.active[content_id] = active
+            state.set_boundary(content_id, boundary)
+        # THE HEAP IS KEPT WITHIN TWICE THE NUMBER OF content_id ALSO WHEN THE STATE IS NOT SAVED
+        if state.boundaries.__len__() > 2 * state.next_boundaries.__len__():
+            state.compact()
+
+        # THE CHANGE SET FOLLOWS THE ORDER OF THE ASSET FEED, THE REMOVED content_id ARE AT THE END
+        order = {content_id: position for position, content_id in enumerate(state.asset_order)}
+        order.update({content_id: position - asset_groups.__len__() for position, content_id in enumerate(asset_groups)})
+        for content_id in sorted(dirty, key=lambda item: order.get(item, order.__len__())):
+            current = self._manifests(content_id)
+            previous = previous_manifests[content_id]
+            changes.newly_active.extend(endpoint for endpoint in current if endpoint not in previous)
+            changes.went_inactive.extend(endpoint for endpoint in previous if endpoint not in current)
+
+        state.assets = assets
+        state.rights = rights
+        state.asset_order = list(asset_groups.keys())
+        response_asset = Response([result for content_id in asset_groups for result in assets[content_id][1]])
+        response_right = Response([result for content_id in right_groups for result in rights[content_id][1]])
+        manifests = {content_id: self._manifests(content_id) for content_id in state.asset_order
+                     if state.active.get(content_id, False) and state.candidates.get(content_id)}
+        endpoints = [endpoint for content_endpoints in manifests.values() for endpoint in content_endpoints]
+        active = {content_id for content_id, content_active in state.active.items() if content_active}
+        return DeltaResult(response_asset, response_right, endpoints, changes, parsed_assets + parsed_rights, active,
+                           manifests)
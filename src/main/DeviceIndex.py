@@ -0,0 +1,136 @@
+from typing import Dict, List, Tuple, Iterable
+
+from src.main.Result import ResultRights
+
+DEVICE_ATTRIBUTES: Tuple[str, ...] = ("device_platform", "device_type", "provider")
+
+
+class DeviceIndex:
+    """
+    Inverted index of the devices of a list of ResultRights. For every device attribute (device_platform, device_type
+    and provider) every value is mapped to a bitmap of the positions of the ResultRights that can be played on it, the
+    bitmap is a python int where the bit i is set if the ResultRights in position i has a Device with that value.
+    "Playable on X and Y" and "playable on any of ..." become bitwise and/or between bitmaps
+    """
+
+    def __init__(self, result_rights: List[ResultRights] | None):
+        self.results: List[ResultRights] = result_rights or []
+        self._bitmaps: Dict[str, Dict[str, int]] = {attribute: {} for attribute in DEVICE_ATTRIBUTES}
+
+        # THE POSITIONS ARE COLLECTED FIRST AND THE BITMAPS BUILT AT THE END, TO NOT CREATE A NEW BIG INT FOR EVERY BIT
+        positions: Dict[str, Dict[str, List[int]]] = {attribute: {} for attribute in DEVICE_ATTRIBUTES}
+        for position, result in enumerate(self.results):
+            if result.rights is None:
+                continue
+            for term in (result.rights.terms or []):
+                for device in (term.devices or []):
+                    for attribute in DEVICE_ATTRIBUTES:
+                        value = getattr(device, attribute)
+                        if value is None:
+                            continue
+                        value_positions = positions[attribute].setdefault(value, [])
+                        if value_positions.__len__() == 0 or value_positions[-1] != position:
+                            value_positions.append(position)
+        for attribute, values in positions.items():
+            for value, value_positions in values.items():
+                self._bitmaps[attribute][value] = self._to_bitmap(value_positions)
+
+    @staticmethod
+    def _to_bitmap(positions: List[int]) -> 'int':
+        if positions.__len__() == 0:
+            return 0
+        bits = bytearray(b"0" * (positions[-1] + 1))
+        for position in positions:
+            bits[position] = 49  # ord("1")
+        return int(bits[::-1], 2)
+
+    def _attribute_bitmaps(self, device_attribute: str) -> 'Dict[str, int]':
+        if device_attribute not in self._bitmaps:
+            raise AttributeError("Device has no attribute '%s'" % device_attribute)
+        return self._bitmaps[device_attribute]
+
+    def values(self, device_attribute: str) -> 'List[str]':
+        """
+        Return all the values of a device attribute present in the index, e.g. all the providers
+        """
+        return list(self._attribute_bitmaps(device_attribute).keys())
+
+    def bitmap(self, device_attribute: str, expected_value: str) -> 'int':
+        """
+        Return the bitmap of the ResultRights that have a Device with device_attribute equal to expected_value
+
+        :param device_attribute: one of device_platform, device_type, provider
+        :param expected_value: expected value of the attribute
+        :returns int: bitmap of the positions
+        :raises AttributeError: if device_attribute is not an attribute of Device
+        """
+        return self._attribute_bitmaps(device_attribute).get(expected_value, 0)
+
+    def bitmap_all(self, conditions: Iterable[Tuple[str, str]]) -> 'int':
+        bitmap = None
+        for device_attribute, expected_value in conditions:
+            bitmap = self.bitmap(device_attribute, expected_value) if bitmap is None \
+                else bitmap & self.bitmap(device_attribute, expected_value)
+            if bitmap == 0:
+                return 0
+        return 0 if bitmap is None else bitmap
+
+    def bitmap_any(self, conditions: Iterable[Tuple[str, str]]) -> 'int':
+        bitmap = 0
+        for device_attribute, expected_value in conditions:
+            bitmap |= self.bitmap(device_attribute, expected_value)
+        return bitmap
+
+    def positions(self, bitmap: int) -> 'List[int]':
+        """
+        Return the positions of the bits set in the bitmap, in ascending order
+        """
+        bits = bin(bitmap)[:1:-1]
+        positions = []
+        position = bits.find("1")
+        while position != -1:
+            positions.append(position)
+            position = bits.find("1", position + 1)
+        return positions
+
+    def results_of(self, bitmap: int) -> 'List[ResultRights]':
+        return [self.results[position] for position in self.positions(bitmap)]
+
+    @staticmethod
+    def count(bitmap: int) -> 'int':
+        return bitmap.bit_count()
+
+    def playable_on(self, device_attribute: str, expected_value: str) -> 'List[ResultRights]':
+        """
+        Return the ResultRights that can be played on a device, e.g. playable_on("provider", "ROKU")
+
+        :param device_attribute: one of device_platform, device_type, provider
+        :param expected_value: expected value of the attribute
+        :returns List[ResultRights]: list of ResultRights in the order of the index
+        """
+        return self.results_of(self.bitmap(device_attribute, expected_value))
+
+    def playable_on_all(self, conditions: Iterable[Tuple[str, str]]) -> 'List[ResultRights]':
+        """
+        Return the ResultRights that can be played on all the devices, e.g.
+        playable_on_all([("provider", "SKY"), ("device_type", "TV")])
+
+        :param conditions: list of (device_attribute, expected_value)
+        :returns List[ResultRights]: list of ResultRights in the order of the index
+        """
+        return self.results_of(self.bitmap_all(conditions))
+
+    def playable_on_any(self, conditions: Iterable[Tuple[str, str]]) -> 'List[ResultRights]':
+        """
+        Return the ResultRights that can be played on at least one of the devices
+
+        :param conditions: list of (device_attribute, expected_value)
+        :returns List[ResultRights]: list of ResultRights in the order of the index
+        """
+        return self.results_of(self.bitmap_any(conditions))
+
+    def count_by_value(self, device_attribute: str) -> 'Dict[str, int]':
+        """
+        Return for every value of the attribute how many ResultRights can be played on it, e.g. for every provider
+        """
+        return {value: bitmap.bit_count() for value, bitmap in self._attribute_bitmaps(device_attribute).items()}
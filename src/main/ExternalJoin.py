@@ -0,0 +1,227 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from src.main.Result import ResultAsset, ResultRights, Endpoint
+from src.main.Timestamp import to_utc
+
+DEFAULT_MEMORY_LIMIT = 64 * 2 ** 20
+# MAX ITEMS WRITTEN WITH A SINGLE pickle.dump, A MERGE KEEPS IN MEMORY ONE BATCH FOR EVERY RUN
+BATCH_SIZE = 1024
+# RUNS MERGED AT THE SAME TIME (ONE OPEN FILE EVERY RUN), MORE RUNS ARE MERGED IN PASSES INTO LONGER ONES
+MAX_FAN_IN = 64
+
+
+def _size_of(item: Tuple) -> int:
+    return sys.getsizeof(item) + sum(sys.getsizeof(value) for value in item)
+
+
+class ExternalSorter:
+    """
+    Sort of tuples bigger than the memory: items are kept in memory until memory_limit, then sorted and written to disk
+    as a run. Iterating the sorter merges the runs, at most MAX_FAN_IN at a time, keeping in memory only one batch of
+    every run: batches are sized so that MAX_FAN_IN of them fit in half of memory_limit
+    """
+
+    def __init__(self, directory: str, key: Callable[[Tuple], Any] = None, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        """
+        :param directory: directory of the runs
+        :param key: sort key of the items (optional, default the item)
+        :param memory_limit: bytes of items kept in memory before a run is written
+        """
+        self.directory = directory
+        self.key = key
+        self.memory_limit = memory_limit
+        self.runs: List[str] = []
+        self._items: List[Tuple] = []
+        self._size = 0
+        self._batch_size = BATCH_SIZE
+
+    def add(self, item: Tuple):
+        self._items.append(item)
+        self._size += _size_of(item)
+        if self._size >= self.memory_limit:
+            self._spill()
+
+    def _spill(self):
+        self._items.sort(key=self.key)
+        # THE AVERAGE SIZE OF THE ITEMS OF THIS RUN SIZES THE BATCHES OF THE RUNS WRITTEN FROM NOW ON: MAX_FAN_IN OF
+        # THEM TAKE HALF OF memory_limit, THE OTHER HALF IS LEFT TO THE BATCH WRITTEN BY A PASS AND TO THE OBJECTS READ
+        self._batch_size = max(1, min(BATCH_SIZE, self.memory_limit * self._items.__len__() //
+                                      (2 * MAX_FAN_IN * max(self._size, 1))))
+        self.runs.append(self._write(self._items))
+        self._items = []
+        self._size = 0
+
+    def release(self, memory_limit: int):
+        """
+        Write the items kept in memory as a run if they take more than memory_limit bytes, the merge of the runs keeps
+        at most half of the memory_limit of the sorter
+        """
+        if self._size > memory_limit:
+            self._spill()
+
+    def _write(self, items: Iterable[Tuple]) -> str:
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self.directory)
+        items = iter(items)
+        with os.fdopen(fd, "wb") as file:
+            while True:
+                batch = list(islice(items, self._batch_size))
+                if not batch:
+                    return path
+                pickle.dump(batch, file, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _read(path: str) -> Iterator[Tuple]:
+        with open(path, "rb") as file:
+            while True:
+                try:
+                    yield from pickle.load(file)
+                except EOFError:
+                    return
+
+    def _merge(self, runs: List[str]) -> Iterator[Tuple]:
+        return heapq.merge(*(self._read(path) for path in runs), key=self.key)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        if not self.runs:
+            # EVERYTHING FITS IN MEMORY, NOTHING IS WRITTEN
+            return iter(sorted(self._items, key=self.key))
+        if self._items:
+            self._spill()
+        # CONSECUTIVE RUNS ARE MERGED, THE ITEMS WITH THE SAME KEY KEEP THE ORDER IN WHICH THEY WERE ADDED
+        while self.runs.__len__() > MAX_FAN_IN:
+            runs = []
+            for start in range(0, self.runs.__len__(), MAX_FAN_IN):
+                group = self.runs[start:start + MAX_FAN_IN]
+                if group.__len__() == 1:
+                    runs.append(group[0])
+                    continue
+                runs.append(self._write(self._merge(group)))
+                for path in group:
+                    os.remove(path)
+            self.runs = runs
+        return self._merge(self.runs)
+
+
+class ExternalEndpointJoin:
+    """
+    Join between the assets and the active rights by content_id with bounded memory, for catalogs that do not fit in
+    memory. Only the keys needed by the join are kept: the content_id of the active rights and (content_id, position,
+    origin, path) of the endpoints with the expected video_format and origin. Both the sides are sorted on disk by
+    content_id and joined with a merge, the endpoints are then sorted back in the order of the feed
+
+        with ExternalEndpointJoin(memory_limit=2 ** 26) as join:
+            for result in iter_results(...): join.add_rights(result)
+            for result in iter_results(...): join.add_assets(result)
+            endpoints = list(join.endpoints())
+    """
+
+    def __init__(self, video_format: str = "HD", origin: str = "level3", at: datetime = None,
+                 memory_limit: int = DEFAULT_MEMORY_LIMIT, directory: str = None):
+        """
+        :param video_format: video format of the asset [DEFAULT=HD]
+        :param origin: origin of the endpoint [DEFAULT=level3]
+        :param at: reference time used to check if the rights are active (optional, default now)
+        :param memory_limit: bytes of keys kept in memory, shared by the two sides of the join and the sort in feed
+            order
+        :param directory: directory where the temporary runs are created (optional, default the temp directory)
+        """
+        self.video_format = video_format
+        self.origin = origin
+        self.at = datetime.now(timezone.utc) if at is None else to_utc(at)
+        self.memory_limit = memory_limit
+        self.directory = tempfile.mkdtemp(prefix="join-", dir=directory)
+        self._rights = ExternalSorter(self.directory, memory_limit=memory_limit // 2)
+        self._assets = ExternalSorter(self.directory, memory_limit=memory_limit // 2)
+        self._position = 0
+
+    def __enter__(self) -> 'ExternalEndpointJoin':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def add_rights(self, result: ResultRights):
+        if result.rights is None:
+            return
+        at = self.at
+        for term in (result.rights.terms or []):
+            if term.is_active(at):
+                self._rights.add((result.content_id,))
+                return
+
+    def add_assets(self, result: ResultAsset):
+        for asset in (result.assets or []):
+            if asset.video_format == self.video_format and asset.endpoints \
+                    and asset.endpoints[0].origin == self.origin:
+                self._assets.add((result.content_id, self._position, asset.endpoints[0].origin,
+                                  asset.endpoints[0].path))
+                self._position += 1
+
+    def _joined(self) -> Iterator[Tuple]:
+        rights = iter(self._rights)
+        right = next(rights, None)
+        for item in self._assets:
+            content_id = item[0]
+            while right is not None and right[0] < content_id:
+                right = next(rights, None)
+            if right is None:
+                return
+            if right[0] == content_id:
+                yield item
+
+    def endpoints(self, feed_order: bool = True) -> 'Iterator[Endpoint]':
+        """
+        Merge the two sides and return the endpoints of the active content_id
+
+        :param feed_order: return the endpoints in the order of the asset feed, with an external sort of the result
+            (otherwise they are in order of content_id)
+        :returns Iterator[Endpoint]: endpoints of the join
+        """
+        if feed_order:
+            # THE CAP IS SHARED ALSO BY THE SORT IN FEED ORDER: WHILE THEY ARE MERGED THE TWO SIDES KEEP AT MOST A
+            # QUARTER OF IT EACH (THEIR ITEMS IN MEMORY OR ONE BATCH OF EVERY RUN), THE SORT THE OTHER HALF
+            self._rights.release(self.memory_limit // 4)
+            self._assets.release(self.memory_limit // 4)
+        joined = self._joined()
+        if feed_order:
+            ordered = ExternalSorter(self.directory, key=lambda item: item[1], memory_limit=self.memory_limit // 2)
+            for item in joined:
+                ordered.add(item)
+            joined = iter(ordered)
+        for _, _, origin, path in joined:
+            yield Endpoint(origin, path)
+
+
+def external_join_endpoints(result_asset: Iterable[ResultAsset], result_rights: Iterable[ResultRights],
+                            video_format: str = "HD", origin: str = "level3", at: datetime = None,
+                            memory_limit: int = DEFAULT_MEMORY_LIMIT, directory: str = None) -> 'List[Endpoint]':
+    """
+    Same result of Result.filter_result_by_active_data_and_video_format_and_endpoint_origin_level with the active
+    content_id, computed with bounded memory. The feeds can be iterators, e.g. Stream.iter_results
+
+    :param result_asset: iterable of ResultAsset
+    :param result_rights: iterable of ResultRights
+    :param video_format: video format of the asset [DEFAULT=HD]
+    :param origin: origin of the endpoint [DEFAULT=level3]
+    :param at: reference time used to check if the rights are active (optional, default now)
+    :param memory_limit: bytes of keys kept in memory
+    :param directory: directory where the temporary runs are created (optional, default the temp directory)
+    :returns List[Endpoint]: list of Endpoint in the order of the asset feed
+    """
+    with ExternalEndpointJoin(video_format, origin, at, memory_limit, directory) as join:
+        for result in result_rights:
+            join.add_rights(result)
+        for result in result_asset:
+            join.add_assets(result)
+        return list(join.endpoints())
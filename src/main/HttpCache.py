@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+class CacheEntry:
+    """
+    Body and validators of a cached response
+    """
+
+    def __init__(self, url: str, body: bytes, etag: str | None, last_modified: str | None, stored_at: float,
+                 content_type: str | None = None):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.content_type = content_type
+
+    def age(self) -> 'float':
+        return time.time() - self.stored_at
+
+    def to_response(self, cache_status: str) -> 'requests.Response':
+        """
+        Build a requests.Response with status 200 from the cached body, the header X-Cache tells how it was served
+        (HIT, REVALIDATED or STALE)
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.body
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict({CACHE_STATUS_HEADER: cache_status,
+                                                "Content-Length": str(self.body.__len__())})
+        if self.content_type is not None:
+            response.headers["Content-Type"] = self.content_type
+        if self.etag is not None:
+            response.headers["ETag"] = self.etag
+        if self.last_modified is not None:
+            response.headers["Last-Modified"] = self.last_modified
+        return response
+
+
+class ResponseCache:
+    """
+    On-disk cache of the feed responses. For every url the body is saved in <key>.body and the validators (ETag and
+    Last-Modified) in <key>.json. A response younger than ttl is served without calling the server, an older one is
+    revalidated with If-None-Match/If-Modified-Since and served again if the server answers 304. When the total size of
+    the bodies is over max_size the least recently used entries are removed
+    """
+
+    def __init__(self, directory: str, ttl: float = 0, max_size: int = 512 * 2 ** 20):
+        """
+        :param directory: directory of the cache, created if it does not exist
+        :param ttl: seconds in which a response is served without revalidation [DEFAULT=0, always revalidate]
+        :param max_size: max total size of the bodies in bytes
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> 'tuple[str, str]':
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".body"), os.path.join(self.directory, key + ".json")
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        # WRITE AND RENAME, SO THAT A READER NEVER SEES A HALF WRITTEN FILE
+        temporary = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def get(self, url: str) -> 'CacheEntry | None':
+        body_path, metadata_path = self._paths(url)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as file:
+                metadata: Dict[str, Any] = json.load(file)
+            with open(body_path, "rb") as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+        if body.__len__() != metadata.get("size"):
+            return None
+        # THE ACCESS TIME OF THE BODY IS USED FOR THE EVICTION
+        os.utime(body_path)
+        return CacheEntry(url, body, metadata.get("etag"), metadata.get("last_modified"), metadata.get("stored_at", 0),
+                          metadata.get("content_type"))
+
+    def get_fresh(self, url: str) -> 'CacheEntry | None':
+        """
+        Return the entry only if it is younger than ttl
+        """
+        if self.ttl <= 0:
+            return None
+        entry = self.get(url)
+        return entry if entry is not None and entry.age() < self.ttl else None
+
+    def validators(self, entry: CacheEntry | None) -> 'Dict[str, str]':
+        """
+        Return the headers of a conditional request for the entry
+        """
+        headers = {}
+        if entry is not None and entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(self, url: str, response: requests.Response) -> 'CacheEntry':
+        """
+        Save the body and the validators of a response with status 200, a body bigger than max_size is not saved
+        """
+        body = response.content
+        entry = CacheEntry(url, body, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time(),
+                           response.headers.get("Content-Type"))
+        if body.__len__() > self.max_size:
+            # IT WOULD BE EVICTED AT ONCE, TOGETHER WITH ALL THE OTHER ENTRIES
+            logging.warning("cache: %s is %d bytes, more than the max size of the cache (%d), it is not cached", url,
+                            body.__len__(), self.max_size)
+            return entry
+        body_path, _ = self._paths(url)
+        with self._lock:
+            self._write(body_path, body)
+            self._write_metadata(entry)
+            self.evict()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> 'CacheEntry':
+        """
+        Mark the entry as just validated, after a 304 of the server: only the metadata is written, the body is the
+        same
+        """
+        entry.stored_at = time.time()
+        with self._lock:
+            self._write_metadata(entry)
+        return entry
+
+    def _write_metadata(self, entry: CacheEntry):
+        metadata = {"url": entry.url, "etag": entry.etag, "last_modified": entry.last_modified,
+                    "stored_at": entry.stored_at, "size": entry.body.__len__(), "content_type": entry.content_type}
+        self._write(self._paths(entry.url)[1], json.dumps(metadata).encode("utf-8"))
+
+    def size(self) -> 'int':
+        return sum(os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory)
+                   if name.endswith(".body"))
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the total size of the bodies is under max_size
+        """
+        bodies = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".body"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in bodies)
+        for _, size, path in sorted(bodies):
+            if total <= self.max_size:
+                break
+            logging.info("cache: evicting %s", os.path.basename(path))
+            for file in (path, path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(file)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,156 @@
+from datetime import datetime
+from functools import cached_property
+from typing import Any, ClassVar, List, Tuple
+
+from src.main.Result import ResultType, Device, Term, LocalizableInformation, Right, ResultRights, Response
+from src.main.Timestamp import parse_timestamp
+
+# KEYS OF THE PAYLOAD OF THE ATTRIBUTES OF Device
+_DEVICE_KEYS = {"device_platform": "devicePlatform", "device_type": "deviceType", "provider": "provider"}
+
+
+class _LazyModel:
+    """
+    Base of the lazy models: they keep the raw dict of the payload and decode a field the first time it is read, the
+    value is then cached on the instance. They are equal to the plain model with the same values
+    """
+    _plain: ClassVar[type]
+
+    def __init__(self, raw: Any):
+        self._raw = raw
+
+    def __eq__(self, other):
+        if getattr(other, "_plain", other.__class__) is self._plain:
+            names = tuple(self._plain.__dataclass_fields__)
+            return all(getattr(self, name) == getattr(other, name) for name in names)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(
+            "%s=%r" % (name, getattr(self, name)) for name in self._plain.__dataclass_fields__))
+
+    def materialize(self) -> '_LazyModel':
+        """
+        Decode every field, running the assertions of the plain from_dict
+
+        :returns _LazyModel: the model itself
+        """
+        for name in self._plain.__dataclass_fields__:
+            value = getattr(self, name)
+            for elem in (value if isinstance(value, list) else [value]):
+                if isinstance(elem, _LazyModel):
+                    elem.materialize()
+        return self
+
+
+class LazyTerm(_LazyModel):
+    _plain: ClassVar[type] = Term
+
+    @cached_property
+    def _dates(self) -> 'Tuple[datetime, datetime]':
+        term = self._raw
+        if term.get("startDateTime") is None or term.get("endDateTime") is None:
+            raise ValueError(
+                "From Assertions startDateTime and endDateTime has both required:\nData startDateTime:[%s] - endDateTime:[%s]",
+                term.get("startDateTime"), term.get("endDateTime"))
+        return parse_timestamp(term.get("startDateTime")), parse_timestamp(term.get("endDateTime"))
+
+    @property
+    def start_date_time(self) -> datetime:
+        return self._dates[0]
+
+    @property
+    def end_date_time(self) -> datetime:
+        return self._dates[1]
+
+    @cached_property
+    def territory(self) -> 'str | None':
+        return None if self._raw.get("territory") is None else str(self._raw.get("territory"))
+
+    @cached_property
+    def devices(self) -> 'List[Device] | None':
+        return None if self._raw.get("devices") is None else [Device.from_dict(elem) for elem in self._raw.get("devices")]
+
+    def can_be_played_on_device(self, device_attribute: str, expected_value: str) -> 'bool':
+        if "devices" in self.__dict__:
+            return Term.can_be_played_on_device(self, device_attribute, expected_value)
+        # UNTIL THE DEVICES ARE READ THE FILTER LOOKS AT THE RAW DICTS, A REJECTED TERM NEVER BUILDS ITS DEVICES
+        if device_attribute not in _DEVICE_KEYS:
+            raise AttributeError("'Device' object has no attribute '%s'" % device_attribute)
+        key = _DEVICE_KEYS[device_attribute]
+        for device in (self._raw.get("devices") or []):
+            value = device.get(key)
+            if value is not None and str(value) == expected_value:
+                return True
+        return False
+
+    is_active = Term.is_active
+    can_be_played_on_ROKU = Term.can_be_played_on_ROKU
+
+
+class LazyRight(_LazyModel):
+    _plain: ClassVar[type] = Right
+
+    @cached_property
+    def channel(self) -> 'str | None':
+        return None if self._raw.get("channel") is None else str(self._raw.get("channel"))
+
+    @cached_property
+    def terms(self) -> 'List[LazyTerm] | None':
+        right = self._raw
+        if right.get("terms") is not None and right.get("terms").__len__() > 1:
+            raise ValueError("From Assertions rights has to be an array with JUST one value:\nData: [%s]",
+                             right.get("terms"))
+        return None if right.get("terms") is None else [LazyTerm(elem) for elem in right.get("terms")]
+
+
+class LazyResultRights(_LazyModel):
+    _plain: ClassVar[type] = ResultRights
+
+    def __init__(self, raw: Any):
+        # content_id IS THE KEY OF EVERY JOIN, IT IS CHECKED AND DECODED IMMEDIATELY
+        if raw.get("contentId") is None or raw.get("contentId") == "":
+            raise ValueError("From Assertions content_id is required:\nData [%s]", raw.get("contentId"))
+        super().__init__(raw)
+        self.content_id = str(raw.get("contentId"))
+
+    @cached_property
+    def access_channel(self) -> 'str | None':
+        return None if self._raw.get("accessChannel") is None else str(self._raw.get("accessChannel"))
+
+    @cached_property
+    def localizable_information(self) -> 'List[LocalizableInformation] | None':
+        return None if self._raw.get("localizableInformation") is None else \
+            [LocalizableInformation.from_dict(elem) for elem in self._raw.get("localizableInformation")]
+
+    @cached_property
+    def rights(self) -> 'LazyRight | None':
+        return None if self._raw.get("rights") is None else LazyRight(self._raw.get("rights"))
+
+    print_title_name_medium = ResultRights.print_title_name_medium
+
+
+def lazy_response_from_dict(response: Any, result_type: ResultType, validate: bool = False) -> 'Response':
+    """
+    Same of Response.from_dict, but the rights are LazyResultRights: the nested fields are decoded when a filter reads
+    them, a record rejected by a filter on its devices never decodes its dates and titles. Assets are decoded as usual,
+    the join reads all their fields anyway
+
+    :param response: payload as returned by json.loads
+    :param result_type: ResultType of the elements
+    :param validate: decode every field immediately, so that a not valid record raises here like with from_dict
+    :returns Response: Response of ResultAsset or LazyResultRights
+    """
+    match result_type:
+        case ResultType.ASSET:
+            return Response.from_dict(response, result_type)
+        case ResultType.RIGHT:
+            if response.get("results") is None:
+                return Response(None)
+            results = [LazyResultRights(elem) for elem in response.get("results")]
+            if validate:
+                for result in results:
+                    result.materialize()
+            return Response(results)
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+# STAGES OF A RUN OF main.py
+STAGES = ("fetch", "decode", "parse", "filter", "output")
+# COUNTERS OF A RUN, THE ONES NOT INCREMENTED ARE REPORTED AS 0
+COUNTERS = ("retries", "records_parsed", "records_rejected", "records_quarantined", "bytes_received",
+            "endpoints_probed", "endpoints_unreachable")
+
+
+class Metrics:
+    """
+    Spans and counters of a run, exported as a JSON report or in the Prometheus text format. Spans with the same name
+    are summed. It is thread safe, the feeds are fetched by a pool of threads
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        :param trace_memory: record with tracemalloc the peak of traced memory during every span (it slows the run)
+        """
+        self.trace_memory = trace_memory
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def stop(self):
+        """
+        Stop tracemalloc if it has been started by these metrics
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Measure the block as a span of the stage name:
+
+            with metrics.span("parse"):
+                ...
+        """
+        if self.trace_memory:
+            # THE PEAK IS RESET AT EVERY SPAN, SO A SPAN INSIDE ANOTHER ONE HIDES THE PEAK BEFORE IT TO THE OUTER SPAN
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            with self._lock:
+                span = self.spans.setdefault(name, {"count": 0, "seconds": 0.0})
+                span["count"] += 1
+                span["seconds"] += seconds
+                if peak is not None:
+                    span["peak_bytes"] = max(span.get("peak_bytes", 0), peak)
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> 'Dict[str, Any]':
+        """
+        :returns Dict[str, Any]: run report with the spans, the counters and the total duration
+        """
+        with self._lock:
+            return {"started_at": self.started_at, "duration_seconds": time.time() - self.started_at,
+                    "spans": {name: dict(span) for name, span in self.spans.items()},
+                    "counters": dict(self.counters)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=2)
+
+    def to_prometheus(self, prefix: str = "catalog") -> str:
+        """
+        Export the metrics in the Prometheus text format (e.g. for the textfile collector of node_exporter)
+
+        :param prefix: prefix of the name of every metric
+        :returns str: metrics in the Prometheus text format
+        """
+        report = self.report()
+        lines = []
+
+        def family(name: str, kind: str, description: str, samples: Dict[str, float], label: str = None):
+            lines.append("# HELP %s_%s %s" % (prefix, name, description))
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            for key, value in samples.items():
+                labels = "" if label is None else '{%s="%s"}' % (label, key)
+                lines.append("%s_%s%s %s" % (prefix, name, labels, repr(float(value))))
+
+        spans = report["spans"]
+        family("stage_duration_seconds", "gauge", "Time spent in the stage during the last run",
+               {name: span["seconds"] for name, span in spans.items()}, "stage")
+        family("stage_calls", "gauge", "Number of spans of the stage during the last run",
+               {name: span["count"] for name, span in spans.items()}, "stage")
+        peaks = {name: span["peak_bytes"] for name, span in spans.items() if "peak_bytes" in span}
+        if peaks:
+            family("stage_peak_memory_bytes", "gauge", "Peak of traced memory during the stage (tracemalloc)", peaks,
+                   "stage")
+        for name, value in report["counters"].items():
+            family(name + "_total", "counter", "Number of %s during the last run" % name.replace("_", " "),
+                   {name: value})
+        family("run_duration_seconds", "gauge", "Duration of the last run", {"": report["duration_seconds"]})
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: str = None, prometheus_path: str = None):
+        """
+        Write the report to the files given, the Prometheus file is replaced atomically for the textfile collector
+        """
+        for path, content in ((json_path, self.to_json), (prometheus_path, self.to_prometheus)):
+            if path is not None:
+                with open(path + ".tmp", "w", encoding="utf-8") as file:
+                    file.write(content())
+                os.replace(path + ".tmp", path)
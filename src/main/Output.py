@@ -0,0 +1,196 @@
+import csv
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, TextIO
+
+from src.main.Result import Endpoint, ResultRights
+
+OUTPUT_FORMATS = ("log", "text", "jsonl", "csv")
+# COLUMNS OF THE CSV, A RECORD FILLS ONLY THE ONES OF ITS KIND
+OUTPUT_FIELDS = ("section", "content_id", "title", "origin", "path", "reachable", "status", "latency_ms")
+DEFAULT_BATCH_SIZE = 8192
+
+# SAME ENCODING OF json.dumps(ensure_ascii=False), WITHOUT BUILDING AN ENCODER FOR EVERY RECORD
+_encode_string = json.encoder.encode_basestring
+
+
+def _encode_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if value.__class__ is str:
+        return _encode_string(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+class OutputSink(ABC):
+    """
+    Buffered writer of the results: records are formatted in memory and written to the stream in batches, one write
+    call every batch_size records. Logging is left to the diagnostics
+    """
+
+    def __init__(self, stream: TextIO, batch_size: int = DEFAULT_BATCH_SIZE, close_stream: bool = False):
+        """
+        :param stream: text stream where the records are written
+        :param batch_size: number of records kept in memory before a write
+        :param close_stream: close the stream with the sink (for the files opened by open_sink)
+        """
+        self.stream = stream
+        self.batch_size = batch_size
+        self.close_stream = close_stream
+        self.current_section: str | None = None
+        # LINES WRITTEN TO THE STREAM, HEADERS INCLUDED
+        self.written = 0
+        self._lines: List[str] = []
+
+    def section(self, name: str):
+        """
+        Start a new group of records, e.g. "Manifests of active endpoints:"
+        """
+        self.current_section = name
+
+    @abstractmethod
+    def _format(self, record: Dict[str, Any]) -> str:
+        pass
+
+    def write(self, record: Dict[str, Any]):
+        self._lines.append(self._format(record))
+        if self._lines.__len__() >= self.batch_size:
+            self.flush()
+
+    def write_all(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._lines:
+            self.stream.write("".join(self._lines))
+            self.written += self._lines.__len__()
+            self._lines = []
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.close_stream:
+            self.stream.close()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TextSink(OutputSink):
+    """
+    One value per line (the path of an endpoint or the title of a right), a section is written as a header line
+    """
+
+    def section(self, name: str):
+        super().section(name)
+        self._lines.append(name + "\n")
+
+    def _format(self, record: Dict[str, Any]) -> str:
+        value = record.get("path", record.get("title"))
+        return ("" if value is None else str(value)) + "\n"
+
+
+class JsonLinesSink(OutputSink):
+    """
+    One JSON object per line, the section is a field of the object
+    """
+
+    def __init__(self, stream: TextIO, batch_size: int = DEFAULT_BATCH_SIZE, close_stream: bool = False):
+        super().__init__(stream, batch_size, close_stream)
+        self._section = '{"section": null'
+
+    def section(self, name: str):
+        super().section(name)
+        # THE SECTION IS THE SAME FOR ALL THE RECORDS THAT FOLLOW, IT IS ENCODED ONCE
+        self._section = '{"section": ' + _encode_value(name)
+
+    def _format(self, record: Dict[str, Any]) -> str:
+        return self._section + "".join([", " + _encode_string(key) + ": " + _encode_value(value)
+                                        for key, value in record.items()]) + "}\n"
+
+
+class _LineWriter:
+    # TARGET OF csv.writer, IT KEEPS THE LAST LINE FORMATTED
+    line: str = ""
+
+    def write(self, line: str):
+        self.line = line
+
+
+class CsvSink(OutputSink):
+    """
+    CSV with the columns of OUTPUT_FIELDS and a header row
+    """
+
+    def __init__(self, stream: TextIO, batch_size: int = DEFAULT_BATCH_SIZE, close_stream: bool = False):
+        super().__init__(stream, batch_size, close_stream)
+        self._line_writer = _LineWriter()
+        self._writer = csv.writer(self._line_writer, lineterminator="\n")
+        self._lines.append(",".join(OUTPUT_FIELDS) + "\n")
+
+    def _format(self, record: Dict[str, Any]) -> str:
+        self._writer.writerow((self.current_section, record.get("content_id"), record.get("title"),
+                               record.get("origin"), record.get("path"), record.get("reachable"),
+                               record.get("status"), record.get("latency_ms")))
+        return self._line_writer.line
+
+
+def open_sink(output_format: str, path: str = None, batch_size: int = DEFAULT_BATCH_SIZE) -> 'OutputSink | None':
+    """
+    Create the sink of an output format, on stdout or on a file
+
+    :param output_format: one of OUTPUT_FORMATS, "log" keeps the logging of the results and returns None
+    :param path: file where the results are written (optional, default stdout)
+    :param batch_size: number of records kept in memory before a write
+    :returns OutputSink | None: the sink, None for "log"
+    :raises ValueError: if the format is not supported
+    """
+    sink_class = {"log": None, "text": TextSink, "jsonl": JsonLinesSink, "csv": CsvSink}.get(output_format, False)
+    if sink_class is False:
+        raise ValueError("Output format %s is not supported, use one of %s" % (output_format, OUTPUT_FORMATS))
+    if sink_class is None:
+        return None
+    if path is None:
+        return sink_class(sys.stdout, batch_size)
+    return sink_class(open(path, "w", encoding="utf-8", newline="", buffering=2 ** 20), batch_size, True)
+
+
+def write_endpoints(sink: OutputSink, endpoints: List[Endpoint], header: str = None, probes: List[Any] = None):
+    """
+    Same of print_endpoints, on a sink
+
+    :param sink: OutputSink
+    :param endpoints: list of Endpoint
+    :param header: section of the records (optional)
+    :param probes: ProbeResult of every endpoint, added to its record (optional)
+    """
+    if header is not None:
+        sink.section(header)
+    if probes is None:
+        sink.write_all({"origin": endpoint.origin, "path": endpoint.path} for endpoint in (endpoints or []))
+    else:
+        sink.write_all({"origin": endpoint.origin, "path": endpoint.path, **probe.to_record()}
+                       for endpoint, probe in zip(endpoints, probes))
+    logging.debug("output: %d endpoints written", (endpoints or []).__len__())
+
+
+def write_title_name_medium(sink: OutputSink, result_right: List[ResultRights], header: str = None):
+    """
+    Same of print_title_name_medium, on a sink
+
+    :param sink: OutputSink
+    :param result_right: list of ResultRights
+    :param header: section of the records (optional)
+    """
+    if header is not None:
+        sink.section(header)
+    sink.write_all({"content_id": result.content_id,
+                    "title": None if not result.localizable_information
+                    else result.localizable_information[0].title_name_medium} for result in (result_right or []))
+    logging.debug("output: %d titles written", (result_right or []).__len__())
@@ -0,0 +1,57 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, Executor
+from typing import Any, List, Tuple
+
+from src.main.Decoder import RecordError, decode_records
+from src.main.Result import ResultType, Response
+
+
+def _parse_chunk(arguments: Tuple[List[Any], ResultType, int]) -> 'Tuple[List[Any], int | None, str | None]':
+    # RUN IN THE WORKER PROCESS: THE ERROR IS RETURNED AND NOT RAISED, SO THAT THE PARENT CAN REPORT ITS INDEX
+    records, result_type, offset = arguments
+    try:
+        return decode_records(records, result_type, offset=offset), None, None
+    except RecordError as e:
+        return [], e.index, e.reason
+
+
+def parallel_response_from_dict(response: Any, result_type: ResultType, workers: int = None, chunk_size: int = None,
+                                executor: Executor = None) -> 'Response':
+    """
+    Same of Response.from_dict, but "results" is split in chunks decoded in a process pool. The results keep the order
+    of the payload and every record is validated by the compiled decoder of its class (see Decoder)
+
+    :param response: payload as returned by json.loads
+    :param result_type: ResultType of the elements
+    :param workers: number of processes (optional, default number of CPUs), with 1 the payload is decoded in process
+    :param chunk_size: records sent to a worker at a time (optional, default 4 chunks for every worker)
+    :param executor: pool to use instead of creating a new one (optional)
+    :returns Response: Response of ResultAsset or ResultRights
+    :raises RecordError: for the first not valid record, with its index
+    """
+    records = response.get("results")
+    if records is None:
+        return Response(None)
+    workers = (os.cpu_count() or 1) if workers is None else max(1, workers)
+    if workers == 1 and executor is None:
+        results, index, reason = _parse_chunk((records, result_type, 0))
+        if index is not None:
+            raise RecordError(index, reason)
+        return Response(results)
+
+    chunk_size = max(1, math.ceil(records.__len__() / (workers * 4))) if chunk_size is None else chunk_size
+    chunks = [(records[start:start + chunk_size], result_type, start)
+              for start in range(0, records.__len__(), chunk_size)]
+    pool = ProcessPoolExecutor(max_workers=workers) if executor is None else executor
+    try:
+        results = []
+        # map KEEPS THE ORDER OF THE CHUNKS, SO THE FIRST ERROR FOUND IS THE ONE WITH THE LOWEST INDEX
+        for chunk_results, index, reason in pool.map(_parse_chunk, chunks):
+            if index is not None:
+                raise RecordError(index, reason)
+            results.extend(chunk_results)
+        return Response(results)
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
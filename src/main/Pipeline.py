@@ -0,0 +1,524 @@
+import json
+import logging
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Tuple
+
+from src.main.Decoder import RecordError, decode_response
+from src.main.Metrics import Metrics
+from src.main.Output import OUTPUT_FORMATS, OutputSink, write_endpoints, write_title_name_medium
+from src.main.Result import Response, ResultType, ResultRights, LocalizableInformation, Endpoint, \
+    filter_result_by_active, filter_result_by_can_be_played_on_ROKU, print_endpoints, print_title_name_medium, \
+    filter_result_by_active_data_and_video_format_and_endpoint_origin_level
+
+# THE MODULES OF THE NETWORK (requests) AND OF THE OPTIONAL MODES ARE IMPORTED BY THE STAGES THAT NEED THEM, SO THAT
+# IMPORTING THE PIPELINE, --help AND A QUERY OF A SNAPSHOT DO NOT PAY THEIR IMPORT
+
+
+def _flag(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _urls(value: str) -> List[str]:
+    return [url for url in value.split(",") if url]
+
+
+def _origins(value: str) -> Dict[str, str]:
+    # level3=https://a.example.com,akamai=https://b.example.com
+    origins = {}
+    for item in _urls(value):
+        if not item.__contains__("="):
+            raise ValueError("%s is not origin=url" % item)
+        origin, base_url = item.split("=", 1)
+        origins[origin] = base_url
+    return origins
+
+
+@dataclass
+class Options:
+    """
+    Options of a run of the pipeline, the names of the command line are the upper case names of the fields (e.g.
+    number_of_iterations -> NUMBER_OF_ITERATIONS=5)
+    """
+    number_of_iterations: int = 3
+    print_filter_by_device: bool = False
+    print_filter_by_device_and_active: bool = False
+    output: str = "log"
+    output_file: str | None = None
+    stream: bool = False
+    compact: bool = False
+    lazy: bool = False
+    cache_dir: str | None = None
+    cache_ttl: float = 0
+    cache_max_size: int = 512 * 2 ** 20
+    offline: bool = False
+    delta_state: str | None = None
+    join_memory_limit: int | None = None
+    urls_asset: List[str] | None = None
+    urls_right: List[str] | None = None
+    max_concurrency: int | None = None
+    metrics_report: str | None = None
+    metrics_prometheus: str | None = None
+    trace_memory: bool = False
+    snapshot: str | None = None
+    from_snapshot: str | None = None
+    content_id: List[str] | None = None
+    lenient: bool = False
+    quarantine_file: str | None = None
+    probe_origins: Dict[str, str] | None = None
+    probe_timeout: float = 2.0
+    probe_concurrency: int = 4
+    probe_cache: str | None = None
+    probe_ttl: float = 300
+    probe_filter: bool = False
+    probe_max_latency: float | None = None
+
+    def __post_init__(self):
+        if self.output not in OUTPUT_FORMATS:
+            logging.warning("config: OUTPUT has to be one of %s, your configuration %s is not supported -> default "
+                            "value = log", OUTPUT_FORMATS, self.output)
+            self.output = "log"
+        if self.from_snapshot is not None and (self.stream or self.join_memory_limit is not None or self.sharded):
+            logging.warning("config: FROM_SNAPSHOT reads the catalog from the snapshot -> STREAM = False, "
+                            "JOIN_MEMORY_LIMIT = None, URLS_ASSET/URLS_RIGHT = None")
+            self.stream, self.join_memory_limit, self.urls_asset, self.urls_right = False, None, None, None
+        if self.join_memory_limit is not None and not self.stream:
+            logging.warning("config: JOIN_MEMORY_LIMIT needs STREAM=true, the feeds are read one record at a time -> "
+                            "STREAM = True")
+            self.stream = True
+        if self.cache_dir is not None and self.stream:
+            logging.warning("config: STREAM is not supported with CACHE_DIR, the responses are downloaded whole to be "
+                            "saved in cache -> STREAM = False, JOIN_MEMORY_LIMIT = None")
+            self.stream, self.join_memory_limit = False, None
+        if self.snapshot is not None and self.stream:
+            logging.warning("config: SNAPSHOT is not supported with STREAM, the streamed records are not kept -> "
+                            "SNAPSHOT = None")
+            self.snapshot = None
+        if self.sharded and self.stream:
+            logging.warning("config: STREAM is not supported with URLS_ASSET/URLS_RIGHT -> STREAM = False")
+            self.stream = False
+        if self.quarantine_file is not None and not self.lenient:
+            logging.warning("config: QUARANTINE_FILE needs LENIENT=true -> LENIENT = True")
+            self.lenient = True
+        if self.lenient and (self.delta_state is not None or self.compact or self.lazy):
+            logging.warning("config: LENIENT is supported only by the plain and the streamed parse, not with "
+                            "DELTA_STATE/COMPACT/LAZY -> LENIENT = False")
+            self.lenient, self.quarantine_file = False, None
+        if self.probe_origins is None and (self.probe_filter or self.probe_cache is not None):
+            logging.warning("config: PROBE_FILTER and PROBE_CACHE need PROBE_ORIGINS, the manifests are not probed")
+
+    @property
+    def sharded(self) -> bool:
+        # A FEED SERVED AS PAGES OR SHARDS IS FETCHED AND MERGED BEFORE THE PARSE, THE STREAMING DECODE NEEDS A SINGLE
+        # DOCUMENT
+        return self.urls_asset is not None or self.urls_right is not None
+
+    @classmethod
+    def from_args(cls, argv: List[str]) -> 'Options':
+        """
+        Options from KEY=VALUE arguments, a value that is not valid is logged and replaced by the default
+
+        :param argv: arguments of the command line (without the name of the program)
+        :returns Options: options of the run
+        """
+        args_map: Dict[str, str] = {}
+        for arg in argv:
+            if arg is not None and arg.__contains__("="):
+                key_value = arg.split("=", 1)
+                args_map[key_value[0]] = key_value[1]
+
+        values: Dict[str, Any] = {}
+        for option in fields(cls):
+            value = args_map.get(option.name.upper())
+            if value is None:
+                continue
+            parse = _PARSERS.get(option.name, str)
+            try:
+                values[option.name] = parse(value)
+            except ValueError:
+                logging.warning("config: %s is not valid, your configuration %s is not supported -> default "
+                                "value = %s", option.name.upper(), value, option.default)
+        return cls(**values)
+
+
+_PARSERS = {"number_of_iterations": int, "cache_ttl": float, "cache_max_size": int, "join_memory_limit": int,
+            "max_concurrency": int, "probe_timeout": float, "probe_concurrency": int, "probe_ttl": float,
+            "probe_max_latency": float, "urls_asset": _urls, "urls_right": _urls, "content_id": _urls,
+            "probe_origins": _origins, "stream": _flag, "compact": _flag, "lazy": _flag, "offline": _flag,
+            "trace_memory": _flag, "lenient": _flag, "probe_filter": _flag, "output": str.lower,
+            "print_filter_by_device": _flag, "print_filter_by_device_and_active": _flag}
+
+
+@dataclass
+class PipelineResult:
+    """
+    Results of a run of the pipeline, the responses are None when the feeds are streamed
+    """
+    response_asset: Response | None = None
+    response_right: Response | None = None
+    filtered_by_device: List[ResultRights] = field(default_factory=list)
+    filtered_by_device_and_active: List[ResultRights] = field(default_factory=list)
+    endpoints: List[Endpoint] = field(default_factory=list)
+    number_of_rights: int = 0
+    # RIGHTS PLAYABLE ON ROKU AND ACTIVE WHEN THEY ARE NOT ALL KEPT IN filtered_by_device_and_active (STREAM WITH
+    # join_memory_limit), OTHERWISE None
+    number_of_accepted: int | None = None
+    delta_result: Any = None
+    # RECORDS NOT VALID SKIPPED WITH LENIENT, BY ResultType.value
+    quarantine: Dict[str, List[RecordError]] = field(default_factory=dict)
+    # ProbeResult OF EVERY ENDPOINT, IN THE SAME ORDER, WHEN THE MANIFESTS ARE PROBED
+    probes: List[Any] | None = None
+
+
+def open_client(options: Options, metrics: Metrics = None) -> 'Any':
+    """
+    :returns FeedClient: client of the feeds configured by the options
+    """
+    from src.main import Config
+    from src.main.Client import FeedClient
+    from src.main.HttpCache import ResponseCache
+
+    cache = None if options.cache_dir is None else ResponseCache(options.cache_dir, options.cache_ttl,
+                                                                 options.cache_max_size)
+    return FeedClient(auth=Config.BASIC_AUTH, number_of_iterations=options.number_of_iterations, cache=cache,
+                      offline=options.offline, metrics=metrics)
+
+
+def fetch(options: Options, client: Any) -> 'Tuple[Any, Any]':
+    """
+    Retrieve the two feeds
+
+    :returns Tuple[Any, Any]: (assets, rights) decoded payloads when the feeds are sharded, responses otherwise
+    :raises FetchError: if a feed could not be retrieved
+    """
+    from src.main import Config
+
+    if options.sharded:
+        from src.main.Shard import fetch_payloads, merge_payloads
+
+        # THE SHARDS OF BOTH THE FEEDS SHARE THE SAME WINDOW OF max_concurrency REQUESTS
+        urls = [(False, url) for url in (options.urls_asset or [Config.URL_ASSET])] + \
+               [(True, url) for url in (options.urls_right or [Config.URL_RIGHT])]
+        payloads = fetch_payloads(client, [url for _, url in urls], options.max_concurrency)
+        return (merge_payloads(payload for (right, _), payload in zip(urls, payloads) if not right),
+                merge_payloads(payload for (right, _), payload in zip(urls, payloads) if right))
+    responses = client.fetch_all({"Asset Data": Config.URL_ASSET, "Localization Data": Config.URL_RIGHT},
+                                 stream=options.stream)
+    return responses["Asset Data"], responses["Localization Data"]
+
+
+def parse(options: Options, payload_asset: Any, payload_right: Any) -> 'PipelineResult':
+    """
+    Parse the decoded payloads with the models chosen by the options (delta, compact, lazy or plain) and write the
+    snapshot if it is configured. With delta the payloads can also be the raw bodies of the feeds
+    """
+    result = PipelineResult()
+    if options.delta_state is not None:
+        from src.main.DeltaSync import DeltaSync
+
+        delta_sync = DeltaSync(options.delta_state)
+        result.delta_result = delta_sync.sync(payload_asset, payload_right)
+        result.response_asset = result.delta_result.response_asset
+        result.response_right = result.delta_result.response_right
+        delta_sync.save()
+        logging.info("delta: %d records parsed, %d added, %d changed, %d removed", result.delta_result.parsed,
+                     result.delta_result.changes.added.__len__(), result.delta_result.changes.changed.__len__(),
+                     result.delta_result.changes.removed.__len__())
+    elif options.compact:
+        from src.main.Compact import CompactDecoder, compact_response_from_dict
+
+        decoder = CompactDecoder()
+        result.response_asset = compact_response_from_dict(payload_asset, ResultType.ASSET, decoder)
+        result.response_right = compact_response_from_dict(payload_right, ResultType.RIGHT, decoder)
+    elif options.lazy:
+        from src.main.Lazy import lazy_response_from_dict
+
+        result.response_asset = lazy_response_from_dict(payload_asset, ResultType.ASSET)
+        result.response_right = lazy_response_from_dict(payload_right, ResultType.RIGHT)
+    else:
+        if options.lenient:
+            result.quarantine = {ResultType.ASSET.value: [], ResultType.RIGHT.value: []}
+        result.response_asset = decode_response(payload_asset, ResultType.ASSET,
+                                                result.quarantine.get(ResultType.ASSET.value))
+        result.response_right = decode_response(payload_right, ResultType.RIGHT,
+                                                result.quarantine.get(ResultType.RIGHT.value))
+    if options.snapshot is not None:
+        from src.main.Snapshot import write_snapshot
+
+        # THE PARSED CATALOG IS SAVED ONCE, THE QUERIES OPEN IT WITH mmap WITHOUT PARSING THE FEEDS AGAIN
+        write_snapshot(options.snapshot, result.response_asset, result.response_right)
+        logging.info("snapshot: catalog written to %s", options.snapshot)
+    return result
+
+
+def load_snapshot(options: Options) -> 'PipelineResult':
+    """
+    Read the catalog from the snapshot FROM_SNAPSHOT, with content_id only the records of these content_id are decoded
+    """
+    from src.main.Snapshot import Snapshot
+
+    with Snapshot(options.from_snapshot) as snapshot:
+        if options.content_id is None:
+            return PipelineResult(Response(list(snapshot.assets)), Response(list(snapshot.rights)))
+        return PipelineResult(
+            Response([result for content_id in options.content_id for result in snapshot.get_assets(content_id)]),
+            Response([result for content_id in options.content_id for result in snapshot.get_rights(content_id)]))
+
+
+def _restrict(response: Response, content_ids: List[str]) -> 'Response':
+    content_ids = set(content_ids)
+    return Response([result for result in (response.results or []) if result.content_id in content_ids])
+
+
+def select(options: Options, result: PipelineResult) -> 'PipelineResult':
+    """
+    Filter the parsed catalog: rights that can be played on ROKU, the active ones among them and the HD/level3
+    endpoints of the active content_id
+    """
+    from src.main.CatalogIndex import CatalogIndex
+
+    if options.content_id is not None and options.from_snapshot is None:
+        result.response_asset = _restrict(result.response_asset, options.content_id)
+        result.response_right = _restrict(result.response_right, options.content_id)
+    result.number_of_rights = (result.response_right.results or []).__len__()
+    if result.delta_result is not None:
+        return select_delta(options, result)
+    if options.lazy:
+        return select_lazy(options, result)
+    catalog_index = CatalogIndex(result.response_asset, result.response_right)
+    result.filtered_by_device = catalog_index.filter_result_by_can_be_played_on_ROKU()
+    result.endpoints = catalog_index.filter_result_by_active_data_and_video_format_and_endpoint_origin_level()
+    # THE ACTIVE SET IS COMPUTED ONCE BY THE INDEX AND REUSED FOR THE RIGHTS FILTERED BY DEVICE
+    result.filtered_by_device_and_active = catalog_index.filter_result_by_active(result.filtered_by_device)
+    return result
+
+
+def select_lazy(options: Options, result: PipelineResult) -> 'PipelineResult':
+    """
+    Filter the lazy catalog without indexes, the indexes read the devices and the dates of every record: the ROKU filter
+    scans the raw devices, the dates are decoded only for the rights playable on ROKU and for the content_id with an
+    HD/level3 endpoint, the titles only when they are printed
+    """
+    result_right = result.response_right.results or []
+    result.filtered_by_device = filter_result_by_can_be_played_on_ROKU(result_right)
+    result.filtered_by_device_and_active = filter_result_by_active(result.filtered_by_device)
+    with_endpoint = {asset.content_id for asset in (result.response_asset.results or [])
+                     if any(elem.is_video_format_HD_and_origin_level3() for elem in (asset.assets or []))}
+    active = filter_result_by_active([right for right in result_right if right.content_id in with_endpoint])
+    result.endpoints = filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+        result.response_asset.results, [right.content_id for right in active])
+    return result
+
+
+def select_delta(options: Options, result: PipelineResult) -> 'PipelineResult':
+    """
+    Filter the catalog of a delta sync: the endpoints and the active content_id are the ones kept up to date by the
+    sync, only the ROKU filter reads the rights
+    """
+    from src.main.DeviceIndex import DeviceIndex
+
+    delta_result = result.delta_result
+    if options.content_id is None:
+        result.endpoints = delta_result.endpoints
+    else:
+        content_ids = set(options.content_id)
+        result.endpoints = [endpoint for content_id, endpoints in delta_result.manifests.items()
+                            if content_id in content_ids for endpoint in endpoints]
+    result.filtered_by_device = DeviceIndex(result.response_right.results).playable_on("provider", "ROKU")
+    result.filtered_by_device_and_active = [right for right in result.filtered_by_device
+                                            if right.content_id in delta_result.active]
+    return result
+
+
+def _title_only(right: ResultRights) -> 'ResultRights':
+    # WHAT THE PRINT OF THE TITLES READS: content_id AND THE FIRST TITLE, WITHOUT TERMS, DEVICES AND ACTORS
+    if not right.localizable_information:
+        return ResultRights(right.content_id, None, None, None)
+    information = right.localizable_information[0]
+    return ResultRights(right.content_id, None, [LocalizableInformation(information.locale, information.language,
+                                                                        information.title_name_medium)], None)
+
+
+def select_stream(options: Options, result_asset: Any, result_right: Any, metrics: Metrics = None) -> 'PipelineResult':
+    """
+    Parse and filter the streamed responses: rights are filtered while they are downloaded, only the ones playable on
+    ROKU and the active content_id are kept. With join_memory_limit the join is spilled to disk, not even the active
+    content_id are kept in memory, and the rights playable on ROKU are kept, as content_id and title, only for the
+    PRINT options that read them
+    """
+    from src.main.Stream import iter_results_from_response
+
+    content_ids = None if options.content_id is None else set(options.content_id)
+    result = PipelineResult()
+    if options.lenient:
+        result.quarantine = {ResultType.ASSET.value: [], ResultType.RIGHT.value: []}
+    list_of_active_content_id: List[str] = []
+    if options.join_memory_limit is None:
+        join_context = nullcontext()
+    else:
+        from src.main.ExternalJoin import ExternalEndpointJoin
+
+        join_context = ExternalEndpointJoin(memory_limit=options.join_memory_limit)
+        result.number_of_accepted = 0
+    # THE SPILL DIRECTORY IS REMOVED ALSO WHEN A RECORD OF THE FEEDS IS NOT VALID
+    with join_context as external_join:
+        for right in iter_results_from_response(result_right, ResultType.RIGHT, metrics=metrics,
+                                                quarantine=result.quarantine.get(ResultType.RIGHT.value)):
+            if content_ids is not None and right.content_id not in content_ids:
+                continue
+            result.number_of_rights += 1
+            if external_join is None:
+                if right.rights.terms[0].can_be_played_on_ROKU():
+                    result.filtered_by_device.append(right)
+                if right.rights.terms[0].is_active():
+                    list_of_active_content_id.append(right.content_id)
+                continue
+            external_join.add_rights(right)
+            if right.rights.terms[0].can_be_played_on_ROKU():
+                active = right.rights.terms[0].is_active()
+                result.number_of_accepted += active
+                if options.print_filter_by_device:
+                    result.filtered_by_device.append(_title_only(right))
+                if active and options.print_filter_by_device_and_active:
+                    result.filtered_by_device_and_active.append(_title_only(right))
+        assets = iter_results_from_response(result_asset, ResultType.ASSET, metrics=metrics,
+                                            quarantine=result.quarantine.get(ResultType.ASSET.value))
+        if external_join is not None:
+            for asset in assets:
+                external_join.add_assets(asset)
+            result.endpoints = list(external_join.endpoints())
+            return result
+    result.endpoints = filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+        assets, list_of_active_content_id)
+    result.filtered_by_device_and_active = filter_result_by_active(result.filtered_by_device)
+    return result
+
+
+def probe(options: Options, result: PipelineResult, metrics: Metrics = None) -> 'PipelineResult':
+    """
+    Check that the manifests of the selected endpoints can be reached on their origin, with probe_filter only the
+    reachable ones (within probe_max_latency) are kept
+    """
+    from src.main.Probe import EndpointProber, ProbeCache, filter_healthy
+
+    cache = None if options.probe_cache is None else ProbeCache(options.probe_cache, options.probe_ttl)
+    with EndpointProber(options.probe_origins, options.probe_timeout, options.probe_concurrency, cache=cache,
+                        metrics=metrics) as prober:
+        result.probes = prober.probe(result.endpoints)
+    unhealthy = sum(not probe_result.healthy(options.probe_max_latency) for probe_result in result.probes)
+    logging.info("probe: %d manifests checked, %d unreachable or slow", result.probes.__len__(), unhealthy)
+    if options.probe_filter:
+        result.endpoints, result.probes = filter_healthy(result.endpoints, result.probes, options.probe_max_latency)
+    return result
+
+
+def run(options: Options, metrics: Metrics = None) -> 'PipelineResult':
+    """
+    Run fetch -> parse -> filter in process, the results are returned and not written (see emit):
+
+        result = run(Options(compact=True))
+
+    :param options: options of the run
+    :param metrics: spans and counters of the run (optional)
+    :returns PipelineResult: parsed catalog and filtered results
+    :raises FetchError: if a feed could not be retrieved
+    """
+    metrics = Metrics() if metrics is None else metrics
+    if options.from_snapshot is not None:
+        with metrics.span("parse"):
+            result = load_snapshot(options)
+        metrics.increment("records_parsed", result.response_asset.results.__len__() +
+                          result.response_right.results.__len__())
+        with metrics.span("filter"):
+            select(options, result)
+    else:
+        client = open_client(options, metrics)
+        try:
+            with metrics.span("fetch"):
+                result_asset, result_right = fetch(options, client)
+            if options.stream:
+                # DOWNLOAD, DECODE, PARSE AND FILTER ARE INTERLEAVED, THEY ARE MEASURED AS A SINGLE "parse" SPAN
+                with metrics.span("parse"):
+                    result = select_stream(options, result_asset, result_right, metrics)
+                metrics.increment("records_parsed", result.number_of_rights)
+            else:
+                with metrics.span("decode"):
+                    # THE SHARDS ARE ALREADY DECODED AND MERGED, THE DELTA SYNC HASHES THE RECORDS AS THEY ARE IN THE
+                    # BODY AND DECODES IT ITSELF
+                    if options.sharded:
+                        payload_asset, payload_right = result_asset, result_right
+                    elif options.delta_state is not None:
+                        payload_asset, payload_right = result_asset.content, result_right.content
+                    else:
+                        payload_asset, payload_right = result_asset.json(), result_right.json()
+                with metrics.span("parse"):
+                    result = parse(options, payload_asset, payload_right)
+                metrics.increment("records_parsed", (result.response_asset.results or []).__len__() +
+                                  (result.response_right.results or []).__len__())
+                with metrics.span("filter"):
+                    select(options, result)
+        finally:
+            client.close()
+    if options.probe_origins is not None:
+        with metrics.span("probe"):
+            probe(options, result, metrics)
+    # RIGHTS NOT PLAYABLE ON ROKU OR NOT ACTIVE
+    accepted = result.filtered_by_device_and_active.__len__() if result.number_of_accepted is None \
+        else result.number_of_accepted
+    metrics.increment("records_rejected", result.number_of_rights - accepted)
+    for feed, errors in result.quarantine.items():
+        if errors:
+            metrics.increment("records_quarantined", errors.__len__())
+            logging.warning("quarantine: %d records of %s skipped, the first one: %s", errors.__len__(), feed,
+                            errors[0])
+    if options.quarantine_file is not None:
+        write_quarantine(options.quarantine_file, result.quarantine)
+    return result
+
+
+def write_quarantine(path: str, quarantine: Dict[str, List[RecordError]]):
+    """
+    Write the records skipped by a lenient parse as JSON lines {"feed", "index", "reason", "record"}, the file is
+    replaced atomically
+    """
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        for feed, errors in quarantine.items():
+            for error in errors:
+                file.write(json.dumps({"feed": feed, "index": error.index, "reason": error.reason,
+                                       "record": error.record}, default=str) + "\n")
+    os.replace(path + ".tmp", path)
+
+
+def emit(options: Options, result: PipelineResult, sink: OutputSink = None, metrics: Metrics = None):
+    """
+    Write the results of a run to the sink, or log them when the sink is None (OUTPUT=log)
+    """
+    metrics = Metrics() if metrics is None else metrics
+
+    def output_endpoints(endpoints: List[Endpoint], header: str, probes: List[Any] = None):
+        if sink is not None:
+            write_endpoints(sink, endpoints, header, probes)
+        elif probes is not None:
+            from src.main.Probe import print_probed_endpoints
+
+            print_probed_endpoints(endpoints, probes, header)
+        else:
+            print_endpoints(endpoints, header)
+
+    def output_title_name_medium(result_right: List[ResultRights], header: str):
+        if sink is None:
+            print_title_name_medium(result_right, header)
+        else:
+            write_title_name_medium(sink, result_right, header)
+
+    with metrics.span("output"):
+        if result.delta_result is not None:
+            output_endpoints(result.delta_result.changes.newly_active, "Manifests of endpoints that became active:")
+            output_endpoints(result.delta_result.changes.went_inactive, "Manifests of endpoints that became inactive:")
+        if options.print_filter_by_device:
+            output_title_name_medium(result.filtered_by_device, "TV shows/movies title that can be played on ROKU:")
+        if options.print_filter_by_device_and_active:
+            output_title_name_medium(result.filtered_by_device_and_active,
+                                     "Active rights of TV shows/movies title that can be played on ROKU:")
+        output_endpoints(result.endpoints, "Manifests of active endpoints:", result.probes)
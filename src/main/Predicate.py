@@ -0,0 +1,387 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, Tuple
+
+from src.main.DeviceIndex import DEVICE_ATTRIBUTES
+from src.main.Result import ResultAsset, ResultRights, Endpoint, Term, Asset
+from src.main.Timestamp import to_utc
+
+RIGHTS = "rights"
+ASSETS = "assets"
+# RECORDS USED TO ESTIMATE THE SELECTIVITY OF EVERY CONDITION
+SAMPLE_SIZE = 512
+
+# A COMPILED CONDITION TAKES THE RECORD AND ITS PART: THE TERM FOR THE RIGHTS, THE ASSET FOR THE ASSETS
+Test = Callable[[Any, Any], bool]
+
+
+class Predicate(ABC):
+    """
+    Condition over the records of a feed, conditions are combined with & (and), | (or) and ~ (not):
+
+        device("provider", "ROKU") & active() & video_format("HD") & origin("level3")
+
+    device, territory, active and channel are conditions over the rights (on the term of a ResultRights), video_format
+    and origin over the assets (on every Asset of a ResultAsset). A predicate is compiled into a single function, the
+    conditions of an "and" are ordered so that the cheapest and most selective ones run first
+    """
+    target: str
+    # RELATIVE COST OF A TEST, USED WITH THE SELECTIVITY TO ORDER THE CONDITIONS
+    cost: float = 1.0
+
+    @property
+    @abstractmethod
+    def key(self) -> 'Tuple':
+        pass
+
+    @property
+    def targets(self) -> 'FrozenSet[str]':
+        return frozenset([self.target])
+
+    @abstractmethod
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        pass
+
+    def __and__(self, other: 'Predicate') -> 'Predicate':
+        return And([self, other])
+
+    def __or__(self, other: 'Predicate') -> 'Predicate':
+        return Or([self, other])
+
+    def __invert__(self) -> 'Predicate':
+        return Not(self)
+
+    def __eq__(self, other):
+        return isinstance(other, Predicate) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return "%s%r" % (self.key[0], self.key[1:])
+
+
+class _Values(Predicate):
+    # CONDITION "THE VALUE IS ONE OF values"
+    name: str
+
+    def __init__(self, *values: str):
+        if values.__len__() == 0:
+            raise ValueError("%s needs at least one value" % self.name)
+        self.values = frozenset(values)
+
+    @property
+    def key(self) -> 'Tuple':
+        return (self.name,) + tuple(sorted(self.values))
+
+
+class DevicePredicate(_Values):
+    target = RIGHTS
+    name = "device"
+    cost = 3.0
+
+    def __init__(self, device_attribute: str, *values: str):
+        if device_attribute not in DEVICE_ATTRIBUTES:
+            raise AttributeError("Device has no attribute '%s'" % device_attribute)
+        super().__init__(*values)
+        self.device_attribute = device_attribute
+
+    @property
+    def key(self) -> 'Tuple':
+        return (self.name, self.device_attribute) + tuple(sorted(self.values))
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        attribute, values = self.device_attribute, self.values
+
+        def test(result: ResultRights, term: Term) -> bool:
+            if term is None or not term.devices:
+                return False
+            for device in term.devices:
+                if getattr(device, attribute) in values:
+                    return True
+            return False
+
+        return test
+
+
+class TerritoryPredicate(_Values):
+    target = RIGHTS
+    name = "territory"
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        values = self.values
+        return lambda result, term: term is not None and term.territory in values
+
+
+class ChannelPredicate(_Values):
+    target = RIGHTS
+    name = "channel"
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        values = self.values
+        return lambda result, term: result.rights is not None and result.rights.channel in values
+
+
+class VideoFormatPredicate(_Values):
+    target = ASSETS
+    name = "video_format"
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        values = self.values
+        return lambda result, asset: asset is not None and asset.video_format in values
+
+
+class OriginPredicate(_Values):
+    target = ASSETS
+    name = "origin"
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        values = self.values
+        return lambda result, asset: asset is not None and bool(asset.endpoints) and asset.endpoints[0].origin in values
+
+
+class ActivePredicate(Predicate):
+    target = RIGHTS
+    cost = 2.0
+
+    def __init__(self, at: datetime = None):
+        """
+        :param at: reference time (optional, default the time at which the query runs)
+        """
+        self.at = None if at is None else to_utc(at)
+
+    @property
+    def key(self) -> 'Tuple':
+        return "active", self.at
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        # THE REFERENCE TIME IS TAKEN ONCE FOR THE WHOLE PASS, NOT ONCE FOR EVERY RECORD
+        at = at if self.at is None else self.at
+        return lambda result, term: term is not None and term.is_active(at)
+
+
+def _selectivity(test: Test, sample: List[Tuple[Any, Any]]) -> float:
+    if sample.__len__() == 0:
+        return 0.5
+    return sum(1 for record, part in sample if test(record, part)) / sample.__len__()
+
+
+class _Composite(Predicate):
+    name: str
+
+    def __init__(self, children: Iterable[Predicate]):
+        # NESTED CONDITIONS OF THE SAME KIND ARE FLATTENED AND THE DUPLICATES REMOVED, A SHARED CONDITION RUNS ONCE
+        flat: List[Predicate] = []
+        for child in children:
+            for grandchild in (child.children if child.__class__ is self.__class__ else [child]):
+                if grandchild not in flat:
+                    flat.append(grandchild)
+        self.children = flat
+
+    @property
+    def key(self) -> 'Tuple':
+        return (self.name,) + tuple(sorted((child.key for child in self.children), key=repr))
+
+    @property
+    def targets(self) -> 'FrozenSet[str]':
+        return frozenset().union(*(child.targets for child in self.children))
+
+    @property
+    def target(self) -> str:
+        targets = self.targets
+        if targets.__len__() > 1:
+            raise ValueError("%r mixes conditions over the rights and over the assets" % self)
+        return next(iter(targets))
+
+    @property
+    def cost(self) -> float:
+        return sum(child.cost for child in self.children)
+
+    def _ordered(self, at: datetime, sample: List[Tuple[Any, Any]], rank) -> 'List[Test]':
+        compiled = []
+        for child in self.children:
+            test = child.compile(at, sample)
+            compiled.append((rank(child.cost, _selectivity(test, sample)), test))
+        compiled.sort(key=lambda item: item[0])
+        return [test for _, test in compiled]
+
+
+class And(_Composite):
+    name = "and"
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        # THE CONDITION MOST LIKELY TO REJECT A RECORD FOR ITS COST RUNS FIRST: RANK = cost / (1 - selectivity)
+        tests = self._ordered(at, sample, lambda cost, selectivity: cost / max(1e-9, 1 - selectivity))
+        if tests.__len__() == 2:
+            first, second = tests
+            return lambda record, part: first(record, part) and second(record, part)
+
+        def test(record: Any, part: Any) -> bool:
+            for child in tests:
+                if not child(record, part):
+                    return False
+            return True
+
+        return test
+
+
+class Or(_Composite):
+    name = "or"
+
+    def __init__(self, children: Iterable[Predicate]):
+        super().__init__(children)
+        if self.targets.__len__() > 1:
+            raise ValueError("%r mixes conditions over the rights and over the assets" % self)
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        # THE CONDITION MOST LIKELY TO ACCEPT A RECORD FOR ITS COST RUNS FIRST: RANK = cost / selectivity
+        tests = self._ordered(at, sample, lambda cost, selectivity: cost / max(1e-9, selectivity))
+
+        def test(record: Any, part: Any) -> bool:
+            for child in tests:
+                if child(record, part):
+                    return True
+            return False
+
+        return test
+
+
+class Not(Predicate):
+
+    def __init__(self, child: Predicate):
+        self.child = child
+        self.target = child.target
+        self.cost = child.cost
+
+    @property
+    def key(self) -> 'Tuple':
+        return "not", self.child.key
+
+    def compile(self, at: datetime, sample: List[Tuple[Any, Any]]) -> 'Test':
+        test = self.child.compile(at, sample)
+        return lambda record, part: not test(record, part)
+
+
+def device(device_attribute: str, *values: str) -> 'Predicate':
+    return DevicePredicate(device_attribute, *values)
+
+
+def territory(*values: str) -> 'Predicate':
+    return TerritoryPredicate(*values)
+
+
+def channel(*values: str) -> 'Predicate':
+    return ChannelPredicate(*values)
+
+
+def active(at: datetime = None) -> 'Predicate':
+    return ActivePredicate(at)
+
+
+def video_format(*values: str) -> 'Predicate':
+    return VideoFormatPredicate(*values)
+
+
+def origin(*values: str) -> 'Predicate':
+    return OriginPredicate(*values)
+
+
+def split(predicate: Predicate | None) -> 'Tuple[Predicate | None, Predicate | None]':
+    """
+    Split a predicate in the part over the rights and the part over the assets, only an "and" can mix the two
+
+    :returns Tuple[Predicate | None, Predicate | None]: (rights predicate, assets predicate), None if there is no
+        condition over that feed
+    :raises ValueError: if an "or" or a "not" mixes conditions over the rights and over the assets
+    """
+    if predicate is None:
+        return None, None
+    if isinstance(predicate, And) and predicate.targets.__len__() > 1:
+        parts = {RIGHTS: [], ASSETS: []}
+        for child in predicate.children:
+            parts[child.target].append(child)
+        return tuple(None if not children else children[0] if children.__len__() == 1 else And(children)
+                     for children in (parts[RIGHTS], parts[ASSETS]))
+    return (predicate, None) if predicate.target == RIGHTS else (None, predicate)
+
+
+def _rights_parts(result_rights: Iterable[ResultRights]) -> Iterator[Tuple[ResultRights, Term | None]]:
+    for result in result_rights:
+        terms = None if result.rights is None else result.rights.terms
+        if not terms:
+            yield result, None
+        else:
+            for term in terms:
+                yield result, term
+
+
+def _sample(records: List[Any], parts) -> 'List[Tuple[Any, Any]]':
+    step = max(1, records.__len__() // SAMPLE_SIZE)
+    return list(parts(records[::step][:SAMPLE_SIZE]))
+
+
+def select_rights(result_rights: List[ResultRights], predicate: Predicate | None,
+                  at: datetime = None) -> 'List[ResultRights]':
+    """
+    Return the ResultRights with at least one term that satisfies the predicate, in a single pass
+
+    :param result_rights: list of ResultRights
+    :param predicate: predicate over the rights, None keeps every record
+    :param at: time used by the active conditions without a time (optional, default now)
+    :returns List[ResultRights]: list of ResultRights in the order of the feed
+    """
+    result_rights = result_rights or []
+    if predicate is None:
+        return list(result_rights)
+    if predicate.target != RIGHTS:
+        raise ValueError("%r is not a condition over the rights" % predicate)
+    at = datetime.now(timezone.utc) if at is None else to_utc(at)
+    test = predicate.compile(at, _sample(result_rights, _rights_parts))
+    selected = []
+    for result in result_rights:
+        terms = None if result.rights is None else result.rights.terms
+        if not terms:
+            if test(result, None):
+                selected.append(result)
+            continue
+        for term in terms:
+            if test(result, term):
+                selected.append(result)
+                break
+    return selected
+
+
+def _assets_parts(result_asset: Iterable[ResultAsset]) -> Iterator[Tuple[ResultAsset, Asset]]:
+    for result in result_asset:
+        for asset in (result.assets or []):
+            yield result, asset
+
+
+def select_endpoints(result_asset: List[ResultAsset], result_rights: List[ResultRights] | None,
+                     predicate: Predicate | None, at: datetime = None) -> 'List[Endpoint]':
+    """
+    Return the endpoints of the assets that satisfy the assets part of the predicate, of the content_id with rights
+    that satisfy the rights part. One pass over the rights and one over the assets, e.g. the manifests of main.py are:
+
+        select_endpoints(assets, rights, active() & video_format("HD") & origin("level3"))
+
+    :param result_asset: list of ResultAsset
+    :param result_rights: list of ResultRights, not used if the predicate has no condition over the rights
+    :param predicate: predicate over the rights and the assets, None keeps every endpoint
+    :param at: time used by the active conditions without a time (optional, default now)
+    :returns List[Endpoint]: list of Endpoint in the order of the feed
+    """
+    result_asset = result_asset or []
+    at = datetime.now(timezone.utc) if at is None else to_utc(at)
+    rights_predicate, assets_predicate = split(predicate)
+    content_ids = None if rights_predicate is None else \
+        {result.content_id for result in select_rights(result_rights, rights_predicate, at)}
+    test = None if assets_predicate is None else assets_predicate.compile(at, _sample(result_asset, _assets_parts))
+    endpoints = []
+    for result in result_asset:
+        if content_ids is not None and result.content_id not in content_ids:
+            continue
+        for asset in (result.assets or []):
+            if asset.endpoints and (test is None or test(result, asset)):
+                endpoints.append(asset.endpoints[0])
+    return endpoints
@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.main.Metrics import Metrics
+from src.main.Result import Endpoint
+
+# STATUS CODES OF A SERVER THAT DOES NOT ANSWER TO HEAD, THE MANIFEST IS REQUESTED WITH A GET WITHOUT READING THE BODY
+HEAD_NOT_SUPPORTED = (405, 501)
+
+
+@dataclass
+class ProbeResult:
+    """
+    Outcome of the probe of the manifest of an endpoint, latency is the time to the status line in seconds
+    """
+    url: str | None
+    reachable: bool
+    status: int | None = None
+    latency: float | None = None
+    checked_at: float = 0.0
+    error: str | None = None
+    cached: bool = False
+
+    def healthy(self, max_latency: float = None) -> 'bool':
+        """
+        :param max_latency: seconds over which a reachable manifest is considered too slow (optional)
+        :returns bool: True if the manifest is reachable (within max_latency)
+        """
+        return self.reachable and (max_latency is None or self.latency is None or self.latency <= max_latency)
+
+    def to_record(self) -> 'Dict[str, Any]':
+        return {"reachable": self.reachable, "status": self.status,
+                "latency_ms": None if self.latency is None else round(self.latency * 1000, 1)}
+
+
+class ProbeCache:
+    """
+    Results of the probes saved in a JSON file. Only the reachable manifests are served from the cache while they are
+    younger than ttl, the unreachable ones are probed again at every run
+    """
+
+    def __init__(self, path: str, ttl: float = 300):
+        """
+        :param path: file of the cache, read if it exists
+        :param ttl: seconds in which a reachable manifest is not probed again
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError) as e:
+                logging.warning("probe: cache %s is not valid, it is ignored -> %s", path, e)
+
+    def get(self, url: str) -> 'ProbeResult | None':
+        entry = self._entries.get(url)
+        if entry is None or not entry["reachable"] or time.time() - entry["checked_at"] > self.ttl:
+            return None
+        return ProbeResult(url, True, entry["status"], entry["latency"], entry["checked_at"], cached=True)
+
+    def put(self, result: ProbeResult):
+        with self._lock:
+            self._entries[result.url] = {"reachable": result.reachable, "status": result.status,
+                                         "latency": result.latency, "checked_at": result.checked_at}
+
+    def save(self):
+        # WRITE AND RENAME, SO THAT A RUN NEVER READS A HALF WRITTEN FILE
+        with self._lock:
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(self._entries, file)
+            os.replace(self.path + ".tmp", self.path)
+
+
+class EndpointProber:
+    """
+    Check concurrently that the manifests of the endpoints can be reached on their origin. The requests share a pooled
+    keep-alive session, at most max_per_origin of them are in flight on the same origin and every one has its timeout
+
+        prober = EndpointProber({"level3": "https://level3.example.com"})
+        results = prober.probe(endpoints)
+    """
+
+    def __init__(self, origins: Dict[str, str], timeout: float = 2.0, max_per_origin: int = 4,
+                 session: requests.Session = None, cache: ProbeCache = None, metrics: Metrics = None):
+        """
+        :param origins: map of origin -> base url, the path of an endpoint is appended to the base url of its origin
+        :param timeout: deadline of every probe in seconds
+        :param max_per_origin: max number of probes at the same time on the same origin
+        :param session: session to use instead of creating a new one (optional)
+        :param cache: results of the previous runs (optional)
+        :param metrics: where the probes and the unreachable manifests are counted (optional)
+        """
+        self.origins = {origin: base_url.rstrip("/") for origin, base_url in origins.items()}
+        self.timeout = timeout
+        self.max_per_origin = max(1, max_per_origin)
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.session = session if session is not None else requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=max(1, self.origins.__len__()), pool_maxsize=self.max_per_origin)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self._limits = {origin: threading.BoundedSemaphore(self.max_per_origin) for origin in self.origins}
+
+    def __enter__(self) -> 'EndpointProber':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def url(self, endpoint: Endpoint) -> 'str | None':
+        """
+        :returns str | None: url of the manifest, None if the origin has no base url or the endpoint has no path
+        """
+        base_url = self.origins.get(endpoint.origin)
+        if base_url is None or not endpoint.path:
+            return None
+        return base_url + (endpoint.path if endpoint.path.startswith("/") else "/" + endpoint.path)
+
+    def probe_url(self, url: str, origin: str) -> 'ProbeResult':
+        """
+        Probe a manifest with a HEAD request (a GET without the body if HEAD is not supported), waiting for a free slot
+        of its origin
+        """
+        with self._limits[origin]:
+            start = time.perf_counter()
+            try:
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code in HEAD_NOT_SUPPORTED:
+                    start = time.perf_counter()
+                    response = self.session.get(url, timeout=self.timeout, stream=True)
+                response.close()
+                latency = time.perf_counter() - start
+                result = ProbeResult(url, response.status_code < 400, response.status_code, latency, time.time(),
+                                     None if response.status_code < 400 else "status code %d" % response.status_code)
+            except requests.RequestException as e:
+                result = ProbeResult(url, False, None, None, time.time(), str(e))
+        self.metrics.increment("endpoints_probed")
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
+
+    def probe(self, endpoints: List[Endpoint]) -> 'List[ProbeResult]':
+        """
+        Probe the manifests of the endpoints, every url is probed once even if more endpoints share it
+
+        :param endpoints: list of Endpoint
+        :returns List[ProbeResult]: result of every endpoint, in the same order
+        """
+        results: Dict[str, ProbeResult] = {}
+        pending: Dict[str, str] = {}
+        for endpoint in endpoints:
+            url = self.url(endpoint)
+            if url is None or url in results or url in pending:
+                continue
+            cached = None if self.cache is None else self.cache.get(url)
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending[url] = endpoint.origin
+        if pending:
+            # ENOUGH THREADS TO FILL THE SLOTS OF EVERY ORIGIN, THE SEMAPHORES KEEP THE LIMIT OF EACH ONE
+            origins = set(pending.values())
+            with ThreadPoolExecutor(max_workers=min(pending.__len__(), origins.__len__() * self.max_per_origin)) \
+                    as executor:
+                futures = {url: executor.submit(self.probe_url, url, origin) for url, origin in pending.items()}
+                results.update({url: future.result() for url, future in futures.items()})
+        if self.cache is not None:
+            self.cache.save()
+
+        def result_of(endpoint: Endpoint) -> ProbeResult:
+            url = self.url(endpoint)
+            if url is None:
+                return ProbeResult(None, False, error="no base url for origin %s" % endpoint.origin)
+            return results[url]
+
+        probes = [result_of(endpoint) for endpoint in endpoints]
+        self.metrics.increment("endpoints_unreachable", sum(not result.reachable for result in probes))
+        return probes
+
+
+def filter_healthy(endpoints: List[Endpoint], probes: List[ProbeResult],
+                   max_latency: float = None) -> 'Tuple[List[Endpoint], List[ProbeResult]]':
+    """
+    Keep only the endpoints whose manifest is reachable within max_latency
+
+    :returns Tuple[List[Endpoint], List[ProbeResult]]: (endpoints, their probes)
+    """
+    kept = [(endpoint, probe) for endpoint, probe in zip(endpoints, probes) if probe.healthy(max_latency)]
+    return [endpoint for endpoint, _ in kept], [probe for _, probe in kept]
+
+
+def print_probed_endpoints(endpoints: List[Endpoint], probes: List[ProbeResult], header: str = None):
+    """
+    Same of print_endpoints, every path is followed by the status and the latency of its manifest
+    """
+    if header is not None:
+        logging.info(header)
+    if not endpoints:
+        logging.info("No Data")
+    for endpoint, probe in zip(endpoints, probes):
+        if probe.reachable:
+            logging.info("%s -> %d in %.1f ms%s", endpoint.path, probe.status, probe.latency * 1000,
+                         " (cached)" if probe.cached else "")
+        else:
+            logging.warning("%s -> unreachable: %s", endpoint.path, probe.error)
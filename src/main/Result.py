@@ -1,8 +1,10 @@
 import logging
-from _pydatetime import datetime
+from datetime import datetime, timezone
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Any
+from typing import List, Any, Set
+
+from src.main.Timestamp import parse_timestamp, to_utc
 
 
 class ResultType(Enum):
@@ -83,26 +85,27 @@ class Term:
             raise ValueError(
                 "From Assertions startDateTime and endDateTime has both required:\nData startDateTime:[%s] - endDateTime:[%s]",
                 term.get("startDateTime"), term.get("endDateTime"))
-        _start_date_time = datetime.fromisoformat(term.get("startDateTime"))
-        _end_date_time = datetime.fromisoformat(term.get("endDateTime"))
+        _start_date_time = parse_timestamp(term.get("startDateTime"))
+        _end_date_time = parse_timestamp(term.get("endDateTime"))
 
         _territory = None if term.get("territory") is None else str(term.get("territory"))
         _devices = None if term.get("devices") is None else [Device.from_dict(elem) for elem in term.get("devices")]
         return Term(_start_date_time, _end_date_time, _territory, _devices)
 
-    def is_active(self) -> 'bool':
-        return self.start_date_time.replace(tzinfo=None) <= datetime.now() <= self.end_date_time.replace(tzinfo=None)
+    def is_active(self, at: datetime = None) -> 'bool':
+        # THE DATES OF THE FEED ARE ALREADY UTC (SEE parse_timestamp), NAIVE ONES BUILT IN CODE ARE CONSIDERED UTC
+        at = datetime.now(timezone.utc) if at is None else to_utc(at)
+        return to_utc(self.start_date_time) <= at <= to_utc(self.end_date_time)
 
     def can_be_played_on_device(self, device_attribute: str, expected_value: str) -> 'bool':
         if self.devices is None or self.devices.__len__() == 0:
             return False
 
-        can_be_played: bool = False
         for device in self.devices:
-            if device.__getattribute__(device_attribute) is not None and device.__getattribute__(
-                    device_attribute) == expected_value:
-                can_be_played = True
-        return can_be_played
+            value = device.__getattribute__(device_attribute)
+            if value is not None and value == expected_value:
+                return True
+        return False
 
     def can_be_played_on_ROKU(self) -> bool:
         return self.can_be_played_on_device("provider", "ROKU")
@@ -113,6 +116,10 @@ class LocalizableInformation:
     locale: str | None
     language: str | None
     title_name_medium: str | None
+    episode_name: str | None = None
+    episode_number: str | None = None
+    season_number: str | None = None
+    actors: List[str] | None = None
 
     @staticmethod
     def from_dict(localizable_information: Any) -> 'LocalizableInformation':
@@ -121,7 +128,19 @@ class LocalizableInformation:
             else str(localizable_information.get("language"))
         _title_name_medium = None if localizable_information.get("titleNameMedium") is None \
             else str(localizable_information.get("titleNameMedium"))
-        return LocalizableInformation(_locale, _language, _title_name_medium)
+        _episode_name = None if localizable_information.get("episodeName") is None \
+            else str(localizable_information.get("episodeName"))
+        _episode_number = None if localizable_information.get("episodeNumber") is None \
+            else str(localizable_information.get("episodeNumber"))
+        _season_number = None if localizable_information.get("seasonNumber") is None \
+            else str(localizable_information.get("seasonNumber"))
+        _credits = localizable_information.get("credits")
+        # credits.actor IS A LIST OF {"fullName": ...}
+        _actors = None if _credits is None or _credits.get("actor") is None \
+            else [str(actor.get("fullName")) for actor in _credits.get("actor")
+                  if actor.get("fullName") is not None]
+        return LocalizableInformation(_locale, _language, _title_name_medium, _episode_name, _episode_number,
+                                      _season_number, _actors)
 
 
 @dataclass
@@ -240,8 +259,9 @@ def filter_result_by_active_data_and_video_format_and_endpoint_origin_level(resu
     :param contend_ids: list of str representing content_id
     :returns List[Endpoint]: list of Endpoint
     """
-    active_data: List[ResultAsset] = [result for result in (result_asset or []) if
-                                      contend_ids.__contains__(result.content_id)]
+    # A SET MAKES EVERY LOOKUP O(1) INSTEAD OF A SCAN OF THE WHOLE LIST
+    content_ids: Set[str] = contend_ids if isinstance(contend_ids, (set, frozenset)) else set(contend_ids or [])
+    active_data: List[ResultAsset] = [result for result in (result_asset or []) if result.content_id in content_ids]
     endpoints = []
     for result in active_data:
         for asset in (result.assets or []):
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any
+
+from src.main.DeviceIndex import DEVICE_ATTRIBUTES
+from src.main.Result import Response, ResultRights
+from src.main.Timestamp import to_utc
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is needed only by RightsTable
+    np = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _to_milliseconds(date: datetime) -> int:
+    return (to_utc(date) - _EPOCH) // _MILLISECOND
+
+
+class _Categorical:
+    """
+    Dictionary encoding of a column of strings: every distinct value has an int code, None has code -1
+    """
+
+    def __init__(self, values: List[str | None]):
+        self.categories: List[str] = []
+        codes: Dict[str, int] = {}
+        encoded = []
+        for value in values:
+            if value is None:
+                encoded.append(-1)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = self.categories.__len__()
+                self.categories.append(value)
+            encoded.append(code)
+        self._codes_by_value = codes
+        self.codes = np.array(encoded, dtype=np.int32)
+
+    def mask(self, values: tuple) -> 'Any':
+        wanted = [self._codes_by_value[value] for value in values if value in self._codes_by_value]
+        if wanted.__len__() == 0:
+            return np.zeros(self.codes.__len__(), dtype=bool)
+        return np.isin(self.codes, wanted)
+
+
+class RightsTable:
+    """
+    Columnar copy of a Response of ResultRights, one row for every Term, used for vectorized filtering: the filters
+    return numpy boolean masks that can be combined with & | ~, and only the rows of the final mask are converted back
+    to the original ResultRights. Requires numpy
+
+    Columns:
+        positions: position of the ResultRights of the row in results
+        start_date_time/end_date_time: datetime64[ms] in UTC
+        territory/channel: categorical codes
+        devices: for every device attribute a boolean matrix rows x distinct values of the attribute
+        title_offsets: the titles of the row i are titles[title_offsets[i]:title_offsets[i + 1]]
+    """
+
+    def __init__(self, response_right: Response | List[ResultRights] | None):
+        if np is None:
+            raise ImportError("RightsTable requires numpy, install it with: pip install numpy")
+        results = response_right.results if isinstance(response_right, Response) else response_right
+        self.results: List[ResultRights] = results or []
+
+        positions, starts, ends, territories, channels = [], [], [], [], []
+        devices: Dict[str, List[List[str]]] = {attribute: [] for attribute in DEVICE_ATTRIBUTES}
+        self.titles: List[str | None] = []
+        title_offsets = [0]
+        for position, result in enumerate(self.results):
+            if result.rights is None:
+                continue
+            for term in (result.rights.terms or []):
+                positions.append(position)
+                starts.append(_to_milliseconds(term.start_date_time))
+                ends.append(_to_milliseconds(term.end_date_time))
+                territories.append(term.territory)
+                channels.append(result.rights.channel)
+                for attribute in DEVICE_ATTRIBUTES:
+                    devices[attribute].append([getattr(device, attribute) for device in (term.devices or [])])
+                self.titles.extend(information.title_name_medium for information in
+                                   (result.localizable_information or []))
+                title_offsets.append(self.titles.__len__())
+
+        self.positions = np.array(positions, dtype=np.int64)
+        self.start_date_time = np.array(starts, dtype=np.int64).astype("datetime64[ms]")
+        self.end_date_time = np.array(ends, dtype=np.int64).astype("datetime64[ms]")
+        self.territory = _Categorical(territories)
+        self.channel = _Categorical(channels)
+        self.title_offsets = np.array(title_offsets, dtype=np.int64)
+
+        self.device_values: Dict[str, List[str]] = {}
+        self.devices: Dict[str, Any] = {}
+        for attribute, rows in devices.items():
+            values: Dict[str, int] = {}
+            coordinates_row, coordinates_column = [], []
+            for row, row_values in enumerate(rows):
+                for value in row_values:
+                    if value is None:
+                        continue
+                    coordinates_row.append(row)
+                    coordinates_column.append(values.setdefault(value, values.__len__()))
+            matrix = np.zeros((rows.__len__(), values.__len__()), dtype=bool)
+            matrix[coordinates_row, coordinates_column] = True
+            self.device_values[attribute] = list(values)
+            self.devices[attribute] = matrix
+
+    def __len__(self) -> int:
+        return self.positions.__len__()
+
+    def all(self) -> 'Any':
+        return np.ones(self.__len__(), dtype=bool)
+
+    def active_mask(self, at: datetime = None) -> 'Any':
+        """
+        Mask of the rows with start_date_time <= at <= end_date_time
+
+        :param at: reference time (optional, default now)
+        """
+        at = datetime.now(timezone.utc) if at is None else at
+        reference = np.datetime64(_to_milliseconds(at), "ms")
+        return (self.start_date_time <= reference) & (reference <= self.end_date_time)
+
+    def territory_mask(self, *territories: str) -> 'Any':
+        return self.territory.mask(territories)
+
+    def channel_mask(self, *channels: str) -> 'Any':
+        return self.channel.mask(channels)
+
+    def device_mask(self, device_attribute: str, *expected_values: str) -> 'Any':
+        """
+        Mask of the rows with a Device that has device_attribute equal to one of the expected values
+
+        :raises AttributeError: if device_attribute is not an attribute of Device
+        """
+        if device_attribute not in self.devices:
+            raise AttributeError("Device has no attribute '%s'" % device_attribute)
+        values = self.device_values[device_attribute]
+        columns = [values.index(value) for value in expected_values if value in values]
+        if columns.__len__() == 0:
+            return np.zeros(self.__len__(), dtype=bool)
+        return self.devices[device_attribute][:, columns].any(axis=1)
+
+    def select(self, mask: Any) -> 'List[ResultRights]':
+        """
+        Return the ResultRights of the rows of the mask, in the order of results and without duplicates
+        """
+        return [self.results[position] for position in np.unique(self.positions[mask]).tolist()]
+
+    def select_titles(self, mask: Any) -> 'List[str | None]':
+        """
+        Return the titles of the rows of the mask
+        """
+        rows = np.flatnonzero(mask)
+        starts = self.title_offsets[rows].tolist()
+        ends = self.title_offsets[rows + 1].tolist()
+        return [title for start, end in zip(starts, ends) for title in self.titles[start:end]]
+
+    def count(self, mask: Any) -> 'int':
+        return int(np.count_nonzero(mask))
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Result import Response, ResultType
+
+# A LOADER RETURNS THE (asset, right) Response OF THE FEEDS
+Loader = Callable[[], Tuple[Response, Response]]
+
+
+class CatalogSnapshot:
+    """
+    Immutable parsed catalog with its indexes, it is built completely before being published so a reader never sees a
+    half-built catalog
+    """
+
+    def __init__(self, response_asset: Response, response_right: Response):
+        self.index = CatalogIndex(response_asset, response_right)
+        # THE TITLE INDEX IS BUILT WITH THE SNAPSHOT, NOT BY THE FIRST SEARCH
+        self.index.title_index
+        self.loaded_at = datetime.now(timezone.utc)
+        self._active_content_ids: Tuple[FrozenSet[int], FrozenSet[str]] | None = None
+
+    def active_content_ids(self) -> 'FrozenSet[str]':
+        # THE TERM INDEX RETURNS THE SAME SET UNTIL A RIGHT STARTS OR EXPIRES, THE content_id ARE COMPUTED ONCE FOR IT
+        positions = self.index.term_index.active_positions()
+        cached = self._active_content_ids
+        if cached is not None and cached[0] is positions:
+            return cached[1]
+        content_ids = frozenset(self.index.rights[position].content_id for position in positions)
+        self._active_content_ids = (positions, content_ids)
+        return content_ids
+
+    def manifests(self, content_id: str = None, video_format: str = "HD", origin: str = "level3") -> 'List[str]':
+        content_ids = self.active_content_ids()
+        if content_id is not None:
+            content_ids = content_ids & {content_id}
+        return [endpoint.path for endpoint in self.index.endpoints(video_format, origin, content_ids)]
+
+    def endpoints(self, video_format: str, origin: str, active: bool = False) -> 'List[Dict[str, Any]]':
+        candidates = self.index.endpoints_by_format_and_origin.get((video_format, origin), [])
+        content_ids = self.active_content_ids() if active else None
+        return [{"content_id": content_id, "origin": endpoint.origin, "path": endpoint.path}
+                for content_id, endpoint in candidates if content_ids is None or content_id in content_ids]
+
+    def titles(self, device_attribute: str, expected_value: str, active: bool = False) -> 'List[Dict[str, Any]]':
+        results = self.index.device_index.playable_on(device_attribute, expected_value)
+        if active:
+            results = self.index.filter_result_by_active(results)
+        return [{"content_id": result.content_id,
+                 "title": None if not result.localizable_information else
+                 result.localizable_information[0].title_name_medium} for result in results]
+
+    def search(self, query: str, field: str = "title", locale: str = None, active: bool = False,
+               device_attribute: str = None, value: str = None, limit: int = 20) -> 'List[Dict[str, Any]]':
+        device = None if device_attribute is None or value is None else (device_attribute, value)
+        results = []
+        for result in self.index.search(query, field, locale, active, device, limit=limit):
+            information = next((information for information in (result.localizable_information or [])
+                                if locale is None or information.locale == locale), None)
+            results.append({"content_id": result.content_id,
+                            "title": None if information is None else information.title_name_medium,
+                            "episode_name": None if information is None else information.episode_name,
+                            "season_number": None if information is None else information.season_number,
+                            "episode_number": None if information is None else information.episode_number,
+                            "actors": None if information is None else information.actors})
+        return results
+
+    def health(self) -> 'Dict[str, Any]':
+        return {"loaded_at": self.loaded_at.isoformat(), "assets": self.index.assets.__len__(),
+                "rights": self.index.rights.__len__()}
+
+
+class CatalogService:
+    """
+    Keep the catalog in memory and refresh it in background. The new snapshot is built aside and published with a
+    single reference assignment, readers take the reference once per query and never block
+    """
+
+    def __init__(self, loader: Loader, refresh_interval: float = 300):
+        """
+        :param loader: function that fetches and parses the feeds
+        :param refresh_interval: seconds between two refreshes
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.snapshot: CatalogSnapshot | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> 'bool':
+        """
+        Load the feeds and swap the snapshot, if the load fails the current snapshot is kept
+
+        :returns bool: True if the snapshot has been replaced
+        """
+        start = time.perf_counter()
+        try:
+            response_asset, response_right = self.loader()
+            snapshot = CatalogSnapshot(response_asset, response_right)
+        except Exception as e:
+            logging.error("service: refresh failed, the current catalog is kept -> %s", e)
+            return False
+        self.snapshot = snapshot
+        logging.info("service: catalog refreshed in %.2fs (%d assets, %d rights)", time.perf_counter() - start,
+                     snapshot.index.assets.__len__(), snapshot.index.rights.__len__())
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start(self):
+        """
+        Load the first snapshot and start the background refresh
+        """
+        if self.snapshot is None:
+            self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _flag(query: Dict[str, List[str]], name: str) -> bool:
+    return query.get(name, ["false"])[0].lower() == "true"
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over the current snapshot:
+        GET /health
+        GET /manifests?content_id=&video_format=HD&origin=level3 -> manifests of the active rights
+        GET /titles?device_attribute=provider&value=ROKU&active=true -> titles playable on a device
+        GET /endpoints?video_format=HD&origin=level3&active=false -> endpoints by format and origin
+        GET /search?q=marple+nem&field=title&locale=en-GB&active=true&device_attribute=provider&value=ROKU&limit=20
+            -> titles (field=actor: titles of the actors) that match the query, the last word as a prefix
+    """
+    service: CatalogService = None
+
+    def _send(self, status: int, body: Any):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(data.__len__()))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        snapshot = self.service.snapshot
+        if snapshot is None:
+            self._send(503, {"error": "catalog not loaded yet"})
+            return
+        try:
+            match url.path:
+                case "/health":
+                    self._send(200, snapshot.health())
+                case "/manifests":
+                    self._send(200, snapshot.manifests(query.get("content_id", [None])[0],
+                                                       query.get("video_format", ["HD"])[0],
+                                                       query.get("origin", ["level3"])[0]))
+                case "/titles":
+                    self._send(200, snapshot.titles(query.get("device_attribute", ["provider"])[0],
+                                                    query.get("value", [None])[0], _flag(query, "active")))
+                case "/endpoints":
+                    self._send(200, snapshot.endpoints(query.get("video_format", ["HD"])[0],
+                                                       query.get("origin", ["level3"])[0], _flag(query, "active")))
+                case "/search":
+                    self._send(200, snapshot.search(query.get("q", [""])[0], query.get("field", ["title"])[0],
+                                                    query.get("locale", [None])[0], _flag(query, "active"),
+                                                    query.get("device_attribute", [None])[0],
+                                                    query.get("value", [None])[0], int(query.get("limit", [20])[0])))
+                case _:
+                    self._send(404, {"error": "not found"})
+        except (AttributeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+
+    def address_string(self) -> str:
+        # ON A UNIX SOCKET THE CLIENT HAS NO ADDRESS
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logging.debug("service: %s - %s", self.address_string(), format % args)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "unix"
+        self.server_port = 0
+
+
+def create_server(service: CatalogService, host: str = "127.0.0.1", port: int = 8080,
+                  socket_path: str = None) -> 'socketserver.BaseServer':
+    """
+    Create the HTTP server of the API, on a Unix socket if socket_path is given, on host:port otherwise
+    """
+    handler = type("BoundCatalogRequestHandler", (CatalogRequestHandler,), {"service": service})
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def feed_loader(number_of_iterations: int = 3) -> 'Loader':
+    """
+    Loader of the production feeds, the records that are not valid are skipped and logged so that a bad row of the
+    feed does not stop the refresh
+    """
+    from src.main import Config
+    from src.main.Client import FeedClient
+    from src.main.Decoder import decode_response
+
+    client = FeedClient(auth=Config.BASIC_AUTH, number_of_iterations=number_of_iterations)
+
+    def load() -> Tuple[Response, Response]:
+        responses = client.fetch_all({"Asset Data": Config.URL_ASSET, "Localization Data": Config.URL_RIGHT})
+        quarantine = []
+        loaded = (decode_response(responses["Asset Data"].json(), ResultType.ASSET, quarantine),
+                  decode_response(responses["Localization Data"].json(), ResultType.RIGHT, quarantine))
+        if quarantine:
+            logging.warning("service: %d records skipped, the first one: %s", quarantine.__len__(), quarantine[0])
+        return loaded
+
+    return load
+
+
+def main(argv: List[str]):
+    logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', datefmt='%d-%m-%y %H:%M',
+                        level=logging.INFO)
+    args_map = dict(arg.split("=", 1) for arg in argv if arg.__contains__("="))
+    service = CatalogService(feed_loader(int(args_map.get("NUMBER_OF_ITERATIONS", 3))),
+                             float(args_map.get("REFRESH_INTERVAL", 300)))
+    server = create_server(service, args_map.get("HOST", "127.0.0.1"), int(args_map.get("PORT", 8080)),
+                           args_map.get("SOCKET"))
+    service.start()
+    logging.info("service: listening on %s", args_map.get("SOCKET") or "%s:%s" % server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
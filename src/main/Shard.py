@@ -0,0 +1,79 @@
+import logging
+from typing import Any, Dict, Iterable, List, Set
+
+from src.main.Client import FeedClient
+from src.main.Result import Response, ResultType
+
+
+def merge_payloads(payloads: Iterable[Any]) -> 'Dict[str, Any]':
+    """
+    Merge the payloads of many pages or shards of a feed into a single payload, the records are deduplicated by
+    contentId keeping the first one in the order of the payloads
+
+    :param payloads: payloads as returned by json.loads, in the order of the sources
+    :returns Dict[str, Any]: payload with all the records in "results"
+    """
+    seen: Set[Any] = set()
+    results = []
+    for payload in payloads:
+        for record in (payload.get("results") or []):
+            content_id = record.get("contentId")
+            # A RECORD WITHOUT contentId IS KEPT, from_dict WILL REPORT IT
+            if content_id is not None and content_id in seen:
+                continue
+            seen.add(content_id)
+            results.append(record)
+    return {"results": results}
+
+
+def merge_responses(responses: Iterable[Response]) -> 'Response':
+    """
+    Merge the Response of many pages or shards, deduplicated by content_id keeping the first one in the order of the
+    responses
+    """
+    seen: Set[str] = set()
+    results = []
+    for response in responses:
+        for result in (response.results or []):
+            if result.content_id in seen:
+                continue
+            seen.add(result.content_id)
+            results.append(result)
+    return Response(results)
+
+
+def fetch_payloads(client: FeedClient, urls: Iterable[str], max_concurrency: int = None) -> 'List[Any]':
+    """
+    Retrieve and decode all the sources with bounded concurrency, the time follows the slowest source and not the sum
+    of them
+
+    :param client: FeedClient
+    :param urls: list or generator of urls
+    :param max_concurrency: max number of requests at the same time (optional, default pool size of the client)
+    :returns List[Any]: payloads in the order of the urls
+    :raises FetchError: if a source could not be retrieved
+    """
+    payloads: Dict[int, Any] = {}
+    for position, url, response in client.fetch_many(urls, max_concurrency):
+        payloads[position] = response.json()
+        logging.info("shard: %s retrieved (%d records)", url, (payloads[position].get("results") or []).__len__())
+    return [payloads[position] for position in sorted(payloads)]
+
+
+def ingest(client: FeedClient, urls: Iterable[str], result_type: ResultType, max_concurrency: int = None) -> 'Response':
+    """
+    Retrieve all the sources of a feed and merge them in a single Response deduplicated by content_id. Every shard is
+    parsed as soon as it arrives, while the other ones are still downloading
+
+    :param client: FeedClient
+    :param urls: list or generator of urls
+    :param result_type: ResultType of the elements
+    :param max_concurrency: max number of requests at the same time (optional, default pool size of the client)
+    :returns Response: merged Response, the duplicates of a content_id are dropped keeping the first source
+    :raises FetchError: if a source could not be retrieved
+    """
+    responses: Dict[int, Response] = {}
+    for position, url, response in client.fetch_many(urls, max_concurrency):
+        responses[position] = Response.from_dict(response.json(), result_type)
+        logging.info("shard: %s parsed (%d records)", url, (responses[position].results or []).__len__())
+    return merge_responses(responses[position] for position in sorted(responses))
@@ -0,0 +1,302 @@
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.main.Result import Response, ResultAsset, ResultRights, Asset, Endpoint, Device, Term, Right, \
+    LocalizableInformation
+from src.main.Timestamp import from_microseconds, to_microseconds
+
+MAGIC = b"CATSNAP\x00"
+VERSION = 2
+# STRING ID OF None
+NONE = 0xFFFFFFFF
+# COUNT OF A LIST THAT IS None, AND OF THE TERMS OF A ResultRights WITHOUT rights
+NONE_LIST = -1
+NONE_RIGHT = -2
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+_POSITION = struct.Struct("<I")
+# content_id, access_channel, channel, number of terms, first term, number of infos, first info
+_RIGHTS = struct.Struct("<IIIiIiI")
+# start and end in microseconds from the epoch (UTC), territory, number of devices, first device
+_TERM = struct.Struct("<qqIiI")
+_DEVICE = struct.Struct("<III")
+# locale, language, title_name_medium, episode_name, episode_number, season_number, number of actors, first actor
+_INFO = struct.Struct("<IIIIIIiI")
+_STRING_ID = struct.Struct("<I")
+# content_id, access_channel, number of assets, first asset
+_ASSETS = struct.Struct("<IIiI")
+# video_format, number of endpoints, first endpoint
+_ASSET = struct.Struct("<IiI")
+_ENDPOINT = struct.Struct("<II")
+
+SECTIONS = ("string_offsets", "strings", "rights", "terms", "devices", "infos", "actors", "assets", "asset_items",
+            "endpoints", "rights_index", "assets_index")
+
+
+class _Writer:
+    # TABLES OF THE SNAPSHOT WHILE IT IS BUILT
+    def __init__(self):
+        self.string_ids: Dict[str, int] = {}
+        self.strings: List[bytes] = []
+        self.sections: Dict[str, bytearray] = {name: bytearray() for name in SECTIONS}
+        self.counts: Dict[str, int] = {name: 0 for name in SECTIONS}
+
+    def string(self, value: str | None) -> int:
+        if value is None:
+            return NONE
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = self.strings.__len__()
+            self.strings.append(value.encode("utf-8"))
+        return string_id
+
+    def append(self, section: str, record: struct.Struct, *values) -> int:
+        position = self.counts[section]
+        self.sections[section] += record.pack(*values)
+        self.counts[section] = position + 1
+        return position
+
+    def items(self, section: str, record: struct.Struct, items: List[Any] | None,
+              values: Callable[[Any], Tuple]) -> Tuple[int, int]:
+        # (count, first) OF A LIST OF ITEMS WRITTEN ONE AFTER THE OTHER
+        if items is None:
+            return NONE_LIST, 0
+        first = self.counts[section]
+        for item in items:
+            self.append(section, record, *values(item))
+        return items.__len__(), first
+
+
+def write_snapshot(path: str, response_asset: Response | None, response_right: Response | None):
+    """
+    Write the parsed feeds in the binary snapshot format, the file is replaced atomically
+
+    :param path: file of the snapshot
+    :param response_asset: Response of ResultAsset
+    :param response_right: Response of ResultRights
+    """
+    writer = _Writer()
+    rights = [] if response_right is None else (response_right.results or [])
+    assets = [] if response_asset is None else (response_asset.results or [])
+
+    def device(value: Device) -> Tuple:
+        return writer.string(value.device_platform), writer.string(value.device_type), writer.string(value.provider)
+
+    def term(value: Term) -> Tuple:
+        return (to_microseconds(value.start_date_time), to_microseconds(value.end_date_time),
+                writer.string(value.territory), *writer.items("devices", _DEVICE, value.devices, device))
+
+    def info(value: LocalizableInformation) -> Tuple:
+        return (writer.string(value.locale), writer.string(value.language), writer.string(value.title_name_medium),
+                writer.string(value.episode_name), writer.string(value.episode_number),
+                writer.string(value.season_number),
+                *writer.items("actors", _STRING_ID, value.actors, lambda actor: (writer.string(actor),)))
+
+    def endpoint(value: Endpoint) -> Tuple:
+        return writer.string(value.origin), writer.string(value.path)
+
+    def asset(value: Asset) -> Tuple:
+        return writer.string(value.video_format), *writer.items("endpoints", _ENDPOINT, value.endpoints, endpoint)
+
+    for result in rights:
+        terms_count, terms_first, channel = NONE_RIGHT, 0, NONE
+        if result.rights is not None:
+            channel = writer.string(result.rights.channel)
+            terms_count, terms_first = writer.items("terms", _TERM, result.rights.terms, term)
+        writer.append("rights", _RIGHTS, writer.string(result.content_id), writer.string(result.access_channel),
+                      channel, terms_count, terms_first,
+                      *writer.items("infos", _INFO, result.localizable_information, info))
+
+    for result in assets:
+        writer.append("assets", _ASSETS, writer.string(result.content_id), writer.string(result.access_channel),
+                      *writer.items("asset_items", _ASSET, result.assets, asset))
+
+    # INDEXES: POSITIONS OF THE RECORDS SORTED BY content_id, SEARCHED WITH A BINARY SEARCH
+    for section, results in (("rights_index", rights), ("assets_index", assets)):
+        for position in sorted(range(results.__len__()), key=lambda position: results[position].content_id):
+            writer.append(section, _POSITION, position)
+
+    offset = 0
+    for data in writer.strings:
+        writer.append("string_offsets", _OFFSET, offset)
+        offset += data.__len__()
+    writer.append("string_offsets", _OFFSET, offset)
+    writer.sections["strings"] = b"".join(writer.strings)
+
+    header_size = _HEADER.size + _SECTION.size * SECTIONS.__len__()
+    table = bytearray()
+    offset = header_size
+    for name in SECTIONS:
+        table += _SECTION.pack(offset, writer.sections[name].__len__())
+        offset += writer.sections[name].__len__()
+    with open(path + ".tmp", "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, SECTIONS.__len__()))
+        file.write(table)
+        for name in SECTIONS:
+            file.write(writer.sections[name])
+    os.replace(path + ".tmp", path)
+
+
+class _Records(Sequence):
+    # RECORDS OF THE SNAPSHOT, DECODED WHEN THEY ARE READ
+    def __init__(self, length: int, decode: Callable[[int], Any]):
+        self._length = length
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._decode(index) for index in range(*position.indices(self._length))]
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("record index out of range")
+        return self._decode(position)
+
+
+class Snapshot:
+    """
+    Catalog snapshot opened with mmap: opening it reads only the header, the records are decoded into the models of
+    Result when they are read. Several processes that open the same file share its pages in the page cache
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: file written by write_snapshot
+        :raises ValueError: if the file is not a snapshot of this version
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, number_of_sections = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or number_of_sections != SECTIONS.__len__():
+            self._mmap.close()
+            raise ValueError("%s is not a catalog snapshot of version %d" % (path, VERSION))
+        self._offsets: Dict[str, int] = {}
+        lengths: Dict[str, int] = {}
+        for index, name in enumerate(SECTIONS):
+            self._offsets[name], lengths[name] = _SECTION.unpack_from(self._mmap, _HEADER.size + _SECTION.size * index)
+        self._strings: Dict[int, str] = {}
+        self.rights = _Records(lengths["rights"] // _RIGHTS.size, self._rights)
+        self.assets = _Records(lengths["assets"] // _ASSETS.size, self._assets)
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _unpack(self, section: str, record: struct.Struct, position: int) -> Tuple:
+        return record.unpack_from(self._mmap, self._offsets[section] + record.size * position)
+
+    def _string(self, string_id: int) -> str | None:
+        if string_id == NONE:
+            return None
+        value = self._strings.get(string_id)
+        if value is None:
+            start, = self._unpack("string_offsets", _OFFSET, string_id)
+            end, = self._unpack("string_offsets", _OFFSET, string_id + 1)
+            offset = self._offsets["strings"]
+            value = self._strings[string_id] = self._mmap[offset + start:offset + end].decode("utf-8")
+        return value
+
+    def _items(self, section: str, record: struct.Struct, count: int, first: int,
+               decode: Callable[[Tuple], Any]) -> List[Any] | None:
+        if count == NONE_LIST:
+            return None
+        return [decode(self._unpack(section, record, position)) for position in range(first, first + count)]
+
+    def _term(self, values: Tuple) -> Term:
+        start, end, territory, devices_count, devices_first = values
+        return Term(from_microseconds(start), from_microseconds(end), self._string(territory),
+                    self._items("devices", _DEVICE, devices_count, devices_first,
+                                lambda device: Device(*map(self._string, device))))
+
+    def _info(self, values: Tuple) -> LocalizableInformation:
+        *strings, actors_count, actors_first = values
+        return LocalizableInformation(*map(self._string, strings),
+                                      self._items("actors", _STRING_ID, actors_count, actors_first,
+                                                  lambda actor: self._string(actor[0])))
+
+    def _rights(self, position: int) -> ResultRights:
+        content_id, access_channel, channel, terms_count, terms_first, infos_count, infos_first = \
+            self._unpack("rights", _RIGHTS, position)
+        right = None if terms_count == NONE_RIGHT else \
+            Right(self._string(channel), self._items("terms", _TERM, terms_count, terms_first, self._term))
+        return ResultRights(self._string(content_id), self._string(access_channel),
+                            self._items("infos", _INFO, infos_count, infos_first, self._info), right)
+
+    def _asset(self, values: Tuple) -> Asset:
+        video_format, endpoints_count, endpoints_first = values
+        return Asset(self._items("endpoints", _ENDPOINT, endpoints_count, endpoints_first,
+                                 lambda endpoint: Endpoint(*map(self._string, endpoint))), self._string(video_format))
+
+    def _assets(self, position: int) -> ResultAsset:
+        content_id, access_channel, assets_count, assets_first = self._unpack("assets", _ASSETS, position)
+        return ResultAsset(self._string(content_id), self._string(access_channel),
+                           self._items("asset_items", _ASSET, assets_count, assets_first, self._asset))
+
+    def _find(self, index: str, section: str, record: struct.Struct, length: int, content_id: str) -> List[int]:
+        # BINARY SEARCH OF THE FIRST POSITION WITH content_id, THEN THE FOLLOWING ONES WITH THE SAME content_id
+        def key(rank: int) -> str:
+            position, = self._unpack(index, _POSITION, rank)
+            return self._string(self._unpack(section, record, position)[0])
+
+        low, high = 0, length
+        while low < high:
+            middle = (low + high) // 2
+            if key(middle) < content_id:
+                low = middle + 1
+            else:
+                high = middle
+        positions = []
+        while low < length and key(low) == content_id:
+            positions.append(self._unpack(index, _POSITION, low)[0])
+            low += 1
+        return sorted(positions)
+
+    def get_rights(self, content_id: str) -> 'List[ResultRights]':
+        return [self.rights[position] for position in
+                self._find("rights_index", "rights", _RIGHTS, self.rights.__len__(), content_id)]
+
+    def get_assets(self, content_id: str) -> 'List[ResultAsset]':
+        return [self.assets[position] for position in
+                self._find("assets_index", "assets", _ASSETS, self.assets.__len__(), content_id)]
+
+    def responses(self) -> 'Tuple[Response, Response]':
+        """
+        :returns Tuple[Response, Response]: (assets, rights) Response, their results are decoded when they are read
+        """
+        return Response(self.assets), Response(self.rights)
+
+
+def main(argv: List[str]):
+    """
+    Print the active manifests of content_id read from a snapshot:
+        py -m src.main.Snapshot catalog.snapshot CONTENT_ID=id1,id2 VIDEO_FORMAT=HD ORIGIN=level3
+    """
+    args_map = dict(arg.split("=", 1) for arg in argv[1:] if arg.__contains__("="))
+    with Snapshot(argv[0]) as snapshot:
+        for content_id in args_map.get("CONTENT_ID", "").split(","):
+            if not any(result.rights is not None and any(term.is_active() for term in (result.rights.terms or []))
+                       for result in snapshot.get_rights(content_id)):
+                continue
+            for result in snapshot.get_assets(content_id):
+                for asset in (result.assets or []):
+                    if asset.video_format == args_map.get("VIDEO_FORMAT", "HD") and asset.endpoints \
+                            and asset.endpoints[0].origin == args_map.get("ORIGIN", "level3"):
+                        print(asset.endpoints[0].path)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
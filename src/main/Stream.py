@@ -0,0 +1,174 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Any, List
+
+from src.main.Decoder import RecordError, compile_decoder
+from src.main.Metrics import Metrics
+from src.main.Result import ResultType, ResultAsset, ResultRights
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """
+    Text buffer filled chunk by chunk from a byte (or str) iterator, the consumed part is dropped so that the memory
+    stays bounded by the biggest JSON element and not by the whole payload
+    """
+
+    def __init__(self, chunks: Iterable[bytes | str]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> 'bool':
+        """
+        Read the next chunk, return False when there is nothing else to read
+        """
+        if self.eof:
+            return False
+        if self.pos > 0:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.text += chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+            return True
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> 'str | None':
+        """
+        Return the next character that is not a whitespace without consuming it, None at the end of the payload
+        """
+        while True:
+            while self.pos < self.text.__len__() and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < self.text.__len__():
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError("Malformed payload: expected '%s' at position %d, found %r" % (char, self.pos, found))
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder, raw: bool = False) -> 'Any':
+        """
+        Decode the next JSON value, reading new chunks until the value is complete. A value that ends exactly at the
+        end of the buffer is accepted only at the end of the payload, because a number could continue in the next chunk
+
+        :param raw: if True return (value, text of the value as it is in the payload)
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                if end < self.text.__len__() or self.eof:
+                    start, self.pos = self.pos, end
+                    return (value, self.text[start:end]) if raw else value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError("Malformed payload: %s" % e) from e
+            self.fill()
+
+
+def iter_records(chunks: Iterable[bytes | str], raw: bool = False) -> 'Iterator[Any]':
+    """
+    Incrementally decode a payload {"results": [...]} yielding every element of "results" as returned by json.loads, as
+    soon as it has been downloaded
+
+    :param chunks: iterable of the body chunks, e.g. requests.Response.iter_content(), or the whole body
+    :param raw: if True yield (element, text of the element as it is in the payload)
+    :returns Iterator[Any]: decoded elements
+    :raises ValueError: if the payload is malformed
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        key = buffer.decode(decoder)
+        buffer.expect(":")
+        if key == "results" and buffer.peek() == "[":
+            buffer.pos += 1
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.decode(decoder, raw)
+                    separator = buffer.peek()
+                    buffer.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError("Malformed payload: expected ',' or ']' in results, found %r" % separator)
+        else:
+            # OTHER KEYS (OR "results": null) ARE SKIPPED
+            buffer.decode(decoder)
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Malformed payload: expected ',' or '}', found %r" % separator)
+
+
+def iter_results(chunks: Iterable[bytes | str], result_type: ResultType,
+                 quarantine: List[RecordError] = None) -> 'Iterator[ResultRights | ResultAsset]':
+    """
+    Incrementally decode a payload {"results": [...]} yielding one ResultRights or ResultAsset for every element of
+    "results" as soon as it has been downloaded. Every element is validated with the compiled decoder of its class
+
+    :param chunks: iterable of the body chunks, e.g. requests.Response.iter_content()
+    :param result_type: ResultType of the elements
+    :param quarantine: where the elements that are not valid are collected and skipped (optional, without it the first
+        one raises RecordError)
+    :returns Iterator[ResultRights | ResultAsset]: parsed elements
+    :raises RecordError: without quarantine, for the first element that is not valid
+    """
+    decode = compile_decoder(ResultAsset if result_type == ResultType.ASSET else ResultRights)
+    for index, record in enumerate(iter_records(chunks)):
+        try:
+            result = decode(record)
+        except Exception as e:
+            error = RecordError(index, str(e), record)
+            if quarantine is None:
+                raise error from e
+            quarantine.append(error)
+        else:
+            yield result
+
+
+def iter_results_from_response(response: Any, result_type: ResultType, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                               metrics: Metrics = None,
+                               quarantine: List[RecordError] = None) -> 'Iterator[ResultRights | ResultAsset]':
+    """
+    Incrementally decode the body of a requests.Response obtained with stream=True
+
+    :param response: requests.Response
+    :param result_type: ResultType of the elements
+    :param chunk_size: size in bytes of every chunk read from the connection
+    :param metrics: where the bytes received are counted (optional)
+    :param quarantine: where the elements that are not valid are collected and skipped (optional)
+    :returns Iterator[ResultRights | ResultAsset]: parsed elements
+    """
+    def counted(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            metrics.increment("bytes_received", chunk.__len__())
+            yield chunk
+
+    try:
+        chunks = response.iter_content(chunk_size=chunk_size)
+        yield from iter_results(chunks if metrics is None else counted(chunks), result_type, quarantine)
+    finally:
+        response.close()
@@ -0,0 +1,118 @@
+import threading
+from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Dict, List, Tuple, Iterable, FrozenSet
+
+from src.main.Result import ResultRights
+from src.main.Timestamp import from_microseconds, to_microseconds
+
+
+class TermIndex:
+    """
+    Interval index over the Term windows of a list of ResultRights. The start and end dates of every term are kept
+    sorted, so "active at time t" is answered with two bisects instead of a scan of all the terms. The active set is
+    constant between two boundaries (a start or an end of any term), so the last answer is cached and reused until the
+    reference time crosses the previous or the next boundary
+    """
+
+    def __init__(self, result_rights: List[ResultRights] | None):
+        self.results: List[ResultRights] = result_rights or []
+        self._positions_by_id = {id(result): position for position, result in enumerate(self.results)}
+
+        # (date, term id) SORTED BY DATE, term id -> position of the ResultRights in results. THE DATES ARE MICROSECONDS
+        # FROM THE EPOCH, INTEGERS ARE SORTED AND BISECTED MUCH FASTER THAN datetime
+        starts: List[Tuple[int, int]] = []
+        ends: List[Tuple[int, int]] = []
+        self._term_positions: List[int] = []
+        # THE TERMS SHARE FEW DISTINCT DATES (THE SAME datetime OF parse_timestamp), EVERY ONE IS CONVERTED ONCE
+        microseconds: Dict[datetime, int] = {}
+        for position, result in enumerate(self.results):
+            if result.rights is None:
+                continue
+            for term in (result.rights.terms or []):
+                term_id = self._term_positions.__len__()
+                self._term_positions.append(position)
+                start = microseconds.get(term.start_date_time)
+                if start is None:
+                    start = microseconds[term.start_date_time] = to_microseconds(term.start_date_time)
+                end = microseconds.get(term.end_date_time)
+                if end is None:
+                    end = microseconds[term.end_date_time] = to_microseconds(term.end_date_time)
+                starts.append((start, term_id))
+                ends.append((end, term_id))
+        starts.sort(key=itemgetter(0))
+        ends.sort(key=itemgetter(0))
+        self._start_dates: List[int] = [date for date, _ in starts]
+        self._start_terms: List[int] = [term_id for _, term_id in starts]
+        self._end_dates: List[int] = [date for date, _ in ends]
+        self._end_terms: List[int] = [term_id for _, term_id in ends]
+
+        self._lock = threading.Lock()
+        # (started, expired, positions) -> started/expired are the number of terms already started/ended at the
+        # reference time of the cached answer, they identify the interval between two boundaries
+        self._cache: Tuple[int, int, FrozenSet[int]] | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _counts(self, at: datetime | None) -> 'Tuple[int, int]':
+        # A TERM IS ACTIVE WHEN start_date_time <= at <= end_date_time
+        at = to_microseconds(datetime.now(timezone.utc) if at is None else at)
+        return bisect_right(self._start_dates, at), bisect_left(self._end_dates, at)
+
+    def active_positions(self, at: datetime = None) -> 'FrozenSet[int]':
+        """
+        Return the positions in results of the ResultRights with at least one active term at the given time
+
+        :param at: reference time (optional, default now)
+        :returns FrozenSet[int]: positions of the active ResultRights
+        """
+        started, expired = self._counts(at)
+        with self._lock:
+            cache = self._cache
+            if cache is not None and cache[0] == started and cache[1] == expired:
+                self.cache_hits += 1
+                return cache[2]
+            self.cache_misses += 1
+        active_terms = set(self._start_terms[:started])
+        active_terms.difference_update(self._end_terms[:expired])
+        positions = frozenset(self._term_positions[term_id] for term_id in active_terms)
+        with self._lock:
+            self._cache = (started, expired, positions)
+        return positions
+
+    def next_boundary(self, at: datetime = None) -> 'datetime | None':
+        """
+        Return the first time after the reference time in which a term starts or expires, that is until when the
+        active set at the reference time stays valid. None if no term will change any more
+
+        :param at: reference time (optional, default now)
+        :returns datetime | None: next start date or first instant after an end date (end date + 1 microsecond)
+        """
+        started, expired = self._counts(at)
+        candidates = []
+        if started < self._start_dates.__len__():
+            candidates.append(self._start_dates[started])
+        if expired < self._end_dates.__len__():
+            # THE TERM IS STILL ACTIVE AT end_date_time, IT EXPIRES JUST AFTER
+            candidates.append(self._end_dates[expired] + 1)
+        return from_microseconds(min(candidates)) if candidates.__len__() > 0 else None
+
+    def is_active(self, result: ResultRights, at: datetime = None) -> 'bool':
+        position = self._positions_by_id.get(id(result))
+        return position is not None and position in self.active_positions(at)
+
+    def filter_result_by_active(self, result_rights: Iterable[ResultRights] = None,
+                                at: datetime = None) -> 'List[ResultRights]':
+        """
+        Return the ResultRights that are active at the given time, keeping the order of the index. If result_rights is
+        given only the ones that are part of it are returned, e.g. the ones already filtered by device
+
+        :param result_rights: subset of the indexed ResultRights (optional, default all)
+        :param at: reference time (optional, default now)
+        :returns List[ResultRights]: list of ResultRights
+        """
+        positions = self.active_positions(at)
+        if result_rights is None:
+            return [self.results[position] for position in sorted(positions)]
+        return [result for result in result_rights if self._positions_by_id.get(id(result)) in positions]
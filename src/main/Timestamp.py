@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+TIMESTAMP_CACHE_SIZE = 4096
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(raw: str) -> 'datetime':
+    """
+    Parse a date of the feed into a timezone-aware UTC datetime with datetime.fromisoformat (the C implementation reads
+    every ISO 8601 layout of the feed, "Z" included); a date without timezone is considered UTC. The result is cached
+    by raw string because many rights share the same window boundaries
+
+    :param raw: date as string
+    :returns datetime: timezone-aware UTC datetime
+    :raises ValueError: if raw is not an ISO 8601 date
+    """
+    parsed = datetime.fromisoformat(raw)
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def to_utc(date: datetime) -> 'datetime':
+    """
+    Return the date as timezone-aware UTC, a naive date is considered already in UTC
+    """
+    if date.tzinfo is timezone.utc:
+        return date
+    return date.replace(tzinfo=timezone.utc) if date.tzinfo is None else date.astimezone(timezone.utc)
+
+
+def to_microseconds(date: datetime) -> 'int':
+    """
+    Microseconds from the epoch (UTC) of the date, a naive date is considered already in UTC. Integers are sorted and
+    compared much faster than datetime
+    """
+    delta = to_utc(date) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_microseconds(microseconds: int) -> 'datetime':
+    return EPOCH + timedelta(microseconds=microseconds)
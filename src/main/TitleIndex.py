@@ -0,0 +1,255 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+from src.main.Result import ResultRights
+
+# FIELDS OF THE INDEX: TITLE IS titleNameMedium AND episodeName, ACTOR IS credits.actor
+TITLE = "title"
+ACTOR = "actor"
+FIELDS = (TITLE, ACTOR)
+TOKEN = re.compile(r"\w+")
+# LANGUAGES IN WHICH THE DOTTED AND THE DOTLESS I ARE DIFFERENT LETTERS (I -> ı, İ -> i)
+DOTLESS_I_LANGUAGES = ("tr", "az")
+# TOKENS/PREFIXES AND QUERIES WHOSE POSITIONS ARE KEPT, A QUERY TYPED ONE LETTER AT A TIME READS THE SAME TOKENS AGAIN
+# AND THE SAME QUERIES ARE TYPED BY MANY USERS. THE SETS PROBED BY THE INTERSECTIONS ARE BIGGER, FEWER ARE KEPT
+POSITIONS_CACHE_SIZE = 256
+PROBE_CACHE_SIZE = 64
+QUERY_CACHE_SIZE = 1024
+# THE POSITIONS OF THE PREFIXES UP TO THIS LENGTH ARE MERGED WITH THE INDEX: THEY ARE THE FIRST LETTERS TYPED, THE MOST
+# EXPENSIVE TO MERGE AT QUERY TIME
+SHORT_PREFIX_LENGTH = 2
+# A FEW POSITIONS ARE LOOKED UP IN A MUCH LONGER ONE WITH BISECTS INSTEAD OF BUILDING ITS SET
+BISECT_RATIO = 16
+# THE PREFIXES AND TOKENS IN MORE THAN MASK_SIZE RESULTS ALSO HAVE A MASK, ONE BYTE EVERY RESULT SET TO 1 IF IT MATCHES:
+# AN INTERSECTION PROBES IT INSTEAD OF BUILDING A SET OF THOUSANDS OF POSITIONS AT QUERY TIME
+MASK_SIZE = 8192
+# AFTER THE LAST CHARACTER OF ANY TOKEN
+_LAST = "\U0010ffff"
+
+Key = Tuple[str, str | None]
+
+
+def normalize(text: str, locale: str = None) -> 'List[str]':
+    """
+    Split a text into normalized tokens: case folded, without accents ("Café" -> "cafe", "Straße" -> "strasse"), with the
+    rules of the I of the Turkish and Azerbaijani locales
+
+    :param text: text to split
+    :param locale: locale of the text, e.g. "tr-TR" (optional)
+    :returns List[str]: tokens in the order of the text
+    """
+    if _dotless_i(locale):
+        text = text.replace("I", "ı").replace("İ", "i")
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(character for character in unicodedata.normalize("NFKD", text)
+                       if not unicodedata.combining(character))
+    return TOKEN.findall(text)
+
+
+def _dotless_i(locale: str | None) -> 'bool':
+    return locale is not None and locale.split("-", 1)[0].lower() in DOTLESS_I_LANGUAGES
+
+
+def _contains(ascending: Tuple[int, ...], position: int) -> 'bool':
+    index = bisect_left(ascending, position)
+    return index < ascending.__len__() and ascending[index] == position
+
+
+class TitleIndex:
+    """
+    Inverted index of the titles, episode names and actors of a list of ResultRights. Every (field, locale) maps a
+    normalized token to the ascending positions of the ResultRights that contain it, and keeps its vocabulary sorted:
+    the tokens that start with a prefix are a contiguous range found with two bisects. A query matches the ResultRights
+    that contain all its tokens, the last one as a prefix while it is being typed:
+
+        index.search("marple nem")  -> titles with "marple" and a token starting with "nem"
+
+    The positions of the short prefixes are merged with the index, so the first letters of a query are not merged from
+    thousands of postings, and the ones of the frequent prefixes and tokens also have a mask that the intersections
+    probe without building a set
+    """
+
+    def __init__(self, result_rights: List[ResultRights] | None):
+        self.results: List[ResultRights] = result_rights or []
+        # (field, locale) -> token -> positions in results, ascending
+        self._postings: Dict[Key, Dict[str, Tuple[int, ...]]] = {}
+        for position, result in enumerate(self.results):
+            for information in (result.localizable_information or []):
+                locale = information.locale
+                values = {TITLE: (information.title_name_medium, information.episode_name),
+                          ACTOR: information.actors or ()}
+                for field, texts in values.items():
+                    tokens = self._postings.setdefault((field, locale), {})
+                    for text in texts:
+                        if text is None:
+                            continue
+                        for token in normalize(text, locale):
+                            positions = tokens.get(token)
+                            if positions is None:
+                                tokens[token] = [position]
+                            elif positions[-1] != position:
+                                positions.append(position)
+        self._vocabulary: Dict[Key, List[str]] = {}
+        # (field, locale) -> prefix of at most SHORT_PREFIX_LENGTH characters -> positions of the tokens that start with
+        # it, ascending
+        self._prefixes: Dict[Key, Dict[str, Tuple[int, ...]]] = {}
+        for key, tokens in self._postings.items():
+            self._vocabulary[key] = sorted(tokens)
+            prefixes: Dict[str, set] = {}
+            for token in self._vocabulary[key]:
+                for length in range(1, min(SHORT_PREFIX_LENGTH, token.__len__()) + 1):
+                    prefixes.setdefault(token[:length], set()).update(tokens[token])
+            self._prefixes[key] = {prefix: tuple(sorted(positions)) for prefix, positions in prefixes.items()}
+            # A TUPLE IS SMALLER THAN A LIST AND IS RETURNED WITHOUT A COPY
+            for token, positions in tokens.items():
+                tokens[token] = tuple(positions)
+        # (field, locale, prefix or token, prefix?) -> mask of the positions, for the ones in more than MASK_SIZE results
+        self._masks: Dict[Tuple[str, str | None, str, bool], bytes] = {}
+        for key in self._postings:
+            for prefix, table in ((True, self._prefixes[key]), (False, self._postings[key])):
+                for token, positions in table.items():
+                    if positions.__len__() > MASK_SIZE:
+                        mask = bytearray(self.results.__len__())
+                        for position in positions:
+                            mask[position] = 1
+                        self._masks[key + (token, prefix)] = bytes(mask)
+        # CACHES OF THE INSTANCE, THEY ARE DROPPED WITH THE INDEX
+        self._token_positions = lru_cache(maxsize=POSITIONS_CACHE_SIZE)(self._token_positions)
+        self._probe = lru_cache(maxsize=PROBE_CACHE_SIZE)(self._probe)
+        self._mask = lru_cache(maxsize=PROBE_CACHE_SIZE)(self._mask)
+        self._query_positions = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query_positions)
+
+    def locales(self) -> 'List[str | None]':
+        return sorted({locale for _, locale in self._postings}, key=lambda locale: (locale is None, locale or ""))
+
+    def _keys(self, field: str, locale: str | None) -> 'List[Key]':
+        if field not in FIELDS:
+            raise ValueError("Field %s is not indexed, use one of %s" % (field, FIELDS))
+        return [key for key in self._postings if key[0] == field and (locale is None or key[1] == locale)]
+
+    def _variants(self, text: str, field: str, locale: str | None) -> 'List[Tuple[List[str], Tuple[Key, ...]]]':
+        """
+        Normalized tokens of a query and the (field, locale) they are looked up in. A query without locale is normalized
+        also with the rules of the Turkish and Azerbaijani locales for their titles ("IŞIK" -> "ışık" in tr-TR)
+        """
+        keys = self._keys(field, locale)
+        variants = [(normalize(text, locale), tuple(keys))]
+        if locale is None:
+            dotless_keys = tuple(key for key in keys if _dotless_i(key[1]))
+            tokens = normalize(text, DOTLESS_I_LANGUAGES[0])
+            if dotless_keys.__len__() > 0 and tokens != variants[0][0] and tokens.__len__() == variants[0][0].__len__():
+                variants.append((tokens, dotless_keys))
+        return variants
+
+    def _token_positions(self, token: str, prefix: bool, keys: Tuple[Key, ...]) -> 'Tuple[int, ...]':
+        # ASCENDING POSITIONS OF A TOKEN, OR OF ALL THE TOKENS THAT START WITH IT
+        parts = []
+        for key in keys:
+            tokens = self._postings[key]
+            if not prefix:
+                parts.append(tokens.get(token, ()))
+            elif token.__len__() <= SHORT_PREFIX_LENGTH:
+                parts.append(self._prefixes[key].get(token, ()))
+            else:
+                vocabulary = self._vocabulary[key]
+                parts.extend(tokens[match] for match in
+                             vocabulary[bisect_left(vocabulary, token):bisect_left(vocabulary, token + _LAST)])
+        parts = [part for part in parts if part.__len__() > 0]
+        if parts.__len__() == 1:
+            return parts[0]
+        return tuple(sorted(set().union(*parts)))
+
+    def _probe(self, match: Tuple[Tuple[str, bool, Tuple[Key, ...]], ...]) -> 'FrozenSet[int]':
+        # SET OF THE POSITIONS OF A TOKEN OF THE QUERY, IN ANY OF ITS VARIANTS
+        return frozenset().union(*(self._token_positions(*variant) for variant in match))
+
+    def _mask(self, match: Tuple[Tuple[str, bool, Tuple[Key, ...]], ...]) -> 'bytes | None':
+        # MASK OF THE POSITIONS OF A TOKEN OF THE QUERY, IN ANY OF ITS VARIANTS, IF ALL ITS PARTS HAVE ONE. THE MASKS OF
+        # MORE LOCALES ARE MERGED AS INTEGERS, A BYTE IS 0 OR 1
+        masks = []
+        for token, prefix, keys in match:
+            if prefix and token.__len__() > SHORT_PREFIX_LENGTH:
+                return None
+            for key in keys:
+                if token not in (self._prefixes[key] if prefix else self._postings[key]):
+                    continue
+                mask = self._masks.get(key + (token, prefix))
+                if mask is None:
+                    return None
+                masks.append(mask)
+        if masks.__len__() <= 1:
+            return masks[0] if masks else None
+        merged = 0
+        for mask in masks:
+            merged |= int.from_bytes(mask, "little")
+        return merged.to_bytes(self.results.__len__(), "little")
+
+    def _query_positions(self, variants: Tuple[Tuple[Tuple[str, ...], Tuple[Key, ...]], ...],
+                         prefix: bool) -> 'Tuple[int, ...]':
+        matches = []
+        for index in range(variants[0][0].__len__()):
+            last = prefix and index == variants[0][0].__len__() - 1
+            match = tuple((tokens[index], last, keys) for tokens, keys in variants)
+            positions = [self._token_positions(*variant) for variant in match]
+            if positions.__len__() > 1:
+                positions = [tuple(sorted(set().union(*positions)))]
+            matches.append((positions[0], match))
+        # THE POSITIONS OF THE RAREST TOKEN ARE SCANNED AND LOOKED UP IN THE OTHER ONES
+        matches.sort(key=lambda match: match[0].__len__())
+        ascending = matches[0][0]
+        for positions, match in matches[1:]:
+            mask = self._mask(match)
+            if mask is not None:
+                ascending = tuple(filter(mask.__getitem__, ascending))
+            elif ascending.__len__() * BISECT_RATIO < positions.__len__():
+                ascending = tuple(position for position in ascending if _contains(positions, position))
+            else:
+                ascending = tuple(filter(self._probe(match).__contains__, ascending))
+        return ascending
+
+    def complete(self, prefix: str, field: str = TITLE, locale: str = None, limit: int = 10) -> 'List[str]':
+        """
+        Tokens that start with the normalized prefix, the most frequent first, e.g. for the suggestions of a search box
+
+        :param prefix: beginning of a token
+        :param field: TITLE or ACTOR
+        :param locale: locale of the titles (optional, default all)
+        :param limit: max number of tokens
+        :returns List[str]: tokens
+        :raises ValueError: if the field is not indexed
+        """
+        counts: Dict[str, int] = {}
+        for tokens, keys in self._variants(prefix, field, locale):
+            if tokens.__len__() == 0:
+                continue
+            for key in keys:
+                vocabulary = self._vocabulary[key]
+                for token in vocabulary[bisect_left(vocabulary, tokens[-1]):
+                                        bisect_left(vocabulary, tokens[-1] + _LAST)]:
+                    counts[token] = counts.get(token, 0) + self._postings[key][token].__len__()
+        return sorted(counts, key=lambda token: (-counts[token], token))[:limit]
+
+    def search_positions(self, query: str, field: str = TITLE, locale: str = None) -> 'Tuple[int, ...]':
+        """
+        Positions of the ResultRights that match the query: every token of the query has to be in the field, the last
+        one as a prefix unless the query ends with a space
+
+        :param query: text typed by the user
+        :param field: TITLE or ACTOR
+        :param locale: locale of the titles (optional, default all)
+        :returns Tuple[int, ...]: positions in results, ascending
+        :raises ValueError: if the field is not indexed
+        """
+        # THE FIELD IS CHECKED ALSO FOR AN EMPTY QUERY
+        variants = self._variants(query, field, locale)
+        if variants[0][0].__len__() == 0:
+            return ()
+        return self._query_positions(tuple((tuple(tokens), keys) for tokens, keys in variants),
+                                     not query[-1].isspace())
+
+    def search(self, query: str, field: str = TITLE, locale: str = None) -> 'List[ResultRights]':
+        return [self.results[position] for position in self.search_positions(query, field, locale)]
@@ -1,89 +1,91 @@
 import logging
 import sys
-import time
 from typing import List
 
-import requests
-from requests.auth import HTTPBasicAuth
+# ONLY THE STANDARD LIBRARY IS IMPORTED HERE: --help DOES NOT PAY THE IMPORT OF THE PIPELINE, AND THE PIPELINE IMPORTS
+# requests ONLY WHEN THE FEEDS ARE FETCHED
+USAGE = """usage: py -m src.main.main [KEY=VALUE ...]
 
-from src.main import Result
-from src.main.Result import filter_result_by_active_data_and_video_format_and_endpoint_origin_level, \
-    print_title_name_medium, filter_result_by_active, filter_result_by_can_be_played_on_ROKU, print_endpoints, Endpoint
+Fetch the asset (tq) and rights (vq) feeds, filter the rights that can be played on ROKU and print the HD/level3
+manifests of the active content_id. Options (see README.md):
 
-logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', datefmt='%d-%m-%y %H:%M', level=logging.INFO)
-logging.info("Starting execution")
+  NUMBER_OF_ITERATIONS=3           attempts of every feed
+  PRINT_FILTER_BY_DEVICE=True      print the titles that can be played on ROKU
+  PRINT_FILTER_BY_DEVICE_AND_ACTIVE=True
+                                   print the active titles that can be played on ROKU
+  OUTPUT=log|text|jsonl|csv        format of the results, OUTPUT_FILE=path writes them to a file
+  STREAM=true                      decode the feeds while they are downloaded
+  COMPACT=true | LAZY=true         compact or lazily decoded models
+  CACHE_DIR=path CACHE_TTL=s CACHE_MAX_SIZE=bytes OFFLINE=true
+                                   conditional HTTP cache of the feeds
+  DELTA_STATE=path                 parse only the records changed since the last run
+  JOIN_MEMORY_LIMIT=bytes          join on disk with bounded memory (implies STREAM=true)
+  URLS_ASSET=u1,u2 URLS_RIGHT=u1,u2 MAX_CONCURRENCY=n
+                                   feeds served as shards
+  METRICS_REPORT=path METRICS_PROMETHEUS=path TRACE_MEMORY=true
+                                   spans and counters of the run
+  SNAPSHOT=path                    write the parsed catalog as a binary snapshot
+  FROM_SNAPSHOT=path               read the catalog from a snapshot instead of the feeds
+  CONTENT_ID=id1,id2               restrict the run to these content_id
+  LENIENT=true QUARANTINE_FILE=path
+                                   skip the records that are not valid instead of stopping the run
+  PROBE_ORIGINS=level3=https://host,... PROBE_TIMEOUT=s PROBE_CONCURRENCY=n
+                                   check that the manifests can be reached on their origin
+  PROBE_CACHE=path PROBE_TTL=s PROBE_FILTER=true PROBE_MAX_LATENCY=s
+                                   cache of the probes, print only the reachable manifests
+"""
 
-NUMBER_OF_ITERATIONS = 3
-PRINT_FILTER_BY_DEVICE = False
-PRINT_FILTER_BY_DEVICE_AND_ACTIVE = False
 
-if sys.argv.__len__() > 1:
-    args_map: dict = {}
-    for index in range(1, 4):
-        if sys.argv[index] is not None and sys.argv[index].__contains__("="):
-            key_value = sys.argv[index].split("=")
-            args_map[key_value[0]] = key_value[1]
+def main(argv: List[str] = None) -> int:
+    """
+    Command line of the pipeline
 
-    if args_map.get("NUMBER_OF_ITERATIONS") is not None:
-        try:
-            NUMBER_OF_ITERATIONS = int(args_map.get("NUMBER_OF_ITERATIONS"))
-        except ValueError:
-            logging.warning(
-                "config: NUMBER_OF_ITERATIONS has to be a number, your configuration %s is not supported -> default value = 3",
-                args_map.get("NUMBER_OF_ITERATIONS"))
-            NUMBER_OF_ITERATIONS = 3
-    if args_map.get("PRINT_FILTER_BY_DEVICE") is not None:
-        PRINT_FILTER_BY_DEVICE = bool(args_map.get("PRINT_FILTER_BY_DEVICE"))
-    if args_map.get("PRINT_FILTER_BY_DEVICE_AND_ACTIVE") is not None:
-        PRINT_FILTER_BY_DEVICE_AND_ACTIVE = bool(args_map.get("PRINT_FILTER_BY_DEVICE_AND_ACTIVE"))
-
-url_asset = 'https://ko3vcqvszf.execute-api.eu-west-1.amazonaws.com/tq'
-url_right = 'https://ko3vcqvszf.execute-api.eu-west-1.amazonaws.com/vq'
-basic = HTTPBasicAuth('gcd-test', 'V2VsbCBkb25lIG9uIGRlY29kaW5nIHRoaXMsIG1lbnRpb24gdGhpcyBpbiB5b3VyIGludGVydmlldy4=')
-
-iterations = 1
-result_asset = None
-result_right = None
+    :param argv: KEY=VALUE arguments (optional, default sys.argv[1:])
+    :returns int: exit status, 1 if the feeds could not be retrieved or the run failed
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if any(arg in ("-h", "--help", "help") for arg in argv):
+        sys.stdout.write(USAGE)
+        return 0
 
-while iterations <= NUMBER_OF_ITERATIONS and ((result_right is None or result_right.status_code != 200) or (
-        result_asset is None or result_asset.status_code != 200)):
-    if result_asset is None or result_asset != 200:
-        logging.info("%d° attempt to call api: Asset Data", iterations)
-        result_asset = requests.get(url_asset, auth=basic)
-    if result_right is None or result_right != 200:
-        logging.info("%d° attempt to call api: Localization Data", iterations)
-        result_right = requests.get(url_right, auth=basic)
-    iterations += 1
-    time.sleep(0.1)
+    logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', datefmt='%d-%m-%y %H:%M',
+                        level=logging.INFO)
+    logging.info("Starting execution")
 
-if iterations > NUMBER_OF_ITERATIONS or ((result_right is None or result_right.status_code != 200) or (
-        result_asset is None or result_asset.status_code != 200)):
-    logging.error("An error occurred while recovering data. Please try again later")
-    logging.info("Arresting execution")
-    sys.exit(1)
+    from src.main.Metrics import Metrics
+    from src.main.Output import open_sink
+    from src.main.Pipeline import Options, run, emit
 
-try:
-    response_asset = Result.Response.from_dict(result_asset.json(), Result.ResultType.ASSET)
-    response_right = Result.Response.from_dict(result_right.json(), Result.ResultType.RIGHT)
-except Exception as e:
-    logging.error(e)
-    logging.info("Arresting execution")
-    sys.exit(1)
+    options = Options.from_args(argv)
+    metrics = Metrics(options.trace_memory)
+    try:
+        try:
+            result = run(options, metrics)
+        except Exception as e:
+            # THE CLIENT IS ALREADY IMPORTED WHEN A FEED COULD NOT BE RETRIEVED
+            from src.main.Client import FetchError
 
-filtered_data_by_device: List[Result.ResultRights] = filter_result_by_can_be_played_on_ROKU(response_right.results)
-if PRINT_FILTER_BY_DEVICE:
-    print_title_name_medium(filtered_data_by_device, "TV shows/movies title that can be played on ROKU:")
+            logging.error(e)
+            if isinstance(e, FetchError):
+                logging.error("An error occurred while recovering data. Please try again later")
+            logging.info("Arresting execution")
+            return 1
+        # RESULTS GO TO THE SINK, LOGGING IS KEPT FOR THE DIAGNOSTICS. WITH OUTPUT=log THEY ARE LOGGED AS BEFORE
+        sink = open_sink(options.output, options.output_file)
+        try:
+            emit(options, result, sink, metrics)
+        finally:
+            if sink is not None:
+                sink.close()
+    finally:
+        metrics.write(options.metrics_report, options.metrics_prometheus)
+        metrics.stop()
+    logging.info("metrics: %s", " ".join("%s=%.3fs" % (name, span["seconds"]) for name, span in metrics.spans.items()))
 
-filtered_data_by_device_and_active: List[Result.ResultRights] = filter_result_by_active(filtered_data_by_device)
-if PRINT_FILTER_BY_DEVICE_AND_ACTIVE:
-    print_title_name_medium(filtered_data_by_device_and_active,
-                            "Active rights of TV shows/movies title that can be played on ROKU:")
+    logging.info("End of commands")
+    logging.info("Ending execution")
+    return 0
 
-list_of_active_content_id: List[str] = [result.content_id for result in filter_result_by_active(response_right.results)]
-filtered_endpoints_by_active_and_video_format_and_origin: List[Endpoint] = (
-    filter_result_by_active_data_and_video_format_and_endpoint_origin_level(response_asset.results,
-                                                                            list_of_active_content_id))
-print_endpoints(filtered_endpoints_by_active_and_video_format_and_origin, "Manifests of active endpoints:")
 
-logging.info("End of commands")
-logging.info("Ending execution")
+if __name__ == '__main__':
+    sys.exit(main())
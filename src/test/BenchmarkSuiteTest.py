@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timezone
+
+from src.benchmark.Suite import compare, run
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+
+
+class SyntheticTest(unittest.TestCase):
+
+    def test_seeded(self):
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(generate_rights_payload(50, 7, now=now), generate_rights_payload(50, 7, now=now))
+        self.assertNotEqual(generate_rights_payload(50, 7, now=now), generate_rights_payload(50, 8, now=now))
+        self.assertEqual(generate_assets_payload(50, 7), generate_assets_payload(50, 7))
+
+    def test_cardinalities(self):
+        rights = generate_rights_payload(200, max_devices=1, distinct_terms=3)["results"]
+        self.assertEqual({1}, {result["rights"]["terms"][0]["devices"].__len__() for result in rights})
+        self.assertEqual(3, {(result["rights"]["terms"][0]["startDateTime"],
+                              result["rights"]["terms"][0]["endDateTime"]) for result in rights}.__len__())
+        assets = generate_assets_payload(200, max_assets=1)["results"]
+        self.assertEqual({1}, {result["assets"].__len__() for result in assets})
+        with self.assertRaises(ValueError):
+            generate_rights_payload(1, max_devices=0)
+
+
+class SuiteTest(unittest.TestCase):
+
+    def test_run(self):
+        measures = run(20, repeat=1)
+        self.assertIn("parse_rights", measures)
+        self.assertGreater(measures["parse_rights"]["peak_bytes"], 0)
+
+    def test_compare(self):
+        baseline = {"results": {"1000": {"parse": {"seconds": 0.1, "peak_bytes": 10 ** 6},
+                                         "filter": {"seconds": 0.001, "peak_bytes": 1000}}}}
+        same = {"results": {"1000": {"parse": {"seconds": 0.11, "peak_bytes": 10 ** 6},
+                                     # +100% BUT UNDER THE NOISE FLOOR
+                                     "filter": {"seconds": 0.002, "peak_bytes": 2000}},
+                            "10000": {"parse": {"seconds": 9, "peak_bytes": 10 ** 9}}}}
+        self.assertEqual([], compare(same, baseline, 0.25))
+        slower = {"results": {"1000": {"parse": {"seconds": 0.2, "peak_bytes": 3 * 10 ** 6}}}}
+        regressions = compare(slower, baseline, 0.25)
+        self.assertEqual(2, regressions.__len__())
+        self.assertIn("parse seconds", regressions[0])
+        self.assertEqual([], compare(slower, baseline, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.main import Result
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Result import Endpoint, Asset, Device, Term, Right, ResultAsset, ResultRights, Response
+
+
+def result_rights(content_id: str, active: bool) -> ResultRights:
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(days=1) if active else now + timedelta(days=1)
+    return ResultRights(content_id, None, None, Right(None, [
+        Term(start, now + timedelta(days=2), "GB", [Device("ROKU", "IPSETTOPBOX", "ROKU")])
+    ]))
+
+
+class CatalogIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.response_asset = Response([
+            ResultAsset("1", None, [Asset([Endpoint("level3", "1-hd")], "HD"), Asset([Endpoint("level3", "1-sd")], "SD")]),
+            ResultAsset("2", None, [Asset([Endpoint("level3", "2-hd")], "HD"), Asset([Endpoint("akamai", "2-hd")], "HD")]),
+            ResultAsset("3", None, [Asset(None, "HD"), Asset([], "HD")]),
+        ])
+        self.response_right = Response([result_rights("1", True), result_rights("2", False), result_rights("3", True)])
+        self.index = CatalogIndex(self.response_asset, self.response_right)
+
+    def test_lookup_by_content_id(self):
+        self.assertEqual([self.response_asset.results[1]], self.index.get_assets("2"))
+        self.assertEqual([self.response_right.results[0]], self.index.get_rights("1"))
+        self.assertEqual([], self.index.get_assets("not-existing"))
+
+    def test_endpoints_by_format_and_origin(self):
+        self.assertEqual([Endpoint("level3", "1-hd"), Endpoint("level3", "2-hd")], self.index.endpoints("HD", "level3"))
+        self.assertEqual([Endpoint("akamai", "2-hd")], self.index.endpoints("HD", "akamai"))
+        self.assertEqual([Endpoint("level3", "2-hd")], self.index.endpoints("HD", "level3", ["2"]))
+        self.assertEqual([], self.index.endpoints("UHD", "level3"))
+
+    def test_same_result_of_list_filter(self):
+        content_ids = ["1", "3"]
+        self.assertEqual(
+            Result.filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+                self.response_asset.results, content_ids),
+            self.index.filter_result_by_active_data_and_video_format_and_endpoint_origin_level(content_ids))
+
+    def test_join_with_active_rights(self):
+        # 2 HAS NOT ACTIVE RIGHTS AND 3 HAS NOT ENDPOINTS
+        self.assertEqual([Endpoint("level3", "1-hd")],
+                         self.index.filter_result_by_active_data_and_video_format_and_endpoint_origin_level())
+
+    def test_empty_responses(self):
+        index = CatalogIndex(Response(None), None)
+        self.assertEqual([], index.filter_result_by_active_data_and_video_format_and_endpoint_origin_level())
+        self.assertEqual([], index.filter_result_by_can_be_played_on_ROKU())
+
+
+if __name__ == '__main__':
+    unittest.main()
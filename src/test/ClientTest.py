@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List
+
+from src.main.Client import FeedClient, FetchError
+from src.main.Metrics import Metrics
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    # path -> list of status codes to answer, the last one is repeated
+    statuses: Dict[str, List[int]] = {}
+    calls: Dict[str, int] = {}
+    delay: float = 0.0
+
+    def do_GET(self):
+        calls = FeedHandler.calls.get(self.path, 0)
+        FeedHandler.calls[self.path] = calls + 1
+        statuses = FeedHandler.statuses.get(self.path, [200])
+        status = statuses[min(calls, statuses.__len__() - 1)]
+        time.sleep(FeedHandler.delay)
+        body = b'{"results": []}'
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(body.__len__()))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # THE CLIENT GAVE UP BECAUSE OF ITS DEADLINE
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FeedClientTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        cls.url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FeedHandler.statuses = {}
+        FeedHandler.calls = {}
+        FeedHandler.delay = 0.0
+
+    def test_retry_only_the_failed_feed(self):
+        FeedHandler.statuses = {"/tq": [200], "/vq": [500, 503, 200]}
+        metrics = Metrics()
+        with FeedClient(number_of_iterations=3, backoff_base=0.001, metrics=metrics) as client:
+            responses = client.fetch_all({"tq": self.url + "/tq", "vq": self.url + "/vq"})
+
+        self.assertEqual(200, responses["tq"].status_code)
+        self.assertEqual(200, responses["vq"].status_code)
+        # tq SUCCEEDED AT FIRST ATTEMPT SO IT IS NOT CALLED AGAIN
+        self.assertEqual(1, FeedHandler.calls["/tq"])
+        self.assertEqual(3, FeedHandler.calls["/vq"])
+        self.assertEqual(2, metrics.counters["retries"])
+        self.assertEqual(2 * b'{"results": []}'.__len__(), metrics.counters["bytes_received"])
+
+    def test_raise_when_attempts_are_finished(self):
+        FeedHandler.statuses = {"/vq": [500]}
+        with FeedClient(number_of_iterations=2, backoff_base=0.001) as client:
+            with self.assertRaises(FetchError) as context:
+                client.fetch_all({"tq": self.url + "/tq", "vq": self.url + "/vq"})
+        self.assertEqual("vq", context.exception.name)
+        self.assertEqual(2, FeedHandler.calls["/vq"])
+
+    def test_feeds_are_fetched_concurrently(self):
+        FeedHandler.delay = 0.3
+        with FeedClient() as client:
+            start = time.perf_counter()
+            client.fetch_all({"tq": self.url + "/tq", "vq": self.url + "/vq"})
+            elapsed = time.perf_counter() - start
+        # SERIAL EXECUTION WOULD TAKE AT LEAST 0.6s
+        self.assertLess(elapsed, 0.55)
+
+    def test_request_deadline(self):
+        FeedHandler.delay = 0.5
+        with FeedClient(number_of_iterations=1, timeout=0.1) as client:
+            with self.assertRaises(FetchError):
+                client.fetch(self.url + "/tq")
+
+    def test_backoff_is_bounded(self):
+        client = FeedClient(backoff_base=0.1, backoff_cap=0.5)
+        for attempt in range(1, 10):
+            delay = client.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(0.5, 0.1 * 2 ** (attempt - 1)))
+        client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import dataclasses
+import json
+import unittest
+from datetime import datetime
+
+from src.main.Compact import CompactDecoder, CompactDevice, compact_response_from_dict
+from src.main.Result import Endpoint, Asset, Device, Term, LocalizableInformation, Right, ResultAsset, ResultRights, \
+    ResultType
+
+RESULT_RIGHT_JSON = """
+    {
+        "contentId": "sky-test-id-1",
+        "accessChannel": "itv3",
+        "localizableInformation": [
+            {
+                "locale": "en-GB",
+                "language": "eng",
+                "titleNameMedium": "Agatha Christie's Marple"
+            }
+        ],
+        "rights": {
+            "channel": "itv3.itv.com",
+            "terms": [
+                {
+                    "startDateTime": "2024-05-31T16:48:47.000Z",
+                    "endDateTime": "2024-10-30T22:59:00.000Z",
+                    "territory": "GB",
+                    "devices": [
+                        {
+                            "devicePlatform": "APPLETV",
+                            "deviceType": "IPSETTOPBOX",
+                            "provider": "SKY"
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+"""
+
+
+class CompactTest(unittest.TestCase):
+
+    def test_compact_is_equal_to_plain(self):
+        decoder = CompactDecoder()
+        expected_result_right: ResultRights = ResultRights("sky-test-id-1", "itv3", [
+            LocalizableInformation("en-GB", "eng", "Agatha Christie's Marple")
+        ], Right("itv3.itv.com", [
+            Term(datetime.fromisoformat("2024-05-31T16:48:47.000Z"), datetime.fromisoformat("2024-10-30T22:59:00.000Z"),
+                 "GB", [Device("APPLETV", "IPSETTOPBOX", "SKY")])
+        ]))
+        parsed = decoder.from_dict(json.loads(RESULT_RIGHT_JSON), ResultType.RIGHT)
+        self.assertEqual(expected_result_right, parsed)
+        self.assertEqual(parsed, expected_result_right)
+        self.assertNotEqual(dataclasses.replace(parsed, content_id="other"), expected_result_right)
+
+        expected_result_asset: ResultAsset = ResultAsset("sky-test-id-1", None, [Asset(None, "SD")])
+        parsed = decoder.from_dict({"contentId": "sky-test-id-1", "assets": [{"videoFormat": "SD"}]}, ResultType.ASSET)
+        self.assertEqual(expected_result_asset, parsed)
+
+    def test_compact_is_slotted_and_immutable(self):
+        device = CompactDecoder().device(Device("SAMSUNG", "TV", "SKY"))
+        self.assertFalse(hasattr(device, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            device.provider = "ROKU"
+
+    def test_devices_and_strings_are_shared(self):
+        decoder = CompactDecoder()
+        first = decoder.from_dict(json.loads(RESULT_RIGHT_JSON), ResultType.RIGHT)
+        second = decoder.from_dict(json.loads(RESULT_RIGHT_JSON), ResultType.RIGHT)
+        self.assertIs(first.rights.terms[0].devices[0], second.rights.terms[0].devices[0])
+        self.assertIs(first.rights.terms[0].territory, second.rights.terms[0].territory)
+        self.assertIs(first.rights.terms[0].start_date_time, second.rights.terms[0].start_date_time)
+        self.assertIsInstance(first.rights.terms[0].devices[0], CompactDevice)
+
+    def test_methods_of_plain_models(self):
+        decoder = CompactDecoder()
+        asset = decoder.asset(Asset([Endpoint("level3", "/skyplayer/level3/sky-test-id-1/hd/Manifest")], "HD"))
+        self.assertTrue(asset.is_video_format_HD_and_origin_level3())
+        term = decoder.term(Term(datetime.fromisoformat("2024-05-02T23:00:00.000Z"),
+                                 datetime.fromisoformat("2025-06-14T22:00:00.000Z"), None,
+                                 [Device("XBOX", "CONSOLE", "ROKU")]))
+        self.assertTrue(term.can_be_played_on_ROKU())
+        self.assertFalse(term.can_be_played_on_device("device_platform", "ROKU"))
+
+    def test_validation_is_the_same_of_plain(self):
+        with self.assertRaises(ValueError):
+            compact_response_from_dict({"results": [{}]}, ResultType.RIGHT)
+        self.assertIsNone(compact_response_from_dict({}, ResultType.ASSET).results)
+
+
+if __name__ == '__main__':
+    unittest.main()
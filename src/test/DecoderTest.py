@@ -0,0 +1,91 @@
+import copy
+import json
+import unittest
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Decoder import SCHEMAS, Field, RecordError, compile_decoder, decode_response
+from src.main.Result import Response, ResultType, ResultRights, Term, Endpoint
+from src.main.Stream import iter_results
+
+
+class DecoderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload_right = generate_rights_payload(500, seed=4)
+        self.payload_asset = generate_assets_payload(500, seed=4)
+
+    def test_same_result_of_from_dict(self):
+        for payload, result_type in ((self.payload_right, ResultType.RIGHT), (self.payload_asset, ResultType.ASSET)):
+            self.assertEqual(Response.from_dict(payload, result_type), decode_response(payload, result_type))
+        self.assertEqual(Response(None), decode_response({}, ResultType.RIGHT))
+
+    def test_conversions(self):
+        record = {"contentId": 10, "accessChannel": 7, "localizableInformation": None,
+                  "rights": {"channel": None, "terms": [{"startDateTime": "2023-01-01T00:00:00.000Z",
+                                                         "endDateTime": "2023-01-02T00:00:00+01:00",
+                                                         "devices": []}]}}
+        decoded = compile_decoder(ResultRights)(record)
+        self.assertEqual(ResultRights.from_dict(record), decoded)
+        self.assertEqual("10", decoded.content_id)
+        self.assertEqual("7", decoded.access_channel)
+        self.assertEqual([], decoded.rights.terms[0].devices)
+        self.assertIs(compile_decoder(ResultRights), compile_decoder(ResultRights))
+
+    def test_not_valid_records(self):
+        term = self.payload_right["results"][0]["rights"]["terms"][0]
+        records = {
+            "contentId is required": {"contentId": ""},
+            "terms has to be an array with at most 1 value, found 2": {"contentId": "a",
+                                                                        "rights": {"terms": [term, term]}},
+            "endDateTime is required": {"contentId": "a", "rights": {"terms": [{"startDateTime": "2023-01-01"}]}},
+        }
+        for reason, record in records.items():
+            with self.assertRaises(ValueError):
+                ResultRights.from_dict(record)
+            payload = copy.deepcopy(self.payload_right)
+            payload["results"].insert(3, record)
+            with self.assertRaises(RecordError) as context:
+                decode_response(payload, ResultType.RIGHT)
+            self.assertEqual(3, context.exception.index)
+            self.assertEqual(reason, context.exception.reason)
+            self.assertIs(record, context.exception.record)
+
+    def test_quarantine(self):
+        payload = copy.deepcopy(self.payload_asset)
+        endpoint = {"origin": "level3", "path": "/path"}
+        payload["results"][10] = {"assets": []}
+        payload["results"][20]["assets"] = [{"endpoints": [endpoint, endpoint]}]
+        payload["results"].append("not a record")
+        quarantine = []
+        response = decode_response(payload, ResultType.ASSET, quarantine)
+        self.assertEqual([10, 20, 500], [error.index for error in quarantine])
+        self.assertEqual(498, response.results.__len__())
+        expected = [result for index, result in enumerate(payload["results"]) if index not in (10, 20, 500)]
+        self.assertEqual(Response.from_dict({"results": expected}, ResultType.ASSET), response)
+
+    def test_stream_quarantine(self):
+        payload = copy.deepcopy(self.payload_right)
+        payload["results"][1] = {"contentId": None}
+        text = json.dumps(payload)
+        chunks = [text[start:start + 1000] for start in range(0, text.__len__(), 1000)]
+        with self.assertRaises(RecordError) as context:
+            list(iter_results(chunks, ResultType.RIGHT))
+        self.assertEqual(1, context.exception.index)
+        quarantine = []
+        results = list(iter_results(chunks, ResultType.RIGHT, quarantine))
+        self.assertEqual(499, results.__len__())
+        self.assertEqual([1], [error.index for error in quarantine])
+
+    def test_schema_must_match_the_model(self):
+        schema = SCHEMAS[Endpoint]
+        SCHEMAS[Endpoint] = (Field("path", "path"), Field("origin", "origin"))
+        self.addCleanup(SCHEMAS.__setitem__, Endpoint, schema)
+        compile_decoder.cache_clear()
+        self.addCleanup(compile_decoder.cache_clear)
+        with self.assertRaises(ValueError):
+            compile_decoder(Endpoint)
+        self.assertEqual(4, SCHEMAS[Term].__len__())
+
+
+if __name__ == '__main__':
+    unittest.main()
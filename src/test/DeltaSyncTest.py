@@ -0,0 +1,136 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime
+
+from src.main.DeltaSync import DeltaSync
+from src.main.Result import Endpoint, Response, ResultRights, ResultType
+
+
+def right(content_id: str, start: str, end: str) -> dict:
+    return {"contentId": content_id, "rights": {"terms": [{"startDateTime": start, "endDateTime": end}]}}
+
+
+def asset(content_id: str, video_format: str = "HD", origin: str = "level3") -> dict:
+    return {"contentId": content_id, "assets": [{
+        "endpoints": [{"origin": origin, "path": "/%s/%s/%s" % (origin, content_id, video_format)}],
+        "videoFormat": video_format}]}
+
+
+AT = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+
+
+class DeltaSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.assets = {"results": [asset("1"), asset("2"), asset("3", "SD")]}
+        self.rights = {"results": [
+            right("1", "2024-01-01T00:00:00.000Z", "2024-12-31T00:00:00.000Z"),
+            right("2", "2024-06-01T00:00:00.000Z", "2024-06-30T00:00:00.000Z"),
+            right("3", "2024-01-01T00:00:00.000Z", "2024-12-31T00:00:00.000Z"),
+        ]}
+
+    def test_first_sync_is_a_full_sync(self):
+        result = DeltaSync().sync(self.assets, self.rights, AT)
+        self.assertEqual(6, result.parsed)
+        self.assertEqual({"1", "2", "3"}, result.changes.added)
+        self.assertEqual([Endpoint("level3", "/level3/1/HD"), Endpoint("level3", "/level3/2/HD")], result.endpoints)
+        self.assertEqual(result.endpoints, result.changes.newly_active)
+        self.assertEqual(Response.from_dict(self.assets, ResultType.ASSET), result.response_asset)
+        self.assertEqual(Response.from_dict(self.rights, ResultType.RIGHT), result.response_right)
+
+    def test_only_changed_records_are_parsed(self):
+        sync = DeltaSync()
+        sync.sync(self.assets, self.rights, AT)
+
+        result = sync.sync(copy.deepcopy(self.assets), copy.deepcopy(self.rights), AT)
+        self.assertEqual(0, result.parsed)
+        self.assertEqual([], result.changes.newly_active + result.changes.went_inactive)
+        self.assertEqual(2, result.endpoints.__len__())
+
+        # 2 CHANGES ITS RIGHTS AND BECOMES INACTIVE, 3 BECOMES HD, 4 IS ADDED, 1 IS REMOVED
+        assets = {"results": [asset("2"), asset("3"), asset("4")]}
+        rights = {"results": [
+            right("2", "2023-06-01T00:00:00.000Z", "2023-06-30T00:00:00.000Z"),
+            right("3", "2024-01-01T00:00:00.000Z", "2024-12-31T00:00:00.000Z"),
+            right("4", "2024-01-01T00:00:00.000Z", "2024-12-31T00:00:00.000Z"),
+        ]}
+        result = sync.sync(assets, rights, AT)
+        self.assertEqual(4, result.parsed)
+        self.assertEqual({"4"}, result.changes.added)
+        self.assertEqual({"2", "3"}, result.changes.changed)
+        self.assertEqual({"1"}, result.changes.removed)
+        self.assertEqual([Endpoint("level3", "/level3/3/HD"), Endpoint("level3", "/level3/4/HD")], result.endpoints)
+        self.assertCountEqual(result.endpoints, result.changes.newly_active)
+        self.assertCountEqual([Endpoint("level3", "/level3/1/HD"), Endpoint("level3", "/level3/2/HD")],
+                              result.changes.went_inactive)
+
+    def test_rights_that_expire_without_changes(self):
+        sync = DeltaSync()
+        sync.sync(self.assets, self.rights, AT)
+        result = sync.sync(self.assets, self.rights, datetime.fromisoformat("2024-07-01T00:00:00.000Z"))
+        self.assertEqual(0, result.parsed)
+        self.assertEqual([Endpoint("level3", "/level3/2/HD")], result.changes.went_inactive)
+        self.assertEqual([Endpoint("level3", "/level3/1/HD")], result.endpoints)
+
+        # THE END DATE IS INCLUDED, THE RIGHT EXPIRES JUST AFTER
+        sync = DeltaSync()
+        sync.sync(self.assets, self.rights, AT)
+        result = sync.sync(self.assets, self.rights, datetime.fromisoformat("2024-06-30T00:00:00.000Z"))
+        self.assertEqual([], result.changes.went_inactive)
+
+    def test_one_boundary_for_every_content_id(self):
+        sync = DeltaSync()
+        sync.sync(self.assets, self.rights, AT)
+        self.assertEqual(3, sync.state.boundaries.__len__())
+        # 2 CHANGES ITS END DATE AT EVERY SYNC, ITS OLD BOUNDARY IS DROPPED
+        for day in range(20, 30):
+            rights = copy.deepcopy(self.rights)
+            rights["results"][1]["rights"]["terms"][0]["endDateTime"] = "2024-06-%02dT00:00:00.000Z" % day
+            sync.sync(self.assets, rights, AT)
+            self.assertLessEqual(sync.state.boundaries.__len__(), 6)
+        self.assertEqual(datetime.fromisoformat("2024-06-29T00:00:00.000001Z"), sync.state.next_boundaries["2"])
+        sync.state.compact()
+        self.assertEqual(3, sync.state.boundaries.__len__())
+        result = sync.sync(self.assets, rights, datetime.fromisoformat("2024-07-01T00:00:00.000Z"))
+        self.assertEqual([Endpoint("level3", "/level3/2/HD")], result.changes.went_inactive)
+
+    def test_state_is_saved_between_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.pickle")
+            sync = DeltaSync(path)
+            sync.sync(self.assets, self.rights, AT)
+            sync.state.boundaries.append((AT, "outdated"))
+            sync.save()
+            self.assertEqual(3, sync.state.boundaries.__len__())
+
+            result = DeltaSync(path).sync(self.assets, self.rights, AT)
+            self.assertEqual(0, result.parsed)
+            self.assertEqual(2, result.endpoints.__len__())
+
+    def test_raw_bodies(self):
+        sync = DeltaSync()
+        body_asset, body_right = json.dumps(self.assets).encode(), json.dumps(self.rights).encode()
+        result = sync.sync(body_asset, body_right, AT)
+        self.assertEqual(6, result.parsed)
+        self.assertEqual(Response.from_dict(self.rights, ResultType.RIGHT), result.response_right)
+        self.assertEqual(0, sync.sync(body_asset, body_right, AT).parsed)
+
+        # ONLY THE RECORD THAT CHANGED IN THE BODY IS PARSED AGAIN
+        body_right = body_right.replace(b"2024-06-30T00:00:00.000Z", b"2024-06-10T00:00:00.000Z")
+        with mock.patch.object(ResultRights, "from_dict", wraps=ResultRights.from_dict) as from_dict:
+            result = sync.sync(body_asset, body_right, AT)
+        self.assertEqual(1, from_dict.call_count)
+        self.assertEqual({"2"}, result.changes.changed)
+        self.assertEqual([Endpoint("level3", "/level3/2/HD")], result.changes.went_inactive)
+
+    def test_invalid_record(self):
+        with self.assertRaises(ValueError):
+            DeltaSync().sync({"results": [{"assets": []}]}, self.rights, AT)
+
+
+if __name__ == '__main__':
+    unittest.main()
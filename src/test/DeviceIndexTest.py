@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime
+
+from src.main import Result
+from src.main.DeviceIndex import DeviceIndex
+from src.main.Result import Device, Term, Right, ResultRights
+
+
+def result_rights(content_id: str, devices) -> ResultRights:
+    return ResultRights(content_id, None, None, Right(None, [
+        Term(datetime.fromisoformat("2024-05-02T23:00:00.000Z"), datetime.fromisoformat("2025-06-14T22:00:00.000Z"),
+             None, devices)
+    ]))
+
+
+class DeviceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = [
+            result_rights("1", [Device("ROKU", "IPSETTOPBOX", "ROKU"), Device("SAMSUNG", "TV", "SKY")]),
+            result_rights("2", [Device("SAMSUNG", "TV", "SKY")]),
+            result_rights("3", [Device("XBOX", "CONSOLE", "NOWTV"), Device("IOS", "MOBILE", "SKY")]),
+            result_rights("4", None),
+            ResultRights("5", None, None, None),
+        ]
+        self.index = DeviceIndex(self.results)
+
+    def content_ids(self, results):
+        return [result.content_id for result in results]
+
+    def test_playable_on(self):
+        self.assertEqual(["1"], self.content_ids(self.index.playable_on("provider", "ROKU")))
+        self.assertEqual(["1", "2", "3"], self.content_ids(self.index.playable_on("provider", "SKY")))
+        self.assertEqual(["3"], self.content_ids(self.index.playable_on("device_type", "CONSOLE")))
+        self.assertEqual([], self.index.playable_on("device_platform", "LG"))
+
+    def test_same_result_of_can_be_played_on_ROKU(self):
+        expected = Result.filter_result_by_can_be_played_on_ROKU(self.results[:4])
+        self.assertEqual(expected, self.index.playable_on("provider", "ROKU"))
+
+    def test_playable_on_all_and_any(self):
+        self.assertEqual(["1", "2"], self.content_ids(
+            self.index.playable_on_all([("provider", "SKY"), ("device_type", "TV")])))
+        self.assertEqual(["3"], self.content_ids(
+            self.index.playable_on_all([("device_platform", "XBOX"), ("device_platform", "IOS")])))
+        self.assertEqual([], self.index.playable_on_all([("provider", "ROKU"), ("provider", "NOWTV")]))
+        self.assertEqual([], self.index.playable_on_all([]))
+        self.assertEqual(["1", "3"], self.content_ids(
+            self.index.playable_on_any([("provider", "ROKU"), ("provider", "NOWTV")])))
+
+    def test_count_by_value(self):
+        self.assertEqual({"ROKU": 1, "SKY": 3, "NOWTV": 1}, self.index.count_by_value("provider"))
+        self.assertEqual(["ROKU", "SKY", "NOWTV"], self.index.values("provider"))
+
+    def test_not_existing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.index.playable_on("not_existing_device_attribute", "no")
+
+    def test_positions_of_bitmap(self):
+        self.assertEqual([], self.index.positions(0))
+        self.assertEqual([0, 3, 64, 1000], self.index.positions((1 << 0) | (1 << 3) | (1 << 64) | (1 << 1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
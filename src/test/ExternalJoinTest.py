@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.ExternalJoin import ExternalSorter, ExternalEndpointJoin, external_join_endpoints, MAX_FAN_IN
+from src.main.Result import Response, ResultType, ResultAsset, ResultRights, Asset, Endpoint, Right, Term, \
+    filter_result_by_active, filter_result_by_active_data_and_video_format_and_endpoint_origin_level
+from src.main.Stream import iter_results
+
+
+class ExternalSorterTest(unittest.TestCase):
+
+    def test_sort_with_runs(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        sorter = ExternalSorter(directory.name, key=lambda item: item[1], memory_limit=4096)
+        items = [("id-%d" % (index * 7919 % 1000), index * 7919 % 1000) for index in range(1000)]
+        for item in items:
+            sorter.add(item)
+        self.assertGreater(sorter.runs.__len__(), 1)
+        self.assertEqual(sorted(items, key=lambda item: item[1]), list(sorter))
+
+    def test_merge_in_passes(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # ONE RUN EVERY FEW ITEMS, MORE RUNS THAN MAX_FAN_IN: THEY ARE MERGED IN PASSES WITH FEW OPEN FILES
+        sorter = ExternalSorter(directory.name, key=lambda item: item[0], memory_limit=512)
+        items = [(index * 7919 % 1000, index) for index in range(1000)] + [(0, 1000)]
+        for item in items:
+            sorter.add(item)
+        self.assertGreater(sorter.runs.__len__(), MAX_FAN_IN)
+        read, reading, most = ExternalSorter._read, set(), []
+
+        def counted(path):
+            reading.add(path)
+            most.append(reading.__len__())
+            yield from read(path)
+            reading.discard(path)
+
+        with mock.patch.object(ExternalSorter, "_read", staticmethod(counted)):
+            self.assertEqual(sorted(items, key=lambda item: item[0]), list(sorter))
+        self.assertLessEqual(max(most), MAX_FAN_IN)
+        self.assertLessEqual(sorter.runs.__len__(), MAX_FAN_IN)
+        self.assertEqual(sorted(sorter.runs), sorted(os.path.join(directory.name, name)
+                                                     for name in os.listdir(directory.name)))
+        # A SECOND ITERATION READS THE MERGED RUNS
+        self.assertEqual(sorted(items, key=lambda item: item[0]), list(sorter))
+
+    def test_sort_in_memory(self):
+        sorter = ExternalSorter(tempfile.gettempdir())
+        for item in [("b",), ("a",), ("c",)]:
+            sorter.add(item)
+        self.assertEqual([("a",), ("b",), ("c",)], list(sorter))
+        self.assertEqual([], sorter.runs)
+
+
+class ExternalEndpointJoinTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload_asset = generate_assets_payload(2000, seed=1)
+        self.payload_right = generate_rights_payload(2000, seed=1)
+        # SOME content_id ARE DUPLICATED AND THE ORDER OF THE FEEDS IS NOT THE ORDER OF content_id
+        self.payload_right["results"] = self.payload_right["results"][::-1] + self.payload_right["results"][:50]
+        self.at = datetime.now(timezone.utc)
+
+    def expected(self):
+        response_asset = Response.from_dict(self.payload_asset, ResultType.ASSET)
+        response_right = Response.from_dict(self.payload_right, ResultType.RIGHT)
+        active = [result.content_id for result in filter_result_by_active(response_right.results)]
+        return filter_result_by_active_data_and_video_format_and_endpoint_origin_level(response_asset.results,
+                                                                                       active)
+
+    def test_same_result_of_the_in_memory_join(self):
+        expected = self.expected()
+        self.assertTrue(expected)
+        for memory_limit in (2 ** 12, 2 ** 26):
+            self.assertEqual(expected, external_join_endpoints(
+                Response.from_dict(self.payload_asset, ResultType.ASSET).results,
+                Response.from_dict(self.payload_right, ResultType.RIGHT).results, at=self.at,
+                memory_limit=memory_limit))
+
+    def test_streamed_feeds_and_cleanup(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with ExternalEndpointJoin(at=self.at, memory_limit=2 ** 12, directory=directory.name) as join:
+            for result in iter_results([json.dumps(self.payload_right)], ResultType.RIGHT):
+                join.add_rights(result)
+            for result in iter_results([json.dumps(self.payload_asset)], ResultType.ASSET):
+                join.add_assets(result)
+            self.assertGreater(os.listdir(join.directory).__len__(), 2)
+            unordered = list(join.endpoints(feed_order=False))
+            ordered = list(join.endpoints())
+        self.assertEqual(self.expected(), ordered)
+        self.assertEqual(sorted(ordered, key=lambda endpoint: endpoint.path),
+                         sorted(unordered, key=lambda endpoint: endpoint.path))
+        self.assertEqual([], os.listdir(directory.name))
+
+
+    def test_memory_limit_shared_with_the_feed_order(self):
+        # EVERY RIGHT IS ACTIVE AND EVERY ASSET IS HD/level3: THE TWO SIDES AND THE SORT IN FEED ORDER ARE ALL BIG
+        term = Term(self.at - timedelta(days=1), self.at + timedelta(days=1), None, None)
+        rights = [ResultRights("content-%05d" % index, None, None, Right(None, [term])) for index in range(5000)]
+        assets = [ResultAsset("content-%05d" % (index * 7919 % 5000), None,
+                              [Asset([Endpoint("level3", "/%05d/hd/manifest.mpd" % index)], "HD")])
+                  for index in range(5000)]
+        memory_limit = 2 ** 20
+        tracemalloc.start()
+        try:
+            with ExternalEndpointJoin(at=self.at, memory_limit=memory_limit) as join:
+                for result in rights:
+                    join.add_rights(result)
+                for result in assets:
+                    join.add_assets(result)
+                self.assertEqual(5000, sum(1 for _ in join.endpoints()))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, memory_limit)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List
+
+from src.main.Client import FeedClient, FetchError
+from src.main.HttpCache import ResponseCache, CACHE_STATUS_HEADER
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    body: bytes = b'{"results": []}'
+    etag: str = '"v1"'
+    fail: bool = False
+    # STATUS CODES ANSWERED TO THE CLIENT, IN ORDER
+    answered: List[int] = []
+
+    def do_GET(self):
+        if ETagHandler.fail:
+            status = 503
+        elif self.headers.get("If-None-Match") == ETagHandler.etag:
+            status = 304
+        else:
+            status = 200
+        ETagHandler.answered.append(status)
+        self.send_response(status)
+        if status == 200:
+            self.send_header("ETag", ETagHandler.etag)
+            self.send_header("Content-Length", str(ETagHandler.body.__len__()))
+            self.end_headers()
+            self.wfile.write(ETagHandler.body)
+        else:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+        cls.url = "http://127.0.0.1:%d/vq" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        ETagHandler.body = b'{"results": []}'
+        ETagHandler.etag = '"v1"'
+        ETagHandler.fail = False
+        ETagHandler.answered = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def client(self, ttl: float = 0, offline: bool = False) -> FeedClient:
+        return FeedClient(number_of_iterations=2, backoff_base=0.001,
+                          cache=ResponseCache(self.directory.name, ttl=ttl), offline=offline)
+
+    def test_not_modified_is_a_cache_hit(self):
+        with self.client() as client:
+            first = client.fetch(self.url)
+            second = client.fetch(self.url)
+        self.assertEqual([200, 304], ETagHandler.answered)
+        self.assertIsNone(first.headers.get(CACHE_STATUS_HEADER))
+        self.assertEqual("REVALIDATED", second.headers.get(CACHE_STATUS_HEADER))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual({"results": []}, second.json())
+
+    def test_revalidation_rewrites_only_the_metadata(self):
+        with self.client() as client:
+            client.fetch(self.url)
+            paths = {name[-4:]: os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name)}
+            inodes = {extension: os.stat(path).st_ino for extension, path in paths.items()}
+            stored_at = client.cache.get(self.url).stored_at
+            time.sleep(0.01)
+            client.fetch(self.url)
+            self.assertEqual(inodes["body"], os.stat(paths["body"]).st_ino)
+            self.assertNotEqual(inodes["json"], os.stat(paths["json"]).st_ino)
+            self.assertGreater(client.cache.get(self.url).stored_at, stored_at)
+
+    def test_modified_body_is_downloaded_again(self):
+        with self.client() as client:
+            client.fetch(self.url)
+            ETagHandler.body = b'{"results": [{"contentId": "1"}]}'
+            ETagHandler.etag = '"v2"'
+            second = client.fetch(self.url)
+        self.assertEqual([200, 200], ETagHandler.answered)
+        self.assertEqual(ETagHandler.body, second.content)
+
+    def test_fresh_response_within_ttl(self):
+        with self.client(ttl=60) as client:
+            client.fetch(self.url)
+            second = client.fetch(self.url)
+        self.assertEqual([200], ETagHandler.answered)
+        self.assertEqual("HIT", second.headers.get(CACHE_STATUS_HEADER))
+        self.assertEqual(ETagHandler.body, b"".join(second.iter_content(chunk_size=4)))
+
+    def test_offline_mode(self):
+        with self.client(offline=True) as client:
+            client.fetch(self.url)
+            ETagHandler.fail = True
+            stale = client.fetch(self.url)
+        self.assertEqual("STALE", stale.headers.get(CACHE_STATUS_HEADER))
+        self.assertEqual(ETagHandler.body, stale.content)
+
+        # WITHOUT OFFLINE MODE THE ERROR IS RAISED
+        with self.client(offline=False) as client:
+            with self.assertRaises(FetchError):
+                client.fetch(self.url)
+
+    def test_eviction_of_least_recently_used(self):
+        cache = ResponseCache(self.directory.name, max_size=30)
+        with self.client() as client:
+            client.cache = cache
+            client.fetch(self.url + "?page=1")
+            time.sleep(0.01)
+            client.fetch(self.url + "?page=2")
+            time.sleep(0.01)
+            # EVERY BODY IS 15 BYTES, THE THIRD ONE REMOVES THE FIRST
+            client.fetch(self.url + "?page=3")
+        self.assertIsNone(cache.get(self.url + "?page=1"))
+        self.assertIsNotNone(cache.get(self.url + "?page=3"))
+        self.assertLessEqual(cache.size(), 30)
+
+    def test_body_bigger_than_the_cache_is_not_stored(self):
+        cache = ResponseCache(self.directory.name, max_size=20)
+        with self.client() as client:
+            client.cache = cache
+            client.fetch(self.url + "?page=1")
+            ETagHandler.body = b'{"results": [{"contentId": "1"}]}'
+            with self.assertLogs(level="WARNING"):
+                response = client.fetch(self.url + "?page=2")
+        self.assertEqual(ETagHandler.body, response.content)
+        self.assertIsNone(cache.get(self.url + "?page=2"))
+        # THE ENTRIES ALREADY IN CACHE ARE KEPT
+        self.assertIsNotNone(cache.get(self.url + "?page=1"))
+
+    def test_corrupted_entry_is_ignored(self):
+        cache = ResponseCache(self.directory.name)
+        with self.client() as client:
+            client.fetch(self.url)
+        for name in os.listdir(self.directory.name):
+            if name.endswith(".body"):
+                with open(os.path.join(self.directory.name, name), "wb") as file:
+                    file.write(b"{")
+        self.assertIsNone(cache.get(self.url))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import pickle
+import unittest
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Lazy import lazy_response_from_dict, LazyResultRights
+from src.main.Pipeline import Options, parse, select
+from src.main.Result import Response, ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active
+
+
+class LazyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = generate_rights_payload(200)
+
+    def test_equal_to_plain_models(self):
+        plain = Response.from_dict(self.payload, ResultType.RIGHT)
+        lazy = lazy_response_from_dict(self.payload, ResultType.RIGHT)
+        self.assertEqual(plain.results, lazy.results)
+        self.assertEqual(lazy.results, plain.results)
+        self.assertEqual(filter_result_by_can_be_played_on_ROKU(plain.results),
+                         filter_result_by_can_be_played_on_ROKU(lazy.results))
+        self.assertEqual(filter_result_by_active(plain.results), filter_result_by_active(lazy.results))
+        with self.assertRaises(AttributeError):
+            lazy.results[0].rights.terms[0].can_be_played_on_device("not_existing", "ROKU")
+
+    def test_fields_decoded_on_access(self):
+        result = lazy_response_from_dict(self.payload, ResultType.RIGHT).results[0]
+        self.assertEqual({"_raw", "content_id"}, set(result.__dict__))
+        result.rights.terms[0].can_be_played_on_ROKU()
+        # THE DEVICE FILTER DOES NOT DECODE THE DATES NOR THE TITLES
+        self.assertNotIn("localizable_information", result.__dict__)
+        self.assertNotIn("_dates", result.rights.terms[0].__dict__)
+        self.assertNotIn("devices", result.rights.terms[0].__dict__)
+        self.assertIs(result.rights.terms[0].devices, result.rights.terms[0].devices)
+
+    def test_select_without_indexes(self):
+        payload_asset = generate_assets_payload(500)
+        payload_right = generate_rights_payload(500)
+        expected = select(Options(), parse(Options(), payload_asset, payload_right))
+        result = select(Options(lazy=True), parse(Options(lazy=True), payload_asset, payload_right))
+        self.assertEqual(expected.endpoints, result.endpoints)
+        # THE RIGHTS REJECTED BY THE ROKU FILTER AND WITHOUT AN HD/level3 ENDPOINT ARE NOT DECODED AT ALL
+        playable = {right.content_id for right in result.filtered_by_device}
+        with_endpoint = {asset.content_id for asset in result.response_asset.results
+                         if any(elem.is_video_format_HD_and_origin_level3() for elem in (asset.assets or []))}
+        rejected = [right for right in result.response_right.results
+                    if right.content_id not in playable and right.content_id not in with_endpoint]
+        self.assertTrue(rejected)
+        for right in result.response_right.results:
+            self.assertNotIn("localizable_information", right.__dict__)
+            self.assertNotIn("devices", right.rights.terms[0].__dict__)
+        self.assertEqual([], [right.content_id for right in rejected if "_dates" in right.rights.terms[0].__dict__])
+        # COMPARED WITH THE PLAIN MODELS ONLY AT THE END, THE COMPARISON DECODES EVERY FIELD
+        self.assertEqual(expected.filtered_by_device, result.filtered_by_device)
+        self.assertEqual(expected.filtered_by_device_and_active, result.filtered_by_device_and_active)
+
+    def test_assertions(self):
+        self.payload["results"][3]["rights"]["terms"][0]["endDateTime"] = None
+        response = lazy_response_from_dict(self.payload, ResultType.RIGHT)
+        # THE NOT VALID TERM RAISES ONLY WHEN ITS DATES ARE READ
+        response.results[3].rights.terms[0].can_be_played_on_ROKU()
+        with self.assertRaises(ValueError):
+            response.results[3].rights.terms[0].is_active()
+        with self.assertRaises(ValueError):
+            lazy_response_from_dict(self.payload, ResultType.RIGHT, validate=True)
+        with self.assertRaises(ValueError):
+            LazyResultRights({"contentId": ""})
+
+    def test_pickle(self):
+        results = lazy_response_from_dict(self.payload, ResultType.RIGHT).results
+        results[0].rights.terms[0].is_active()
+        self.assertEqual(results, pickle.loads(pickle.dumps(results)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.main.Metrics import Metrics, COUNTERS
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_spans_and_counters(self):
+        metrics = Metrics()
+        for _ in range(2):
+            with metrics.span("parse"):
+                pass
+        with self.assertRaises(ValueError):
+            with metrics.span("filter"):
+                raise ValueError("not valid")
+        threads = [threading.Thread(target=lambda: [metrics.increment("bytes_received", 10) for _ in range(100)])
+                   for _ in range(4)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        report = metrics.report()
+        self.assertEqual(2, report["spans"]["parse"]["count"])
+        # A SPAN THAT RAISES IS MEASURED TOO
+        self.assertEqual(1, report["spans"]["filter"]["count"])
+        self.assertEqual(4000, report["counters"]["bytes_received"])
+        self.assertEqual(set(COUNTERS), set(report["counters"]))
+        self.assertNotIn("peak_bytes", report["spans"]["parse"])
+
+    def test_trace_memory(self):
+        metrics = Metrics(trace_memory=True)
+        self.addCleanup(metrics.stop)
+        with metrics.span("parse"):
+            data = [object() for _ in range(10000)]
+        self.assertGreater(metrics.spans["parse"]["peak_bytes"], 10000 * 16)
+        self.assertIn('catalog_stage_peak_memory_bytes{stage="parse"}', metrics.to_prometheus())
+        del data
+
+    def test_prometheus(self):
+        metrics = Metrics()
+        with metrics.span("fetch"):
+            metrics.increment("retries", 2)
+        lines = metrics.to_prometheus("sky").splitlines()
+        self.assertIn("# TYPE sky_retries_total counter", lines)
+        self.assertIn("sky_retries_total 2.0", lines)
+        self.assertTrue(any(line.startswith('sky_stage_duration_seconds{stage="fetch"} ') for line in lines))
+        for line in lines:
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+    def test_write(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        metrics = Metrics()
+        metrics.increment("records_parsed", 5)
+        json_path, prometheus_path = os.path.join(directory.name, "run.json"), os.path.join(directory.name, "run.prom")
+        metrics.write(json_path, prometheus_path)
+        with open(json_path, encoding="utf-8") as file:
+            self.assertEqual(5, json.load(file)["counters"]["records_parsed"])
+        self.assertTrue(os.path.exists(prometheus_path))
+        self.assertEqual(["run.json", "run.prom"], sorted(os.listdir(directory.name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.main.Output import open_sink, write_endpoints, write_title_name_medium, OutputSink, TextSink, JsonLinesSink, \
+    CsvSink
+from src.main.Result import Endpoint, ResultRights, LocalizableInformation
+
+ENDPOINTS = [Endpoint("level3", "/1/hd"), Endpoint("level3", None), Endpoint("akamai", "/2, \"quoted\"")]
+RIGHTS = [ResultRights("1", None, [LocalizableInformation("en-GB", "eng", "Title 1")], None),
+          ResultRights("2", None, None, None)]
+
+
+class OutputTest(unittest.TestCase):
+
+    def test_text(self):
+        stream = io.StringIO()
+        with TextSink(stream) as sink:
+            write_endpoints(sink, ENDPOINTS, "Manifests:")
+            write_title_name_medium(sink, RIGHTS)
+        self.assertEqual("Manifests:\n/1/hd\n\n/2, \"quoted\"\nTitle 1\n\n", stream.getvalue())
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        with JsonLinesSink(stream) as sink:
+            write_title_name_medium(sink, RIGHTS, "Titles:")
+        self.assertEqual([{"section": "Titles:", "content_id": "1", "title": "Title 1"},
+                          {"section": "Titles:", "content_id": "2", "title": None}],
+                         [json.loads(line) for line in stream.getvalue().splitlines()])
+
+    def test_csv(self):
+        stream = io.StringIO()
+        with CsvSink(stream) as sink:
+            write_endpoints(sink, ENDPOINTS, "Manifests:")
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(["/1/hd", "", "/2, \"quoted\""], [row["path"] for row in rows])
+        self.assertEqual({"Manifests:"}, {row["section"] for row in rows})
+
+    def test_batches(self):
+        stream = io.StringIO()
+        sink = TextSink(stream, batch_size=2)
+        write_endpoints(sink, ENDPOINTS)
+        # THE THIRD LINE IS STILL IN THE BUFFER
+        self.assertEqual(2, stream.getvalue().count("\n"))
+        sink.close()
+        self.assertEqual(3, sink.written)
+
+    def test_open_sink(self):
+        self.assertIsNone(open_sink("log"))
+        # A SINK WITHOUT A FORMAT CANNOT BE CREATED
+        with self.assertRaises(TypeError):
+            OutputSink(io.StringIO())
+        with self.assertRaises(ValueError):
+            open_sink("xml")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "out.jsonl")
+        with open_sink("jsonl", path) as sink:
+            write_endpoints(sink, ENDPOINTS[:1])
+        self.assertTrue(sink.stream.closed)
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual("/1/hd", json.loads(file.readline())["path"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.ParallelParse import parallel_response_from_dict, RecordError
+from src.main.Result import Response, ResultType
+
+
+class ParallelParseTest(unittest.TestCase):
+
+    def test_same_result_of_from_dict(self):
+        for payload, result_type in [(generate_rights_payload(300), ResultType.RIGHT),
+                                     (generate_assets_payload(300), ResultType.ASSET)]:
+            expected = Response.from_dict(payload, result_type)
+            self.assertEqual(expected, parallel_response_from_dict(payload, result_type, workers=1))
+            self.assertEqual(expected, parallel_response_from_dict(payload, result_type, workers=2, chunk_size=7))
+
+    def test_first_error_with_index(self):
+        payload = generate_assets_payload(100)
+        payload["results"][37] = {"assets": []}
+        payload["results"][80] = {}
+        for workers in (1, 2):
+            with self.assertRaises(RecordError) as context:
+                parallel_response_from_dict(payload, ResultType.ASSET, workers=workers, chunk_size=10)
+            self.assertEqual(37, context.exception.index)
+            self.assertIsInstance(context.exception, ValueError)
+
+    def test_no_results(self):
+        self.assertEqual(Response(None), parallel_response_from_dict({}, ResultType.RIGHT, workers=2))
+        self.assertEqual(Response([]), parallel_response_from_dict({"results": []}, ResultType.RIGHT, workers=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest import mock
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main import Config
+from src.main.Decoder import RecordError
+from src.main.Metrics import Metrics
+from src.main.Output import open_sink
+from src.main.Pipeline import Options, PipelineResult, run, emit
+from src.main.Result import Response, ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active, \
+    filter_result_by_active_data_and_video_format_and_endpoint_origin_level
+from src.main.main import main
+
+BODIES = {"/tq": json.dumps(generate_assets_payload(300, seed=3)).encode(),
+          "/vq": json.dumps(generate_rights_payload(300, seed=3)).encode()}
+# THE SAME RIGHTS WITH A RECORD WITHOUT contentId
+BODIES["/vq-bad"] = BODIES["/vq"].replace(b'"results": [', b'"results": [{"contentId": null}, ', 1)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = BODIES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(body.__len__()))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OptionsTest(unittest.TestCase):
+
+    def test_from_args(self):
+        options = Options.from_args(["NUMBER_OF_ITERATIONS=5", "OUTPUT=JSONL", "COMPACT=true", "CACHE_TTL=1.5",
+                                     "URLS_ASSET=a,,b", "CONTENT_ID=id-1,id-2", "PRINT_FILTER_BY_DEVICE=True", "x"])
+        self.assertEqual(5, options.number_of_iterations)
+        self.assertEqual("jsonl", options.output)
+        self.assertTrue(options.compact)
+        self.assertEqual(1.5, options.cache_ttl)
+        self.assertEqual(["a", "b"], options.urls_asset)
+        self.assertEqual(["id-1", "id-2"], options.content_id)
+        self.assertTrue(options.print_filter_by_device)
+        self.assertFalse(options.print_filter_by_device_and_active)
+        self.assertFalse(Options.from_args(["PRINT_FILTER_BY_DEVICE=false"]).print_filter_by_device)
+
+    def test_invalid_values_fall_back_to_default(self):
+        with self.assertLogs(level="WARNING"):
+            options = Options.from_args(["NUMBER_OF_ITERATIONS=x", "OUTPUT=xml", "JOIN_MEMORY_LIMIT=big"])
+        self.assertEqual(3, options.number_of_iterations)
+        self.assertEqual("log", options.output)
+        self.assertIsNone(options.join_memory_limit)
+
+    def test_incompatible_options(self):
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(Options(join_memory_limit=2 ** 20).stream)
+            self.assertIsNone(Options(stream=True, snapshot="catalog.snapshot").snapshot)
+            self.assertFalse(Options(stream=True, urls_right=["a"]).stream)
+            self.assertFalse(Options(stream=True, cache_dir="cache").stream)
+            self.assertIsNone(Options(join_memory_limit=2 ** 20, cache_dir="cache").join_memory_limit)
+            options = Options(from_snapshot="catalog.snapshot", stream=True, urls_asset=["a"])
+        self.assertFalse(options.stream)
+        self.assertFalse(options.sharded)
+
+
+class PipelineTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        for name, value in (("URL_ASSET", url + "/tq"), ("URL_RIGHT", url + "/vq")):
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # main CONFIGURES THE ROOT LOGGER, THE TESTS KEEP THE ONE OF unittest
+        patcher = mock.patch("logging.basicConfig")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        result_asset = Response.from_dict(json.loads(BODIES["/tq"]), ResultType.ASSET).results
+        result_right = Response.from_dict(json.loads(BODIES["/vq"]), ResultType.RIGHT).results
+        self.filtered_by_device = filter_result_by_can_be_played_on_ROKU(result_right)
+        self.endpoints = filter_result_by_active_data_and_video_format_and_endpoint_origin_level(
+            result_asset, [result.content_id for result in filter_result_by_active(result_right)])
+
+    def test_run_in_process(self):
+        for options in (Options(), Options(stream=True), Options(compact=True), Options(lazy=True)):
+            result = run(options)
+            self.assertEqual(self.endpoints, result.endpoints)
+            self.assertEqual([result.content_id for result in self.filtered_by_device],
+                             [result.content_id for result in result.filtered_by_device])
+            self.assertEqual(300, result.number_of_rights)
+        self.assertTrue(self.endpoints)
+
+    def test_snapshot_and_query(self):
+        path = os.path.join(self.directory, "catalog.snapshot")
+        run(Options(snapshot=path))
+        self.assertEqual(self.endpoints, run(Options(from_snapshot=path)).endpoints)
+        content_id = [endpoint.path.split("/")[3] for endpoint in self.endpoints[:3]]
+        result = run(Options(from_snapshot=path, content_id=content_id))
+        self.assertEqual(self.endpoints[:3], result.endpoints)
+        self.assertEqual(result.endpoints, run(Options(content_id=content_id)).endpoints)
+
+    def test_emit(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(0, main(["OUTPUT=text", "PRINT_FILTER_BY_DEVICE=True"]))
+        lines = output.getvalue().splitlines()
+        self.assertEqual("TV shows/movies title that can be played on ROKU:", lines[0])
+        self.assertEqual([endpoint.path for endpoint in self.endpoints], lines[-self.endpoints.__len__():])
+        with self.assertLogs(level="INFO") as logs:
+            emit(Options(), PipelineResult())
+        self.assertIn("Manifests of active endpoints:", logs.output[0])
+
+    def test_delta(self):
+        path = os.path.join(self.directory, "delta.state")
+        expected = filter_result_by_active(self.filtered_by_device)
+        with mock.patch("src.main.CatalogIndex.CatalogIndex") as catalog_index:
+            for _ in range(2):
+                with self.assertLogs(level="INFO"):
+                    result = run(Options(delta_state=path))
+                self.assertEqual(self.endpoints, result.endpoints)
+                self.assertEqual([result.content_id for result in self.filtered_by_device],
+                                 [result.content_id for result in result.filtered_by_device])
+                self.assertEqual([result.content_id for result in expected],
+                                 [result.content_id for result in result.filtered_by_device_and_active])
+            # THE ENDPOINTS AND THE ACTIVE SET ARE THE ONES OF THE SYNC, THE CATALOG IS NOT INDEXED AGAIN
+            catalog_index.assert_not_called()
+            self.assertEqual(0, result.delta_result.parsed)
+            content_id = [endpoint.path.split("/")[3] for endpoint in self.endpoints[:3]]
+            with self.assertLogs(level="INFO"):
+                self.assertEqual(self.endpoints[:3], run(Options(delta_state=path, content_id=content_id)).endpoints)
+
+    def test_join_memory_limit(self):
+        expected = filter_result_by_active(self.filtered_by_device)
+        metrics = Metrics()
+        with self.assertLogs(level="WARNING"):
+            result = run(Options(join_memory_limit=2 ** 12), metrics)
+        self.assertEqual(self.endpoints, result.endpoints)
+        # WITHOUT THE PRINT OPTIONS THE RIGHTS ARE NOT KEPT, ONLY COUNTED
+        self.assertEqual(([], []), (result.filtered_by_device, result.filtered_by_device_and_active))
+        self.assertEqual(300 - expected.__len__(), metrics.counters["records_rejected"])
+        with self.assertLogs(level="WARNING"):
+            result = run(Options(join_memory_limit=2 ** 12, print_filter_by_device_and_active=True))
+        self.assertEqual([], result.filtered_by_device)
+        self.assertEqual([(right.content_id, right.localizable_information[0].title_name_medium) for right in expected],
+                         [(right.content_id, right.localizable_information[0].title_name_medium)
+                          for right in result.filtered_by_device_and_active])
+        self.assertIsNone(result.filtered_by_device_and_active[0].rights)
+        # THE SPILL DIRECTORY IS REMOVED ALSO WHEN A RECORD IS NOT VALID
+        with mock.patch.object(Config, "URL_RIGHT", Config.URL_RIGHT + "-bad"), \
+                mock.patch("tempfile.tempdir", self.directory):
+            with self.assertRaises(RecordError), self.assertLogs(level="WARNING"):
+                run(Options(join_memory_limit=2 ** 12))
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_lenient(self):
+        with mock.patch.object(Config, "URL_RIGHT", Config.URL_RIGHT + "-bad"):
+            with self.assertRaises(RecordError) as context:
+                run(Options())
+            self.assertEqual(0, context.exception.index)
+            path = os.path.join(self.directory, "quarantine.jsonl")
+            for options in (Options(quarantine_file=path), Options(lenient=True, stream=True)):
+                metrics = Metrics()
+                with self.assertLogs(level="WARNING"):
+                    result = run(options, metrics)
+                self.assertEqual(self.endpoints, result.endpoints)
+                self.assertEqual(1, metrics.counters["records_quarantined"])
+                self.assertEqual([0], [error.index for error in result.quarantine["RIGHT"]])
+        with open(path) as file:
+            self.assertEqual([{"feed": "RIGHT", "index": 0, "reason": "contentId is required",
+                               "record": {"contentId": None}}], [json.loads(line) for line in file])
+
+    def test_probe(self):
+        # THE FEED SERVER IS ALSO THE ORIGIN, ONLY THE FIRST MANIFEST EXISTS (HEAD IS NOT SUPPORTED, PROBED WITH GET)
+        origin = {"level3": Config.URL_ASSET.replace("/tq", "")}
+        with mock.patch.dict(BODIES, {self.endpoints[0].path: b""}):
+            metrics = Metrics()
+            with self.assertLogs(level="INFO"):
+                result = run(Options(probe_origins=origin), metrics)
+            self.assertEqual(self.endpoints, result.endpoints)
+            self.assertEqual([True] + [False] * (self.endpoints.__len__() - 1),
+                             [probe.reachable for probe in result.probes])
+            self.assertEqual(self.endpoints.__len__() - 1, metrics.counters["endpoints_unreachable"])
+            with self.assertLogs(level="INFO"):
+                result = run(Options(probe_origins=origin, probe_filter=True))
+            self.assertEqual(self.endpoints[:1], result.endpoints)
+            output = io.StringIO()
+            with redirect_stdout(output), open_sink("jsonl") as sink:
+                emit(Options(output="jsonl"), result, sink)
+        record = json.loads(output.getvalue().splitlines()[-1])
+        self.assertEqual((self.endpoints[0].path, True, 200), (record["path"], record["reachable"], record["status"]))
+        self.assertEqual({"level3": "http://a", "akamai": "http://b:8080"},
+                         Options.from_args(["PROBE_ORIGINS=level3=http://a,akamai=http://b:8080"]).probe_origins)
+
+    def test_errors(self):
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(1, main(["FROM_SNAPSHOT=" + os.path.join(self.directory, "missing")]))
+        with mock.patch.object(Config, "URL_RIGHT", Config.URL_ASSET.replace("/tq", "/missing")), \
+                self.assertLogs(level="ERROR") as logs:
+            self.assertEqual(1, main(["NUMBER_OF_ITERATIONS=1"]))
+        self.assertIn("An error occurred while recovering data. Please try again later", logs.output[1])
+
+
+class StartupTest(unittest.TestCase):
+
+    def test_help_does_not_import_the_pipeline(self):
+        # A NEW INTERPRETER, THE MODULES OF THIS PROCESS ARE ALREADY IMPORTED BY THE OTHER TESTS
+        code = "import sys; from src.main.main import main; main(['--help']); " \
+               "print(sorted(name for name in ('requests', 'src.main.Pipeline') if name in sys.modules))"
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                   cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        self.assertTrue(completed.stdout.startswith("usage:"))
+        self.assertEqual("[]", completed.stdout.splitlines()[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timezone
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Predicate import device, territory, channel, active, video_format, origin, select_rights, \
+    select_endpoints, split, And, Predicate
+from src.main.Result import Response, ResultType, filter_result_by_can_be_played_on_ROKU, filter_result_by_active, \
+    filter_result_by_active_data_and_video_format_and_endpoint_origin_level, ResultRights
+
+
+class PredicateTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rights = Response.from_dict(generate_rights_payload(1000), ResultType.RIGHT).results
+        cls.assets = Response.from_dict(generate_assets_payload(1000), ResultType.ASSET).results
+
+    def test_same_result_of_the_filters(self):
+        self.assertEqual(filter_result_by_can_be_played_on_ROKU(self.rights),
+                         select_rights(self.rights, device("provider", "ROKU")))
+        expected = filter_result_by_active(filter_result_by_can_be_played_on_ROKU(self.rights))
+        self.assertEqual(expected, select_rights(self.rights, device("provider", "ROKU") & active()))
+        self.assertEqual(expected, select_rights(self.rights, active() & device("provider", "ROKU")))
+        active_content_ids = [result.content_id for result in filter_result_by_active(self.rights)]
+        self.assertEqual(filter_result_by_active_data_and_video_format_and_endpoint_origin_level(self.assets,
+                                                                                               active_content_ids),
+                         select_endpoints(self.assets, self.rights, active() & video_format("HD") & origin("level3")))
+
+    def test_conditions(self):
+        at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        predicate = (device("device_type", "TV") | territory("IT")) & ~channel("now.tv.com") & active(at)
+        expected = [result for result in self.rights
+                    if (result.rights.terms[0].can_be_played_on_device("device_type", "TV")
+                        or result.rights.terms[0].territory == "IT")
+                    and result.rights.channel != "now.tv.com" and result.rights.terms[0].is_active(at)]
+        self.assertEqual(expected, select_rights(self.rights, predicate))
+        endpoints = select_endpoints(self.assets, None, video_format("SD", "UHD") & ~origin("akamai"))
+        self.assertTrue(endpoints)
+        self.assertNotIn("akamai", {endpoint.origin for endpoint in endpoints})
+        self.assertNotIn("/hd/", "".join(endpoint.path for endpoint in endpoints))
+
+    def test_shared_conditions(self):
+        roku = device("provider", "ROKU")
+        predicate = (roku & active()) & (active() & roku)
+        self.assertIsInstance(predicate, And)
+        self.assertEqual(2, predicate.children.__len__())
+        self.assertEqual(device("provider", "ROKU"), roku)
+
+    def test_split(self):
+        rights_part, assets_part = split(active() & video_format("HD") & device("provider", "ROKU"))
+        self.assertEqual(active() & device("provider", "ROKU"), rights_part)
+        self.assertEqual(video_format("HD"), assets_part)
+        with self.assertRaises(ValueError):
+            active() | video_format("HD")
+        with self.assertRaises(ValueError):
+            select_rights(self.rights, video_format("HD"))
+        with self.assertRaises(AttributeError):
+            device("not_existing", "ROKU")
+        # A CONDITION WITHOUT key AND compile CANNOT BE CREATED
+        with self.assertRaises(TypeError):
+            type("Empty", (Predicate,), {"target": "rights"})()
+
+    def test_records_without_rights(self):
+        results = [ResultRights("1", None, None, None)]
+        self.assertEqual([], select_rights(results, active()))
+        self.assertEqual(results, select_rights(results, ~active()))
+
+
+if __name__ == '__main__':
+    unittest.main()
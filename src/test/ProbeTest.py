@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.main.Metrics import Metrics
+from src.main.Output import JsonLinesSink, write_endpoints
+from src.main.Probe import EndpointProber, ProbeCache, ProbeResult, filter_healthy, print_probed_endpoints
+from src.main.Result import Endpoint
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    # STAND-IN OF AN ORIGIN: /ok/* ARE MANIFESTS, /slow/* ANSWER AFTER 0.2s, /get-only/* DO NOT SUPPORT HEAD
+    protocol_version = "HTTP/1.1"
+
+    def answer(self, method: str):
+        server = self.server
+        with server.lock:
+            server.requests.append((method, self.path))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(0.2 if self.path.startswith("/slow/") else 0.02)
+            if self.path.startswith("/get-only/") and method == "HEAD":
+                status = 405
+            elif self.path.startswith(("/ok/", "/slow/", "/get-only/")):
+                status = 200
+            else:
+                status = 404
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_HEAD(self):
+        self.answer("HEAD")
+
+    def do_GET(self):
+        self.answer("GET")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProbeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.origins = {"level3": "http://127.0.0.1:%d/" % self.server.server_address[1]}
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = os.path.join(directory.name, "probes.json")
+
+    def prober(self, **kwargs) -> EndpointProber:
+        prober = EndpointProber(self.origins, **kwargs)
+        self.addCleanup(prober.close)
+        return prober
+
+    def test_probe(self):
+        endpoints = [Endpoint("level3", "/ok/1"), Endpoint("level3", "/missing/2"), Endpoint("level3", "/get-only/3"),
+                     Endpoint("akamai", "/ok/4"), Endpoint("level3", "/ok/1"), Endpoint("level3", None)]
+        metrics = Metrics()
+        probes = self.prober(metrics=metrics).probe(endpoints)
+        self.assertEqual([True, False, True, False, True, False], [probe.reachable for probe in probes])
+        self.assertEqual([200, 404, 200, None, 200, None], [probe.status for probe in probes])
+        self.assertEqual("status code 404", probes[1].error)
+        self.assertEqual("no base url for origin akamai", probes[3].error)
+        self.assertEqual(self.origins["level3"] + "ok/1", probes[0].url)
+        self.assertGreater(probes[0].latency, 0)
+        # THE SAME URL IS PROBED ONCE, HEAD IS RETRIED AS GET ONLY WHERE IT IS NOT SUPPORTED
+        self.assertEqual(sorted([("HEAD", "/ok/1"), ("HEAD", "/missing/2"), ("HEAD", "/get-only/3"),
+                                 ("GET", "/get-only/3")]), sorted(self.server.requests))
+        self.assertEqual(3, metrics.counters["endpoints_probed"])
+        self.assertEqual(3, metrics.counters["endpoints_unreachable"])
+
+    def test_limit_per_origin(self):
+        endpoints = [Endpoint("level3", "/ok/%d" % index) for index in range(12)]
+        probes = self.prober(max_per_origin=3).probe(endpoints)
+        self.assertTrue(all(probe.reachable for probe in probes))
+        self.assertEqual(12, self.server.requests.__len__())
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_timeout(self):
+        probes = self.prober(timeout=0.05).probe([Endpoint("level3", "/slow/1")])
+        self.assertFalse(probes[0].reachable)
+        self.assertIsNone(probes[0].status)
+        self.assertIsNotNone(probes[0].error)
+
+    def test_cache(self):
+        endpoints = [Endpoint("level3", "/ok/1"), Endpoint("level3", "/missing/2")]
+        self.prober(cache=ProbeCache(self.cache_path, ttl=60)).probe(endpoints)
+        self.assertEqual(2, self.server.requests.__len__())
+        # ONLY THE UNREACHABLE MANIFEST IS PROBED AGAIN
+        probes = self.prober(cache=ProbeCache(self.cache_path, ttl=60)).probe(endpoints)
+        self.assertEqual([("HEAD", "/missing/2")], self.server.requests[2:])
+        self.assertTrue(probes[0].cached)
+        self.assertEqual(200, probes[0].status)
+        self.assertFalse(probes[1].cached)
+        # EXPIRED
+        self.prober(cache=ProbeCache(self.cache_path, ttl=0)).probe(endpoints)
+        self.assertEqual(5, self.server.requests.__len__())
+        with open(self.cache_path, "w") as file:
+            file.write("{not json")
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(ProbeCache(self.cache_path).get(probes[0].url))
+
+    def test_filter_and_output(self):
+        endpoints = [Endpoint("level3", "/ok/1"), Endpoint("level3", "/missing/2"), Endpoint("level3", "/ok/3")]
+        probes = [ProbeResult("u1", True, 200, 0.01), ProbeResult(None, False, error="status code 404"),
+                  ProbeResult("u3", True, 200, 0.5)]
+        self.assertEqual(["/ok/1", "/ok/3"], [endpoint.path for endpoint in filter_healthy(endpoints, probes)[0]])
+        kept, kept_probes = filter_healthy(endpoints, probes, max_latency=0.1)
+        self.assertEqual((["/ok/1"], [probes[0]]), ([endpoint.path for endpoint in kept], kept_probes))
+        stream = io.StringIO()
+        with JsonLinesSink(stream) as sink:
+            write_endpoints(sink, endpoints, "Manifests:", probes)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual({"section": "Manifests:", "origin": "level3", "path": "/ok/1", "reachable": True,
+                          "status": 200, "latency_ms": 10.0}, records[0])
+        self.assertEqual((False, None), (records[1]["reachable"], records[1]["latency_ms"]))
+        with self.assertLogs(level="INFO") as logs:
+            print_probed_endpoints(endpoints, probes, "Manifests:")
+        self.assertEqual(["Manifests:", "/ok/1 -> 200 in 10.0 ms", "/missing/2 -> unreachable: status code 404",
+                          "/ok/3 -> 200 in 500.0 ms"], [record.getMessage() for record in logs.records])
+
+
+if __name__ == '__main__':
+    unittest.main()
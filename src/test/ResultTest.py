@@ -1,6 +1,6 @@
 import json
 import unittest
-from _pydatetime import datetime
+from datetime import datetime, timezone
 from typing import List
 
 from src.main import Result
@@ -156,6 +156,22 @@ class MyTestCase(unittest.TestCase):
                           datetime.fromisoformat("2024-06-14T22:00:00.000Z"), None, None)
         self.assertFalse(term.is_active())
 
+    def test_is_active_at(self):
+        term: Term = Term(datetime.fromisoformat("2024-05-02T23:00:00.000Z"),
+                          datetime.fromisoformat("2024-06-14T22:00:00.000Z"), None, None)
+        self.assertTrue(term.is_active(datetime(2024, 6, 1, tzinfo=timezone.utc)))
+        self.assertTrue(term.is_active(datetime.fromisoformat("2024-06-15T00:00:00+02:00")))
+        # A NAIVE REFERENCE TIME IS CONSIDERED UTC
+        self.assertTrue(term.is_active(datetime(2024, 6, 14, 22, 0)))
+        self.assertFalse(term.is_active(datetime(2024, 6, 14, 22, 0, 1)))
+
+        # NAIVE TERMS (BUILT IN CODE) ARE CONSIDERED UTC
+        term: Term = Term(datetime(2024, 5, 2, 23, 0), datetime(2024, 6, 14, 22, 0), None, None)
+        self.assertTrue(term.is_active(datetime(2024, 6, 1, tzinfo=timezone.utc)))
+        self.assertTrue(term.is_active(datetime(2024, 6, 1)))
+        self.assertFalse(term.is_active(datetime.fromisoformat("2024-06-15T01:00:00+02:00")))
+        self.assertFalse(term.is_active())
+
     def test_can_be_played_on_device(self):
         # TRUE CASE -> WHEN device_attribute exists and is equal to expected_value
         term: Term = Term(datetime.fromisoformat("2024-05-02T23:00:00.000Z"),
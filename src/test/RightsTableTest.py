@@ -0,0 +1,69 @@
+import importlib.util
+import unittest
+from datetime import datetime
+
+from src.main import Result
+from src.main.Result import Device, Term, Right, ResultRights, LocalizableInformation, Response
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+def result_rights(content_id: str, start: str, end: str, territory: str, channel: str, devices) -> ResultRights:
+    return ResultRights(content_id, None, [LocalizableInformation("en-GB", "eng", "Title " + content_id)], Right(
+        channel, [Term(datetime.fromisoformat(start), datetime.fromisoformat(end), territory, devices)]))
+
+
+@unittest.skipIf(not NUMPY_AVAILABLE, "numpy is not installed")
+class RightsTableTest(unittest.TestCase):
+
+    def setUp(self):
+        from src.main.RightsTable import RightsTable
+        self.results = [
+            result_rights("1", "2024-01-01T00:00:00.000Z", "2024-12-31T00:00:00.000Z", "GB", "itv3.itv.com",
+                          [Device("ROKU", "IPSETTOPBOX", "ROKU"), Device("SAMSUNG", "TV", "SKY")]),
+            result_rights("2", "2024-06-01T00:00:00.000Z", "2024-06-30T00:00:00.000Z", "IT", "sky.com",
+                          [Device("SAMSUNG", "TV", "SKY")]),
+            result_rights("3", "2025-01-01T00:00:00.000Z", "2025-12-31T00:00:00.000Z", None, None, None),
+            ResultRights("4", None, None, None),
+        ]
+        self.table = RightsTable(Response(self.results))
+
+    def content_ids(self, mask):
+        return [result.content_id for result in self.table.select(mask)]
+
+    def test_rows(self):
+        # ResultRights WITHOUT rights HAS NO ROWS
+        self.assertEqual(3, self.table.__len__())
+        self.assertEqual(["1", "2", "3"], self.content_ids(self.table.all()))
+
+    def test_active_mask(self):
+        at = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+        self.assertEqual(["1", "2"], self.content_ids(self.table.active_mask(at)))
+        self.assertEqual(["1", "2"], self.content_ids(
+            self.table.active_mask(datetime.fromisoformat("2024-06-30T00:00:00.000Z"))))
+        self.assertEqual(["3"], self.content_ids(
+            self.table.active_mask(datetime.fromisoformat("2025-06-15T00:00:00.000Z"))))
+
+    def test_same_result_of_filter_result_by_active(self):
+        self.assertEqual(Result.filter_result_by_active(self.results[:3]), self.table.select(self.table.active_mask()))
+
+    def test_territory_channel_device_masks(self):
+        self.assertEqual(["2"], self.content_ids(self.table.territory_mask("IT")))
+        self.assertEqual(["1", "2"], self.content_ids(self.table.territory_mask("IT", "GB", "DE")))
+        self.assertEqual(["1"], self.content_ids(self.table.channel_mask("itv3.itv.com")))
+        self.assertEqual(["1"], self.content_ids(self.table.device_mask("provider", "ROKU")))
+        self.assertEqual(["1", "2"], self.content_ids(self.table.device_mask("device_type", "TV", "CONSOLE")))
+        self.assertEqual([], self.content_ids(self.table.device_mask("provider", "NOWTV")))
+        with self.assertRaises(AttributeError):
+            self.table.device_mask("not_existing_device_attribute", "no")
+
+    def test_combined_masks_and_titles(self):
+        at = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+        mask = self.table.active_mask(at) & self.table.device_mask("provider", "SKY") & ~self.table.territory_mask("GB")
+        self.assertEqual(["2"], self.content_ids(mask))
+        self.assertEqual(["Title 2"], self.table.select_titles(mask))
+        self.assertEqual(1, self.table.count(mask))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.main.Result import Endpoint, Asset, Device, Term, Right, ResultAsset, ResultRights, Response, \
+    LocalizableInformation
+from src.main.Service import CatalogService, create_server
+
+
+def catalog(active_content_id: str):
+    now = datetime.now(timezone.utc)
+    assets = Response([ResultAsset(content_id, None, [Asset([Endpoint("level3", "/%s/hd" % content_id)], "HD"),
+                                                      Asset([Endpoint("akamai", "/%s/sd" % content_id)], "SD")])
+                       for content_id in ("1", "2")])
+    rights = []
+    for content_id in ("1", "2"):
+        end = now + timedelta(days=1) if content_id == active_content_id else now - timedelta(hours=1)
+        rights.append(ResultRights(content_id, None, [LocalizableInformation("en-GB", "eng", "Title " + content_id)],
+                                   Right(None, [Term(now - timedelta(days=1), end, None,
+                                                     [Device("ROKU", "IPSETTOPBOX", "ROKU")])])))
+    return assets, Response(rights)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+class CatalogServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.active_content_id = "1"
+        self.fail = False
+
+        def loader():
+            if self.fail:
+                raise ValueError("upstream down")
+            return catalog(self.active_content_id)
+
+        self.service = CatalogService(loader, refresh_interval=3600)
+        self.service.refresh()
+
+    def start_server(self, **kwargs):
+        server = create_server(self.service, port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def get(self, connection: http.client.HTTPConnection, path: str):
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_queries(self):
+        server = self.start_server()
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        self.assertEqual((200, ["/1/hd"]), self.get(connection, "/manifests"))
+        self.assertEqual((200, []), self.get(connection, "/manifests?content_id=2"))
+        self.assertEqual((200, ["/1/hd"]), self.get(connection, "/manifests?content_id=1"))
+        status, titles = self.get(connection, "/titles?device_attribute=provider&value=ROKU&active=true")
+        self.assertEqual([{"content_id": "1", "title": "Title 1"}], titles)
+        status, titles = self.get(connection, "/titles?device_attribute=provider&value=ROKU")
+        self.assertEqual(2, titles.__len__())
+        status, endpoints = self.get(connection, "/endpoints?video_format=SD&origin=akamai")
+        self.assertEqual(["1", "2"], [endpoint["content_id"] for endpoint in endpoints])
+        self.assertEqual(400, self.get(connection, "/titles?device_attribute=not_existing&value=x")[0])
+        status, results = self.get(connection, "/search?q=tit&active=true&device_attribute=provider&value=ROKU")
+        self.assertEqual([("1", "Title 1")], [(result["content_id"], result["title"]) for result in results])
+        self.assertEqual(["1", "2"], [result["content_id"] for result in self.get(connection, "/search?q=title")[1]])
+        self.assertEqual(["2"], [result["content_id"] for result in self.get(connection, "/search?q=title+2")[1]])
+        self.assertEqual(400, self.get(connection, "/search?q=x&field=unknown")[0])
+        self.assertEqual(404, self.get(connection, "/unknown")[0])
+        self.assertEqual(2, self.get(connection, "/health")[1]["rights"])
+        connection.close()
+
+    def test_refresh_swaps_the_snapshot(self):
+        old = self.service.snapshot
+        self.active_content_id = "2"
+        self.assertTrue(self.service.refresh())
+        self.assertIsNot(old, self.service.snapshot)
+        self.assertEqual(["/2/hd"], self.service.snapshot.manifests())
+        # THE OLD SNAPSHOT IS NOT MODIFIED, A READER THAT STILL USES IT SEES THE OLD CATALOG
+        self.assertEqual(["/1/hd"], old.manifests())
+
+    def test_failed_refresh_keeps_the_snapshot(self):
+        old = self.service.snapshot
+        self.fail = True
+        self.assertFalse(self.service.refresh())
+        self.assertIs(old, self.service.snapshot)
+
+    def test_background_refresh(self):
+        self.service.refresh_interval = 0.01
+        self.active_content_id = "2"
+        old = self.service.snapshot
+        self.service.start()
+        self.addCleanup(self.service.stop)
+        for _ in range(200):
+            if self.service.snapshot is not old:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(["/2/hd"], self.service.snapshot.manifests())
+
+    @unittest.skipIf(not hasattr(socket, "AF_UNIX"), "Unix sockets are not supported")
+    def test_unix_socket(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "catalog.sock")
+        self.start_server(socket_path=path)
+        connection = UnixHTTPConnection(path)
+        self.assertEqual((200, ["/1/hd"]), self.get(connection, "/manifests"))
+        connection.close()
+
+    def test_not_loaded_catalog(self):
+        service = CatalogService(lambda: (_ for _ in ()).throw(ValueError("down")))
+        server = create_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        self.assertEqual(503, self.get(connection, "/manifests")[0])
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
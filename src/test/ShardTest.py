@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List
+
+from src.main.Client import FeedClient, FetchError
+from src.main.Result import ResultType
+from src.main.Shard import ingest, fetch_payloads, merge_payloads
+
+
+def page(*content_ids: str) -> bytes:
+    return json.dumps({"results": [{"contentId": content_id, "assets": []} for content_id in content_ids]}).encode()
+
+
+class ShardHandler(BaseHTTPRequestHandler):
+    # path -> body, status codes to answer (the last one is repeated) and delay
+    bodies: Dict[str, bytes] = {}
+    statuses: Dict[str, List[int]] = {}
+    delays: Dict[str, float] = {}
+    calls: Dict[str, int] = {}
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with ShardHandler.lock:
+            calls = ShardHandler.calls.get(self.path, 0)
+            ShardHandler.calls[self.path] = calls + 1
+            ShardHandler.in_flight += 1
+            ShardHandler.max_in_flight = max(ShardHandler.max_in_flight, ShardHandler.in_flight)
+        time.sleep(ShardHandler.delays.get(self.path, 0.0))
+        statuses = ShardHandler.statuses.get(self.path, [200])
+        status = statuses[min(calls, statuses.__len__() - 1)]
+        body = ShardHandler.bodies.get(self.path, page())
+        with ShardHandler.lock:
+            ShardHandler.in_flight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(body.__len__()))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ShardTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ShardHandler)
+        cls.url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ShardHandler.bodies = {"/1": page("a", "b"), "/2": page("b", "c"), "/3": page("d")}
+        ShardHandler.statuses = {}
+        ShardHandler.delays = {}
+        ShardHandler.calls = {}
+        ShardHandler.max_in_flight = 0
+
+    def test_merge_deduplicated_in_order_of_the_sources(self):
+        # THE FIRST SHARD IS THE SLOWEST, THE ORDER OF THE RESULT DOES NOT DEPEND ON THE ORDER OF COMPLETION
+        ShardHandler.delays = {"/1": 0.2}
+        with FeedClient() as client:
+            response = ingest(client, [self.url + "/%d" % shard for shard in (1, 2, 3)], ResultType.ASSET)
+        self.assertEqual(["a", "b", "c", "d"], [result.content_id for result in response.results])
+
+    def test_bounded_concurrency_with_a_generator(self):
+        ShardHandler.delays = {"/%d" % shard: 0.1 for shard in range(8)}
+        with FeedClient() as client:
+            start = time.perf_counter()
+            payloads = fetch_payloads(client, (self.url + "/%d" % shard for shard in range(8)), max_concurrency=4)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(8, payloads.__len__())
+        self.assertEqual(4, ShardHandler.max_in_flight)
+        # 2 ROUNDS OF 0.1s, SERIAL EXECUTION WOULD TAKE 0.8s
+        self.assertLess(elapsed, 0.6)
+
+    def test_only_the_failed_shard_is_retried(self):
+        ShardHandler.statuses = {"/2": [500, 200]}
+        with FeedClient(backoff_base=0.001) as client:
+            payload = merge_payloads(fetch_payloads(client, [self.url + "/%d" % shard for shard in (1, 2, 3)]))
+        self.assertEqual(["a", "b", "c", "d"], [record["contentId"] for record in payload["results"]])
+        self.assertEqual({"/1": 1, "/2": 2, "/3": 1}, ShardHandler.calls)
+
+    def test_raise_when_a_shard_fails(self):
+        ShardHandler.statuses = {"/3": [500]}
+        with FeedClient(number_of_iterations=2, backoff_base=0.001) as client:
+            with self.assertRaises(FetchError) as context:
+                ingest(client, [self.url + "/%d" % shard for shard in (1, 2, 3)], ResultType.ASSET)
+        self.assertEqual(self.url + "/3", context.exception.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
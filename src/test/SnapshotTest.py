@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from src.benchmark.Synthetic import generate_assets_payload, generate_rights_payload
+from src.main.Result import Response, ResultType, ResultRights, ResultAsset, Right, Asset
+from src.main.Snapshot import Snapshot, write_snapshot
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "catalog.snapshot")
+        self.response_asset = Response.from_dict(generate_assets_payload(500, seed=2), ResultType.ASSET)
+        self.response_right = Response.from_dict(generate_rights_payload(500, seed=2), ResultType.RIGHT)
+        # NONE VALUES AND EMPTY LISTS ARE KEPT AS THEY ARE
+        self.response_right.results += [ResultRights("id-none", None, None, None),
+                                        ResultRights("id-empty", "vq", [], Right(None, None)),
+                                        ResultRights("id-ünicode", "vq", [], Right("", []))]
+        self.response_asset.results += [ResultAsset("id-none", None, None),
+                                        ResultAsset("id-empty", "vq", [Asset([], None), Asset(None, "SD")])]
+        write_snapshot(self.path, self.response_asset, self.response_right)
+
+    def open(self) -> Snapshot:
+        snapshot = Snapshot(self.path)
+        self.addCleanup(snapshot.close)
+        return snapshot
+
+    def test_round_trip(self):
+        snapshot = self.open()
+        self.assertEqual(self.response_right.results, list(snapshot.rights))
+        self.assertEqual(self.response_asset.results, list(snapshot.assets))
+        self.assertEqual(self.response_right.results[-5:], snapshot.rights[-5:])
+        response_asset, response_right = snapshot.responses()
+        self.assertEqual(self.response_asset.results.__len__(), response_asset.results.__len__())
+        self.assertEqual(self.response_right.results[0], response_right.results[0])
+        with self.assertRaises(IndexError):
+            _ = snapshot.rights[snapshot.rights.__len__()]
+
+    def test_dates_are_utc(self):
+        term = self.open().rights[0].rights.terms[0]
+        self.assertEqual(timezone.utc, term.start_date_time.tzinfo)
+        self.assertEqual(self.response_right.results[0].rights.terms[0].start_date_time, term.start_date_time)
+        self.assertEqual(term.is_active(datetime.now(timezone.utc)),
+                         self.response_right.results[0].rights.terms[0].is_active(datetime.now(timezone.utc)))
+
+    def test_lookup_by_content_id(self):
+        snapshot = self.open()
+        for result in self.response_right.results[::50]:
+            self.assertEqual([result], snapshot.get_rights(result.content_id))
+        for result in self.response_asset.results[::50]:
+            self.assertEqual([result], snapshot.get_assets(result.content_id))
+        self.assertEqual([], snapshot.get_rights("missing"))
+        self.assertEqual(self.response_right.results[-1:], snapshot.get_rights("id-ünicode"))
+
+    def test_duplicated_content_id(self):
+        duplicated = ResultRights(self.response_right.results[0].content_id, "other", None, None)
+        write_snapshot(self.path, None, Response(self.response_right.results + [duplicated]))
+        snapshot = self.open()
+        self.assertEqual([self.response_right.results[0], duplicated], snapshot.get_rights(duplicated.content_id))
+        self.assertEqual(0, snapshot.assets.__len__())
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "wb") as file:
+            file.write(b"{\"results\": []}" + b" " * 64)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
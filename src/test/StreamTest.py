@@ -0,0 +1,134 @@
+import json
+import tracemalloc
+import unittest
+from typing import Iterator
+
+from src.main import Result
+from src.main.Result import ResultType
+from src.main.Stream import iter_results
+
+RIGHTS_JSON = """
+    {
+        "results": [
+            {
+                "contentId": "sky-test-id-1",
+                "accessChannel": "itv3",
+                "localizableInformation": [
+                    {
+                        "locale": "en-GB",
+                        "language": "eng",
+                        "titleNameMedium": "Agatha Christie's Marple \\u00e8"
+                    }
+                ],
+                "rights": {
+                    "channel": "itv3.itv.com",
+                    "terms": [
+                        {
+                            "startDateTime": "2024-05-31T16:48:47.000Z",
+                            "endDateTime": "2024-10-30T22:59:00.000Z",
+                            "territory": "GB",
+                            "devices": [
+                                {
+                                    "devicePlatform": "APPLETV",
+                                    "deviceType": "IPSETTOPBOX",
+                                    "provider": "SKY"
+                                }
+                            ]
+                        }
+                    ]
+                }
+            },
+            {
+                "contentId": "sky-test-id-2"
+            }
+        ],
+        "total": 2
+    }
+"""
+
+ASSETS_JSON = """
+    {
+        "page": {"number": 1},
+        "results": [
+            {
+                "contentId": "sky-test-id-1",
+                "accessChannel": "itv3",
+                "assets": [
+                    {
+                        "endpoints": [
+                            {
+                                "origin": "level3",
+                                "path": "/skyplayer/level3/sky-test-id-1/sd/Manifest"
+                            }
+                        ],
+                        "videoFormat": "SD"
+                    }
+                ]
+            }
+        ]
+    }
+"""
+
+
+def chunked(payload: str, size: int) -> Iterator[bytes]:
+    data = payload.encode("utf-8")
+    for index in range(0, data.__len__(), size):
+        yield data[index:index + size]
+
+
+class StreamTest(unittest.TestCase):
+
+    def test_iter_results_is_equal_to_from_dict(self):
+        for payload, result_type in [(RIGHTS_JSON, ResultType.RIGHT), (ASSETS_JSON, ResultType.ASSET)]:
+            expected = Result.Response.from_dict(json.loads(payload), result_type).results
+            # EVERY CHUNK SIZE, ALSO 1 BYTE THAT SPLITS MULTI-BYTE CHARACTERS, HAS TO PRODUCE THE SAME RESULT
+            for size in [1, 2, 7, 64, 100000]:
+                self.assertEqual(expected, list(iter_results(chunked(payload, size), result_type)))
+
+    def test_iter_results_with_no_results(self):
+        self.assertEqual([], list(iter_results(chunked('{}', 1), ResultType.RIGHT)))
+        self.assertEqual([], list(iter_results(chunked('{"results": []}', 1), ResultType.RIGHT)))
+        self.assertEqual([], list(iter_results(chunked('{"results": null}', 1), ResultType.RIGHT)))
+
+    def test_iter_results_reuse_validation(self):
+        # RAISE ERROR IF content_id IS None, LIKE ResultRights.from_dict
+        with self.assertRaises(ValueError):
+            list(iter_results(chunked('{"results": [{}]}', 3), ResultType.RIGHT))
+
+    def test_iter_results_is_lazy(self):
+        def chunks():
+            yield b'{"results": [{"contentId": "1"},'
+            raise AssertionError("The first record should be yielded before reading the rest of the payload")
+
+        results = iter_results(chunks(), ResultType.ASSET)
+        self.assertEqual("1", next(results).content_id)
+
+    def test_iter_results_malformed_payload(self):
+        with self.assertRaises(ValueError):
+            list(iter_results(chunked('{"results": [{"contentId": "1"}', 4), ResultType.ASSET))
+        with self.assertRaises(ValueError):
+            list(iter_results(chunked('[]', 4), ResultType.ASSET))
+
+    def test_iter_results_memory_is_flat(self):
+        record = '{"contentId": "id-%d", "assets": [{"videoFormat": "HD", "endpoints": [{"origin": "level3", "path": "/p"}]}]}'
+
+        def chunks(size: int):
+            yield b'{"results": ['
+            for index in range(size):
+                yield ((',' if index > 0 else '') + record % index).encode("utf-8")
+            yield b']}'
+
+        def peak(size: int) -> int:
+            tracemalloc.start()
+            count = sum(1 for _ in iter_results(chunks(size), ResultType.ASSET))
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.assertEqual(size, count)
+            return peak_memory
+
+        # 10 TIMES THE RECORDS SHOULD NOT MEAN 10 TIMES THE MEMORY
+        self.assertLess(peak(20000), peak(2000) * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import random
+import time
+import unittest
+
+from src.benchmark.LoadHarness import percentile, run_policy
+from src.benchmark.StubServer import StubServer, Faults, SLOW_CHUNK_SIZE, parse_latency
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.Client import FeedClient, FetchError
+
+
+class StubServerTest(unittest.TestCase):
+
+    def start(self, faults: Faults = None, size: int = 50) -> StubServer:
+        stub = StubServer(size, seed=1, faults=faults).start()
+        self.addCleanup(stub.stop)
+        return stub
+
+    def client(self, number_of_iterations: int = 2) -> FeedClient:
+        client = FeedClient(number_of_iterations=number_of_iterations, backoff_base=0.0, timeout=5)
+        self.addCleanup(client.close)
+        return client
+
+    def test_serves_the_feeds(self):
+        stub = self.start()
+        responses = self.client().fetch_all({"Asset Data": stub.url_asset, "Localization Data": stub.url_right})
+        self.assertEqual(generate_rights_payload(50, seed=1)["results"].__len__(),
+                         responses["Localization Data"].json()["results"].__len__())
+        self.assertEqual(json.loads(stub.bodies["/tq"]), responses["Asset Data"].json())
+        self.assertEqual(2, stub.stats["requests"])
+
+    def test_failures(self):
+        stub = self.start(Faults(failure_rate=1.0, status_codes=[503]))
+        with self.assertRaises(FetchError) as context, self.assertLogs(level="WARNING"):
+            self.client().fetch(stub.url_right)
+        self.assertEqual("status code 503", context.exception.reason)
+        self.assertEqual(2, stub.stats["failures"])
+
+    def test_truncated_body_is_retried(self):
+        stub = self.start(Faults(truncate_rate=1.0))
+        with self.assertRaises(FetchError), self.assertLogs(level="WARNING"):
+            self.client().fetch(stub.url_asset)
+        self.assertEqual(2, stub.stats["truncated"])
+        self.assertEqual(stub.bodies["/tq"].__len__() // 2 * 2, stub.stats["bytes_sent"])
+
+    def test_slow_body_and_latency(self):
+        stub = self.start(Faults(slow_rate=1.0, body_rate=100000.0, latency=parse_latency("0.05")))
+        start = time.perf_counter()
+        self.client().fetch(stub.url_right)
+        # THE CLIENT HAS THE BODY BEFORE THE PAUSE AFTER THE LAST CHUNK, ONLY THE ONE AFTER THE FIRST IS WAITED FOR SURE
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05 + SLOW_CHUNK_SIZE / 100000.0)
+        self.assertEqual(1, stub.stats["slow_bodies"])
+
+    def test_parse_latency(self):
+        generator = random.Random(0)
+        self.assertEqual(0.5, parse_latency("0.5")(generator))
+        self.assertTrue(0.1 <= parse_latency("uniform:0.1:0.2")(generator) <= 0.2)
+        self.assertGreater(parse_latency("exp:0.05")(generator), 0)
+        self.assertGreater(parse_latency("lognormal:0.05:0.8")(generator), 0)
+        for spec in ("fast", "exp", "uniform:0.1", "gauss:1:2"):
+            with self.assertRaises(ValueError):
+                parse_latency(spec)
+        with self.assertRaises(ValueError):
+            Faults(failure_rate=1.5)
+
+
+class LoadHarnessTest(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(50.0, percentile(values, 50))
+        self.assertEqual(99.0, percentile(values, 99))
+        self.assertEqual(1.0, percentile([1.0], 99))
+
+    def test_run_policy(self):
+        with StubServer(50, seed=1) as stub:
+            report = run_policy(stub, {"number_of_iterations": 1}, runs=4, concurrency=2)
+            size = stub.bodies["/tq"].__len__() + stub.bodies["/vq"].__len__()
+        self.assertEqual(1.0, report["success_rate"])
+        self.assertEqual(0, report["retries"])
+        self.assertEqual(4 * size, report["bytes_transferred"])
+        self.assertEqual(4 * size, report["bytes_received"])
+        self.assertLessEqual(report["p50_seconds"], report["p99_seconds"])
+
+
+if __name__ == '__main__':
+    unittest.main()
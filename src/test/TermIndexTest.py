@@ -0,0 +1,96 @@
+import unittest
+from datetime import datetime
+
+from src.main.Result import Term, Right, ResultRights
+from src.main.TermIndex import TermIndex
+
+
+def result_rights(content_id: str, start: str, end: str) -> ResultRights:
+    return ResultRights(content_id, None, None, Right(None, [
+        Term(datetime.fromisoformat(start), datetime.fromisoformat(end), None, None)
+    ]))
+
+
+class TermIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = [
+            result_rights("1", "2024-01-01T00:00:00.000Z", "2024-12-31T23:59:59.000Z"),
+            result_rights("2", "2024-06-01T00:00:00.000Z", "2024-06-30T00:00:00.000Z"),
+            result_rights("3", "2025-01-01T00:00:00.000Z", "2025-12-31T00:00:00.000Z"),
+            ResultRights("4", None, None, None),
+        ]
+        self.index = TermIndex(self.results)
+
+    def content_ids(self, at: str):
+        return [result.content_id for result in self.index.filter_result_by_active(at=datetime.fromisoformat(at))]
+
+    def test_active_at_reference_time(self):
+        self.assertEqual([], self.content_ids("2023-06-01T00:00:00.000Z"))
+        self.assertEqual(["1"], self.content_ids("2024-02-01T00:00:00.000Z"))
+        self.assertEqual(["1", "2"], self.content_ids("2024-06-15T00:00:00.000Z"))
+        self.assertEqual(["3"], self.content_ids("2025-06-15T00:00:00.000Z"))
+        # NAIVE DATES ARE CONSIDERED UTC
+        self.assertEqual(["1", "2"], [result.content_id for result in
+                                      self.index.filter_result_by_active(at=datetime(2024, 6, 15))])
+
+    def test_naive_terms(self):
+        index = TermIndex([ResultRights("1", None, None, Right(None, [
+            Term(datetime(2024, 6, 1), datetime(2024, 6, 30), None, None)]))])
+        at = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+        self.assertEqual(frozenset({0}), index.active_positions(at))
+        self.assertEqual(frozenset({0}), index.active_positions(datetime(2024, 6, 15)))
+        self.assertTrue(index.results[0].rights.terms[0].is_active(at))
+
+    def test_boundaries_are_inclusive(self):
+        self.assertEqual(["1", "2"], self.content_ids("2024-06-01T00:00:00.000Z"))
+        self.assertEqual(["1", "2"], self.content_ids("2024-06-30T00:00:00.000Z"))
+        self.assertEqual(["1"], self.content_ids("2024-06-30T00:00:00.001Z"))
+
+    def test_next_boundary(self):
+        self.assertEqual(datetime.fromisoformat("2024-06-01T00:00:00.000Z"),
+                         self.index.next_boundary(datetime.fromisoformat("2024-02-01T00:00:00.000Z")))
+        # THE TERM IS ACTIVE ALSO AT ITS END DATE, IT EXPIRES JUST AFTER
+        self.assertEqual(datetime.fromisoformat("2024-06-30T00:00:00.000001Z"),
+                         self.index.next_boundary(datetime.fromisoformat("2024-06-15T00:00:00.000Z")))
+        self.assertEqual(datetime.fromisoformat("2024-06-30T00:00:00.000001Z"),
+                         self.index.next_boundary(datetime.fromisoformat("2024-06-30T00:00:00.000Z")))
+        self.assertEqual(datetime.fromisoformat("2024-12-31T23:59:59.000001Z"),
+                         self.index.next_boundary(datetime.fromisoformat("2024-06-30T00:00:00.000001Z")))
+        self.assertIsNone(self.index.next_boundary(datetime.fromisoformat("2026-01-01T00:00:00.000Z")))
+
+    def test_active_set_is_valid_until_the_next_boundary(self):
+        at = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+        while at is not None:
+            boundary = self.index.next_boundary(at)
+            self.assertGreater(boundary or datetime.max.replace(tzinfo=at.tzinfo), at)
+            if boundary is not None:
+                self.assertNotEqual(self.index.active_positions(at), self.index.active_positions(boundary))
+            at = boundary
+
+    def test_active_set_is_cached_between_boundaries(self):
+        self.content_ids("2024-02-01T00:00:00.000Z")
+        self.content_ids("2024-03-01T00:00:00.000Z")
+        self.content_ids("2024-05-31T23:59:59.000Z")
+        self.assertEqual(1, self.index.cache_misses)
+        self.assertEqual(2, self.index.cache_hits)
+
+        # CROSSING A BOUNDARY INVALIDATES THE CACHE
+        self.content_ids("2024-06-15T00:00:00.000Z")
+        self.assertEqual(2, self.index.cache_misses)
+
+    def test_same_result_of_is_active(self):
+        now = datetime.now().astimezone()
+        expected = [result for result in self.results
+                    if result.rights is not None and result.rights.terms[0].is_active()]
+        self.assertEqual(expected, self.index.filter_result_by_active(at=now))
+
+    def test_filter_subset(self):
+        at = datetime.fromisoformat("2024-06-15T00:00:00.000Z")
+        self.assertEqual([self.results[1]], self.index.filter_result_by_active([self.results[1], self.results[2]], at))
+        self.assertTrue(self.index.is_active(self.results[0], at))
+        self.assertFalse(self.index.is_active(self.results[3], at))
+
+
+if __name__ == '__main__':
+    unittest.main()
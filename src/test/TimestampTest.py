@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+
+from src.main.Timestamp import parse_timestamp
+
+
+class TimestampTest(unittest.TestCase):
+
+    def test_feed_layout(self):
+        for raw in ["2024-05-02T23:00:00.000Z", "2024-10-12T22:59:59.123Z", "2000-02-29T00:00:00.999Z"]:
+            parsed = parse_timestamp(raw)
+            self.assertEqual(datetime.fromisoformat(raw), parsed)
+            self.assertIs(timezone.utc, parsed.tzinfo)
+
+    def test_other_layouts_are_normalized_to_utc(self):
+        self.assertEqual(datetime(2024, 5, 2, 21, 0, tzinfo=timezone.utc),
+                         parse_timestamp("2024-05-02T23:00:00+02:00"))
+        self.assertEqual(timedelta(0), parse_timestamp("2024-05-02T23:00:00+02:00").utcoffset())
+        # WITHOUT TIMEZONE IS CONSIDERED UTC
+        self.assertEqual(datetime(2024, 5, 2, 23, 0, tzinfo=timezone.utc), parse_timestamp("2024-05-02T23:00:00"))
+        self.assertEqual(datetime(2024, 5, 2, tzinfo=timezone.utc), parse_timestamp("2024-05-02"))
+
+    def test_invalid_timestamp(self):
+        for raw in ["2024-13-02T23:00:00.000Z", "2024-05-02T2a:00:00.000Z", "not a date"]:
+            with self.assertRaises(ValueError):
+                parse_timestamp(raw)
+
+    def test_cache(self):
+        parse_timestamp.cache_clear()
+        first = parse_timestamp("2024-05-02T23:00:00.000Z")
+        second = parse_timestamp("2024-05-02T23:00:00.000Z")
+        self.assertIs(first, second)
+        self.assertEqual(1, parse_timestamp.cache_info().hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
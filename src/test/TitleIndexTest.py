@@ -0,0 +1,155 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+
+from src.benchmark.Synthetic import generate_rights_payload
+from src.main.CatalogIndex import CatalogIndex
+from src.main.Decoder import decode_response
+from src.main.Result import Device, Term, Right, ResultRights, Response, ResultType, LocalizableInformation
+from src.main.TitleIndex import TitleIndex, ACTOR, normalize
+
+
+def rights(content_id: str, informations: list, active: bool = True, provider: str = "ROKU") -> ResultRights:
+    now = datetime.now(timezone.utc)
+    end = now + timedelta(days=1) if active else now - timedelta(hours=1)
+    return ResultRights(content_id, None, informations,
+                        Right(None, [Term(now - timedelta(days=1), end, None, [Device("X", "TV", provider)])]))
+
+
+class TitleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = [
+            rights("marple-1", [LocalizableInformation("en-GB", "eng", "Agatha Christie's Marple", "Nemesis", "1", "3",
+                                                       ["Julia McKenzie", "Richard Briers"])]),
+            rights("marple-2", [LocalizableInformation("en-GB", "eng", "Agatha Christie's Marple",
+                                                       "The Mirror Crack'd", "2", "3", ["Julia McKenzie"])],
+                   active=False),
+            rights("cafe", [LocalizableInformation("fr-FR", "fra", "Le Café de Flore", actors=["Vanessa Paradis"]),
+                            LocalizableInformation("en-GB", "eng", "Café de Flore")], provider="SKY"),
+            rights("istanbul", [LocalizableInformation("tr-TR", "tur", "İSTANBUL IŞIKLARI")]),
+            rights("empty", None),
+        ]
+        self.index = TitleIndex(self.results)
+
+    def content_ids(self, results) -> list:
+        return [result.content_id for result in results]
+
+    def test_normalize(self):
+        self.assertEqual(["agatha", "christie", "s", "marple"], normalize("Agatha Christie's MARPLE"))
+        self.assertEqual(["cafe", "strasse", "zurich"], normalize("Café  Straße, Zürich!"))
+        # THE CEDILLA IS AN ACCENT, THE DOTLESS I IS A LETTER
+        self.assertEqual(["istanbul", "ısıkları"], normalize("İSTANBUL IŞIKLARI", "tr-TR"))
+        self.assertEqual([], normalize(" - "))
+
+    def test_search_as_you_type(self):
+        self.assertEqual(["marple-1", "marple-2"], self.content_ids(self.index.search("mar")))
+        self.assertEqual(["marple-1", "marple-2"], self.content_ids(self.index.search("Marple ")))
+        self.assertEqual(["marple-1"], self.content_ids(self.index.search("marple nem")))
+        self.assertEqual(["marple-2"], self.content_ids(self.index.search("crack'd mirr")))
+        # A COMPLETE WORD IS NOT A PREFIX ANY MORE
+        self.assertEqual([], self.content_ids(self.index.search("mar ")))
+        self.assertEqual([], self.index.search(""))
+        self.assertEqual([], self.index.search("marple zzz"))
+
+    def test_locales(self):
+        self.assertEqual(["cafe"], self.content_ids(self.index.search("cafe")))
+        self.assertEqual(["cafe"], self.content_ids(self.index.search("le caf", locale="fr-FR")))
+        self.assertEqual([], self.index.search("le caf", locale="en-GB"))
+        self.assertEqual(["istanbul"], self.content_ids(self.index.search("ışık", locale="tr-TR")))
+        # WITHOUT LOCALE THE QUERY IS NORMALIZED ALSO WITH THE TURKISH RULES FOR THE TURKISH TITLES
+        for query in ("IŞIK", "ışık", "İstanbul ışıkl", "ISTANBUL"):
+            self.assertEqual(["istanbul"], self.content_ids(self.index.search(query)), query)
+        self.assertEqual([], self.index.search("IŞIK", locale="en-GB"))
+        self.assertEqual(["ısıkları"], self.index.complete("IŞI"))
+        self.assertEqual(["en-GB", "fr-FR", "tr-TR"], self.index.locales())
+
+    def test_actors(self):
+        self.assertEqual(["marple-1", "marple-2"], self.content_ids(self.index.search("julia mck", ACTOR)))
+        self.assertEqual(["marple-1"], self.content_ids(self.index.search("briers", ACTOR)))
+        self.assertEqual(["cafe"], self.content_ids(self.index.search("vanessa", ACTOR, "fr-FR")))
+        self.assertEqual([], self.index.search("marple", ACTOR))
+        with self.assertRaises(ValueError):
+            self.index.search("x", "director")
+
+    def test_short_prefixes_and_common_tokens(self):
+        results = [rights("title-%d" % index, [LocalizableInformation("en-GB", "eng", "Title %d" % index)])
+                   for index in range(3000)]
+        index = TitleIndex(results)
+        self.assertEqual(list(range(3000)), list(index.search_positions("ti")))
+        self.assertEqual([42] + list(range(420, 430)), list(index.search_positions("title 42")))
+        self.assertEqual([4, 40, 41], list(index.search_positions("title 4", locale="en-GB"))[:3])
+        self.assertEqual(["title"], index.complete("t"))
+
+    def test_masks(self):
+        # THE ODD ONES IN en-GB, THE EVEN ONES IN fr-FR: WITHOUT LOCALE THE MASKS OF THE TWO LOCALES ARE MERGED
+        results = [rights("title-%d" % index, [LocalizableInformation(
+            "en-GB" if index % 2 else "fr-FR", "eng", "Title %d %s" % (index, "odd" if index % 2 else "even"))])
+                   for index in range(3000)]
+        queries = ("title odd", "title o", "ti odd ", "odd 4", "even t", "title 42", "even title")
+        plain = TitleIndex(results)
+        with mock.patch("src.main.TitleIndex.MASK_SIZE", 100):
+            index = TitleIndex(results)
+        self.assertTrue(index._masks)
+        for query in queries:
+            self.assertEqual(plain.search_positions(query), index.search_positions(query), query)
+            self.assertEqual(plain.search_positions(query, locale="fr-FR"),
+                             index.search_positions(query, locale="fr-FR"), query)
+        self.assertEqual(list(range(1, 3000, 2)), list(index.search_positions("title odd")))
+
+    def test_complete(self):
+        self.assertEqual(["marple", "mirror"], self.index.complete("m"))
+        self.assertEqual(["mckenzie"], self.index.complete("Julia Mc", ACTOR))
+
+    def test_combined_with_the_filters(self):
+        catalog_index = CatalogIndex(None, Response(self.results))
+        self.assertEqual(["marple-1"], self.content_ids(catalog_index.search("marple", active=True)))
+        self.assertEqual(["marple-1", "marple-2"],
+                         self.content_ids(catalog_index.search("mcken", ACTOR, device=("provider", "ROKU"))))
+        self.assertEqual([], catalog_index.search("cafe", device=("provider", "ROKU")))
+        self.assertEqual(["marple-1"], self.content_ids(catalog_index.search("marple", limit=1)))
+        at = datetime.now(timezone.utc) - timedelta(hours=2)
+        self.assertEqual(["marple-1", "marple-2"], self.content_ids(catalog_index.search("marple", active=True, at=at)))
+
+    def test_feed_fields(self):
+        payload = generate_rights_payload(50, seed=2)
+        payload["results"][0]["localizableInformation"][0].update(
+            {"episodeName": "Zzyzx Road", "episodeNumber": 1, "seasonNumber": 3, "credits": {"actor": [{"fullName": "Ann Onymous"}]}})
+        payload["results"][1]["localizableInformation"][0].pop("credits")
+        response = decode_response(payload, ResultType.RIGHT)
+        self.assertEqual(Response.from_dict(payload, ResultType.RIGHT), response)
+        information = response.results[0].localizable_information[0]
+        self.assertEqual(("Zzyzx Road", "1", "3", ["Ann Onymous"]),
+                         (information.episode_name, information.episode_number, information.season_number,
+                          information.actors))
+        self.assertIsNone(response.results[1].localizable_information[0].actors)
+        index = TitleIndex(response.results)
+        self.assertEqual(["sky-test-id-0"], self.content_ids(index.search("zzyzx")))
+        self.assertEqual(["sky-test-id-0"], self.content_ids(index.search("ann ony", ACTOR)))
+
+    def test_readme_record(self):
+        # THE RECORD OF THE vq FEED IN THE README, credits.actor IS A LIST OF OBJECTS
+        payload = {"results": [{
+            "serviceKey": 1, "contentId": "sky-test-id-1", "accessChannel": "itv3",
+            "localizableInformation": [{
+                "locale": "en-GB", "language": "eng", "titleNameMedium": "Agatha Christie's Marple",
+                "episodeName": "The Secret of Chimneys", "episodeNumber": 2, "seasonNumber": 5,
+                "credits": {"actor": [{"fullName": "Julia McKenzie"}, {"fullName": "Ian Weichardt"},
+                                      {"fullName": "Laura O'Toole"}]}}],
+            "rights": {"channel": "itv3.itv.com", "terms": [{
+                "startDateTime": "2024-05-31T16:48:47.000Z", "endDateTime": "2024-10-30T22:59:00.000Z",
+                "territory": "GB", "devices": [{"devicePlatform": "LG", "deviceType": "TV", "provider": "SKY"}]}]}}]}
+        for response in (decode_response(payload, ResultType.RIGHT), Response.from_dict(payload, ResultType.RIGHT)):
+            information = response.results[0].localizable_information[0]
+            self.assertEqual(["Julia McKenzie", "Ian Weichardt", "Laura O'Toole"], information.actors)
+            self.assertEqual(("The Secret of Chimneys", "2", "5"),
+                             (information.episode_name, information.episode_number, information.season_number))
+            index = TitleIndex(response.results)
+            self.assertEqual(["sky-test-id-1"], self.content_ids(index.search("julia mc", ACTOR)))
+            self.assertEqual(["sky-test-id-1"], self.content_ids(index.search("o'tool", ACTOR)))
+            self.assertEqual([], index.search("fullname", ACTOR))
+            self.assertEqual(["sky-test-id-1"], self.content_ids(index.search("chimn")))
+
+
+if __name__ == '__main__':
+    unittest.main()